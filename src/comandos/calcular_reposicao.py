@@ -0,0 +1,39 @@
+import argparse
+import sys
+from src.configs.config_bd import iniciar_bd
+from src.servicos.servico_analise_estoque import AnaliseEstoqueServico
+
+"""
+Comando de linha para recalcular a demanda e o ponto de reposição de todos os
+produtos a partir do histórico de vendas, para rodar periodicamente (ex.: toda
+noite). Uso:
+    python -m src.comandos.calcular_reposicao [--historico 90] [--janela 28] [--prazo 7] [--nivel-servico 0.95]
+"""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Recalcula os pontos de reposição dos produtos.")
+    parser.add_argument("--historico", type=int, default=90, help="Dias de histórico (padrão 90)")
+    parser.add_argument("--janela", type=int, default=28, help="Dias da média móvel da demanda (padrão 28)")
+    parser.add_argument("--prazo", type=int, default=7, help="Prazo de entrega do fornecedor em dias (padrão 7)")
+    parser.add_argument("--nivel-servico", type=float, default=0.95,
+                        help="Probabilidade de não faltar durante o prazo (padrão 0.95)")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    servico = AnaliseEstoqueServico()
+    try:
+        resumo = servico.calcular_pontos_reposicao(args.historico, args.janela, args.prazo, args.nivel_servico)
+    except Exception as e:
+        print(f"❌ Erro ao calcular os pontos de reposição: {e}", file=sys.stderr)
+        return 1
+    finally:
+        servico.classificacao_repo.fechar_sessao()
+
+    print(f"✅ {resumo['produtos']} produtos calculados ({resumo['produtos_com_demanda']} com demanda) "
+          f"em {resumo['segundos']:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
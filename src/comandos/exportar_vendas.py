@@ -0,0 +1,50 @@
+import argparse
+import sys
+from datetime import datetime, time
+from src.configs.config_bd import iniciar_bd
+from src.servicos.servico_exportacao import ExportacaoServico
+
+"""
+Comando de linha para exportar o histórico de vendas sem abrir a interface.
+Uso:
+    python -m src.comandos.exportar_vendas --inicio 2025-01-01 --fim 2025-12-31 --saida vendas.csv
+O formato é escolhido pela extensão da saída (.csv, .parquet ou .npz).
+"""
+
+
+def _ler_data(valor: str) -> datetime:
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data inválida: {valor} (use AAAA-MM-DD)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta as vendas de um período.")
+    parser.add_argument("--inicio", type=_ler_data, required=True, help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument("--fim", type=_ler_data, required=True, help="Data final, inclusiva (AAAA-MM-DD)")
+    parser.add_argument("--saida", required=True, help="Arquivo de saída (.csv, .parquet ou .npz)")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    servico = ExportacaoServico()
+    try:
+        resumo = servico.exportar_vendas(
+            args.inicio,
+            datetime.combine(args.fim.date(), time.max),
+            args.saida,
+            progresso=lambda linhas: print(f"  {linhas} linhas...", end="\r", file=sys.stderr)
+        )
+    except Exception as e:
+        print(f"❌ Erro na exportação: {e}", file=sys.stderr)
+        return 1
+    finally:
+        servico.venda_repo.fechar_sessao()
+
+    print(f"✅ {resumo['linhas']} linhas exportadas para {resumo['caminho']} "
+          f"em {resumo['segundos']:.1f}s ({resumo['linhas_por_segundo']:.0f} linhas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
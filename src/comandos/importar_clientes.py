@@ -0,0 +1,39 @@
+import argparse
+import sys
+from src.configs.config_bd import iniciar_bd
+from src.servicos.servico_importacao import ImportacaoServico
+
+"""
+Comando de linha para importar uma base de clientes em CSV sem abrir a interface.
+Uso:
+    python -m src.comandos.importar_clientes --arquivo clientes.csv
+O arquivo deve ter as colunas nome e cpf, e opcionalmente telefone. CPFs podem
+vir formatados (000.000.000-00); são gravados apenas com os dígitos.
+"""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa clientes de um arquivo CSV.")
+    parser.add_argument("--arquivo", required=True, help="Arquivo CSV de clientes")
+    parser.add_argument("--lote", type=int, default=10000, help="Linhas gravadas por transação")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    servico = ImportacaoServico()
+    try:
+        resumo = servico.importar_clientes_csv(args.arquivo, args.lote)
+    except Exception as e:
+        print(f"❌ Erro na importação: {e}", file=sys.stderr)
+        return 1
+    finally:
+        servico.session.close()
+
+    for linha, mensagem in resumo["erros"]:
+        print(f"  linha {linha}: {mensagem}", file=sys.stderr)
+    print(f"✅ {resumo['clientes_gravados']} clientes gravados de {resumo['linhas_lidas']} linhas "
+          f"em {resumo['segundos']:.1f}s ({len(resumo['erros'])} erros)")
+    return 0 if not resumo["erros"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import argparse
+import sys
+from src.configs.config_bd import iniciar_bd
+from src.servicos.servico_importacao import ImportacaoServico
+
+"""
+Comando de linha para importar um catálogo de produtos em CSV sem abrir a interface.
+Uso:
+    python -m src.comandos.importar_produtos --arquivo catalogo.csv [--somar-estoque]
+O arquivo deve ter as colunas nome e preco, e opcionalmente descricao, preco_custo
+e quantidade_estoque. Produtos já cadastrados (mesmo nome) são atualizados.
+"""
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa produtos de um arquivo CSV.")
+    parser.add_argument("--arquivo", required=True, help="Arquivo CSV de produtos")
+    parser.add_argument("--lote", type=int, default=5000, help="Linhas gravadas por transação")
+    parser.add_argument("--somar-estoque", action="store_true",
+                        help="Soma a quantidade do arquivo ao estoque atual em vez de substituí-lo")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    servico = ImportacaoServico()
+    try:
+        resumo = servico.importar_produtos_csv(args.arquivo, args.lote, args.somar_estoque)
+    except Exception as e:
+        print(f"❌ Erro na importação: {e}", file=sys.stderr)
+        return 1
+    finally:
+        servico.session.close()
+
+    for linha, mensagem in resumo["erros"]:
+        print(f"  linha {linha}: {mensagem}", file=sys.stderr)
+    print(f"✅ {resumo['produtos_gravados']} produtos gravados de {resumo['linhas_lidas']} linhas "
+          f"em {resumo['segundos']:.1f}s ({len(resumo['erros'])} erros)")
+    return 0 if not resumo["erros"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
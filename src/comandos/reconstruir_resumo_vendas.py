@@ -0,0 +1,52 @@
+import argparse
+import sys
+from datetime import datetime
+from src.configs.config_bd import iniciar_bd
+from src.repositorios.repositorio_contador_produto import ContadorProdutoRepositorio
+from src.repositorios.repositorio_resumo_venda import ResumoVendaRepositorio
+
+"""
+Comando de linha para recalcular o resumo diário de vendas (venda_resumo_diario)
+a partir das vendas gravadas, para carga inicial ou correção de divergências.
+Uso:
+    python -m src.comandos.reconstruir_resumo_vendas [--inicio 2025-01-01] [--fim 2025-12-31] [--contadores]
+Sem datas, recalcula todo o histórico. Com --contadores, recalcula também os
+contadores de vendas por produto (sempre o histórico inteiro).
+"""
+
+
+def _ler_data(valor: str):
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data inválida: {valor} (use AAAA-MM-DD)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Recalcula o resumo diário de vendas.")
+    parser.add_argument("--inicio", type=_ler_data, help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("--fim", type=_ler_data, help="Último dia, inclusivo (AAAA-MM-DD)")
+    parser.add_argument("--contadores", action="store_true",
+                        help="Recalcula também os contadores de vendas por produto")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    repositorio = ResumoVendaRepositorio()
+    try:
+        linhas = repositorio.reconstruir(args.inicio, args.fim)
+        if args.contadores:
+            linhas_contadores = ContadorProdutoRepositorio(repositorio.session).reconstruir()
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir o resumo: {e}", file=sys.stderr)
+        return 1
+    finally:
+        repositorio.fechar_sessao()
+
+    print(f"✅ Resumo diário reconstruído: {linhas} linhas (dia, funcionário)")
+    if args.contadores:
+        print(f"✅ Contadores por produto reconstruídos: {linhas_contadores} linhas (dia, produto)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
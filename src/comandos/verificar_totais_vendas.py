@@ -0,0 +1,58 @@
+import argparse
+import sys
+from datetime import datetime
+from src.configs.config_bd import iniciar_bd
+from src.servicos.servico_integridade import IntegridadeServico
+
+"""
+Comando de linha para conferir os totais gravados das vendas (valor_total e
+desconto_total) com a soma dos itens e, opcionalmente, corrigir as divergências.
+Uso:
+    python -m src.comandos.verificar_totais_vendas [--inicio 2025-01-01] [--fim 2025-12-31] [--corrigir]
+Sem datas, confere todo o histórico. Retorna 2 se restarem divergências.
+"""
+
+
+def _ler_data(valor: str):
+    try:
+        return datetime.strptime(valor, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data inválida: {valor} (use AAAA-MM-DD)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Confere os totais das vendas com a soma dos itens.")
+    parser.add_argument("--inicio", type=_ler_data, help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("--fim", type=_ler_data, help="Último dia, inclusivo (AAAA-MM-DD)")
+    parser.add_argument("--corrigir", action="store_true", help="Grava os totais recalculados")
+    parser.add_argument("--dias-por-lote", type=int, default=31, help="Dias por consulta (padrão 31)")
+    parser.add_argument("--limite", type=int, default=20, help="Divergências listadas (padrão 20)")
+    args = parser.parse_args(argv)
+
+    iniciar_bd()
+    servico = IntegridadeServico()
+    try:
+        relatorio = servico.verificar_totais_vendas(
+            args.inicio, args.fim, args.corrigir, args.dias_por_lote, args.limite)
+    except Exception as e:
+        print(f"❌ Erro ao verificar os totais: {e}", file=sys.stderr)
+        return 1
+    finally:
+        servico.session.close()
+
+    for d in relatorio["divergencias"]:
+        print(f"  venda {d['id_venda']} ({d['data_venda']:%Y-%m-%d}): "
+              f"gravado {d['valor_total']} / {d['desconto_total']}, "
+              f"itens {d['valor_total_itens']} / {d['desconto_total_itens']}")
+
+    print(f"{relatorio['vendas_verificadas']} vendas verificadas em {relatorio['segundos']:.1f} s; "
+          f"{relatorio['vendas_divergentes']} divergentes "
+          f"(diferença de valor {relatorio['diferenca_valor']}, de desconto {relatorio['diferenca_desconto']})")
+    if relatorio["vendas_corrigidas"]:
+        print(f"✅ {relatorio['vendas_corrigidas']} vendas corrigidas")
+        return 0
+    return 2 if relatorio["vendas_divergentes"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
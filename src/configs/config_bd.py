@@ -1,31 +1,113 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session as OrmSession
 from sqlalchemy_utils import database_exists, create_database
-from src.configs.config_globais import URL_BANCO_DE_DADOS
+from src.configs import config_globais
 
 """
 Este arquivo define as configurações de conexão e inicialização do banco de dados
-para o sistema de loja de hardware, utilizando SQLAlchemy como ORM. Configura
-a engine SQLite, sessão de banco de dados e fornece funcionalidade para
-criação automática das tabelas através da classe Base declarativa.
+para o sistema de loja de hardware, utilizando SQLAlchemy como ORM. A engine é
+criada sob demanda (na primeira sessão aberta), com PRAGMAs de desempenho para
+SQLite e ajustes de pool para MySQL, todos lidos de config_globais. Também
+fornece a criação automática das tabelas através da classe Base declarativa,
+seguida das migrações versionadas pendentes.
 """
 
 Base = declarative_base()
 
-if URL_BANCO_DE_DADOS:
-    print(f"Conectando ao banco de dados: {URL_BANCO_DE_DADOS}")
-else:
-    print("Nenhuma URL de banco de dados fornecida, usando SQLite local.")
+URL_PADRAO = "sqlite:///hardware_store.db"
 
-engine = create_engine(
-    URL_BANCO_DE_DADOS or "sqlite:///hardware_store.db", echo=True)
+_engine: Engine | None = None
 
-if not database_exists(engine.url):
-    create_database(engine.url)
 
-Session = sessionmaker(bind=engine)
+def _configurar_sqlite(engine: Engine):
+    """Registra os PRAGMAs aplicados a cada nova conexão SQLite."""
+
+    @event.listens_for(engine, "connect")
+    def _aplicar_pragmas(conexao_dbapi, _registro):
+        cursor = conexao_dbapi.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={config_globais.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={config_globais.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size={int(config_globais.SQLITE_MMAP_SIZE)}")
+            cursor.execute(f"PRAGMA cache_size={int(config_globais.SQLITE_CACHE_SIZE)}")
+            cursor.execute(f"PRAGMA busy_timeout={int(config_globais.SQLITE_BUSY_TIMEOUT)}")
+        finally:
+            cursor.close()
+
+
+def criar_engine(url: str | None = None) -> Engine:
+    """
+    Cria uma engine configurada a partir de config_globais.
+    Não abre nenhuma conexão: o SQLAlchemy só conecta no primeiro uso.
+    """
+    url = url or config_globais.URL_BANCO_DE_DADOS or URL_PADRAO
+    opcoes = {"echo": config_globais.ECHO_SQL}
+
+    if url.startswith("sqlite"):
+        engine = create_engine(url, **opcoes)
+        _configurar_sqlite(engine)
+        return engine
+
+    engine = create_engine(
+        url,
+        pool_size=config_globais.POOL_SIZE,
+        max_overflow=config_globais.POOL_MAX_OVERFLOW,
+        pool_recycle=config_globais.POOL_RECYCLE,
+        pool_pre_ping=config_globais.POOL_PRE_PING,
+        **opcoes
+    )
+    return engine
+
+
+def obter_engine() -> Engine:
+    """Retorna a engine global, criando-a no primeiro acesso."""
+    global _engine
+    if _engine is None:
+        _engine = criar_engine()
+    return _engine
+
+
+class Session(OrmSession):
+    """Sessão ligada à engine global, que é criada apenas quando necessária."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("bind", obter_engine())
+        super().__init__(**kwargs)
+
+
+CHAVE_APOS_COMMIT = "funcoes_apos_commit"
+
+
+def executar_apos_commit(session: OrmSession, funcao):
+    """
+    Agenda `funcao` para rodar logo após o próximo commit da sessão.
+    Se a transação for desfeita, a função é descartada sem ser executada.
+    """
+    session.info.setdefault(CHAVE_APOS_COMMIT, []).append(funcao)
+
+
+@event.listens_for(Session, "after_commit")
+def _executar_funcoes_apos_commit(session: OrmSession):
+    for funcao in session.info.pop(CHAVE_APOS_COMMIT, []):
+        funcao()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_funcoes_apos_commit(session: OrmSession):
+    session.info.pop(CHAVE_APOS_COMMIT, None)
 
 
 def iniciar_bd():
+    engine = obter_engine()
+    print(f"Conectando ao banco de dados: {engine.url.render_as_string(hide_password=True)}")
+
+    if not database_exists(engine.url):
+        create_database(engine.url)
+
+    # Importado aqui para evitar import circular (os modelos dependem de Base)
+    from src.modelos.migracoes import aplicar_migracoes
+
     Base.metadata.create_all(engine)
+    aplicar_migracoes(engine)
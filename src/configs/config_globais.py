@@ -10,4 +10,46 @@ URLs de banco de dados e outras configurações do ambiente.
 
 carregar_arquivo_dotenv()
 
+
+def _getenv_bool(nome: str, padrao: bool) -> bool:
+    """Lê uma variável de ambiente booleana ("1", "true", "sim" ou "yes")."""
+    valor = getenv(nome)
+    if valor is None:
+        return padrao
+    return valor.strip().lower() in ("1", "true", "sim", "yes")
+
+
+def _getenv_int(nome: str, padrao: int) -> int:
+    """Lê uma variável de ambiente inteira, usando o padrão se ausente."""
+    valor = getenv(nome)
+    return int(valor) if valor else padrao
+
+
 URL_BANCO_DE_DADOS = getenv("URL_BANCO_DE_DADOS")
+
+# Exibe no console todo SQL executado (apenas para depuração)
+ECHO_SQL = _getenv_bool("ECHO_SQL", False)
+
+# PRAGMAs aplicados a cada conexão SQLite
+SQLITE_JOURNAL_MODE = getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = _getenv_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)   # bytes
+SQLITE_CACHE_SIZE = _getenv_int("SQLITE_CACHE_SIZE", -64 * 1024)        # negativo = KiB
+SQLITE_BUSY_TIMEOUT = _getenv_int("SQLITE_BUSY_TIMEOUT", 5000)          # ms
+
+# Pool de conexões para servidores (MySQL/pymysql)
+POOL_SIZE = _getenv_int("POOL_SIZE", 5)
+POOL_MAX_OVERFLOW = _getenv_int("POOL_MAX_OVERFLOW", 10)
+POOL_RECYCLE = _getenv_int("POOL_RECYCLE", 1800)                         # segundos
+POOL_PRE_PING = _getenv_bool("POOL_PRE_PING", True)
+
+# Cache em memória do catálogo de produtos (quantidade máxima de produtos)
+TAMANHO_CACHE_CATALOGO = _getenv_int("TAMANHO_CACHE_CATALOGO", 10000)
+
+# Cache em memória dos relatórios agregados (quantidade de resultados e validade em segundos)
+TAMANHO_CACHE_RELATORIOS = _getenv_int("TAMANHO_CACHE_RELATORIOS", 256)
+TTL_CACHE_RELATORIOS = _getenv_int("TTL_CACHE_RELATORIOS", 300)
+
+# Tabelas da interface carregadas sob demanda (linhas por página e páginas mantidas em memória)
+TAMANHO_PAGINA_TABELAS = _getenv_int("TAMANHO_PAGINA_TABELAS", 200)
+PAGINAS_EM_MEMORIA_TABELAS = _getenv_int("PAGINAS_EM_MEMORIA_TABELAS", 10)
@@ -0,0 +1,82 @@
+from typing import Any, Callable, Dict, Optional
+from PyQt6.QtCore import QObject, QThreadPool, QTimer
+from PyQt6.QtWidgets import QLineEdit
+from src.interfaces.controladores.trabalhador import Trabalhador
+
+"""
+Este arquivo define a busca adiada dos campos de pesquisa das telas. Em vez de
+consultar o banco a cada tecla, a busca espera o usuário parar de digitar por
+um intervalo curto e roda no QThreadPool, fora da thread da interface. Cada
+disparo recebe um número de geração: uma busca ainda na fila é retirada quando
+outra a substitui, e o resultado de uma busca que já não é a mais recente é
+descartado, de modo que só a última pesquisa chega à tabela. Os trabalhos não
+são apagados pelo pool ao terminar: cada um fica guardado até seu sinal chegar
+(ou até ser retirado da fila), para que cancelar nunca toque um objeto já
+destruído.
+"""
+
+INTERVALO_BUSCA_MS = 300
+
+
+class BuscaAdiada(QObject):
+    """
+    Liga um campo de texto a uma pesquisa em segundo plano. `buscar(termo)` roda
+    na thread do pool (com serviços e sessão próprios) e seu retorno é entregue
+    a `aplicar(resultado)` na thread da interface; erros vão para `ao_falhar`.
+    """
+
+    def __init__(self, campo: QLineEdit, buscar: Callable[[str], Any], aplicar: Callable[[Any], None],
+                 pool: QThreadPool | None = None, ao_falhar: Optional[Callable[[str], None]] = None,
+                 intervalo_ms: int = INTERVALO_BUSCA_MS):
+        super().__init__(campo)
+        self._campo = campo
+        self._buscar = buscar
+        self._aplicar = aplicar
+        self._ao_falhar = ao_falhar
+        self._pool = pool or QThreadPool.globalInstance()
+        self._geracao = 0
+        self._trabalhos: Dict[int, Trabalhador] = {}   # geração -> trabalho ainda sem resposta
+
+        self._temporizador = QTimer(self)
+        self._temporizador.setSingleShot(True)
+        self._temporizador.setInterval(intervalo_ms)
+        self._temporizador.timeout.connect(self._disparar)
+        campo.textChanged.connect(self._agendar)
+
+    def _agendar(self, _texto: str):
+        # Cada tecla reinicia a espera
+        self._temporizador.start()
+
+    def cancelar(self):
+        """Descarta a busca agendada ou em andamento, se houver."""
+        self._temporizador.stop()
+        trabalho = self._trabalhos.get(self._geracao)
+        if trabalho is not None and self._pool.tryTake(trabalho):
+            # Retirado da fila antes de rodar: nenhum sinal virá para ele
+            del self._trabalhos[self._geracao]
+        self._geracao += 1
+
+    def _disparar(self):
+        self.cancelar()
+        trabalho = Trabalhador(self._executar, self._geracao, self._campo.text().strip())
+        trabalho.setAutoDelete(False)
+        trabalho.sinais.concluido.connect(self._concluida)
+        self._trabalhos[self._geracao] = trabalho
+        self._pool.start(trabalho)
+
+    def _executar(self, geracao: int, termo: str) -> tuple:
+        """Roda na thread do pool; o erro volta junto com a geração da busca."""
+        try:
+            return geracao, self._buscar(termo), None
+        except Exception as e:
+            return geracao, None, str(e)
+
+    def _concluida(self, resposta: tuple):
+        geracao, resultado, erro = resposta
+        self._trabalhos.pop(geracao, None)
+        if geracao != self._geracao:
+            return
+        if erro is None:
+            self._aplicar(resultado)
+        elif self._ao_falhar is not None:
+            self._ao_falhar(erro)
@@ -0,0 +1,196 @@
+from decimal import Decimal
+from typing import Dict, List, Optional
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+"""
+Este arquivo define o carrinho da tela de vendas. O carrinho é também o modelo
+da tabela do carrinho: guarda as linhas (com os dados do produto resolvidos ao
+adicionar), um índice id_produto -> linha e os totais. Adicionar, remover ou
+mudar a quantidade de um produto aplica apenas a diferença aos totais e avisa a
+view só da linha afetada, sem recalcular o carrinho inteiro. Os descontos
+seguem a regra do VendaServico.concluir_compra (percentual sobre o valor da
+linha, arredondado em centavos), para que o total exibido seja o cobrado.
+"""
+
+CENTAVOS = Decimal("0.01")
+
+
+class ItemCarrinho:
+    """Linha do carrinho: um produto, sua quantidade e o desconto da linha."""
+    __slots__ = ("id_produto", "nome", "preco_unitario", "quantidade", "desconto_aplicado")
+
+    def __init__(self, id_produto: int, nome: str, preco_unitario: Decimal):
+        self.id_produto = id_produto
+        self.nome = nome
+        self.preco_unitario = preco_unitario
+        self.quantidade = 0
+        self.desconto_aplicado = Decimal("0.00")
+
+    @property
+    def subtotal(self) -> Decimal:
+        return self.preco_unitario * self.quantidade
+
+
+class Carrinho(QAbstractTableModel):
+    """
+    Carrinho de compras com totais incrementais, exibido diretamente em uma
+    QTableView (colunas Produto, Qtd, Unitário e Desconto).
+    """
+    COLUNAS = ["Produto", "Qtd", "Unitário", "Desconto"]
+
+    def __init__(self, percentual_desconto: Decimal = Decimal("0")):
+        super().__init__()
+        self._itens: List[ItemCarrinho] = []
+        self._indice: Dict[int, int] = {}
+        self.percentual_desconto = percentual_desconto
+        self.subtotal = Decimal("0.00")
+        self.desconto = Decimal("0.00")
+
+    # Modelo Qt
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return len(self._itens)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.COLUNAS)
+
+    def data(self, index, role):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        item = self._itens[index.row()]
+        coluna = index.column()
+        if coluna == 0:
+            return item.nome
+        if coluna == 1:
+            return item.quantidade
+        if coluna == 2:
+            return f"R$ {item.preco_unitario:.2f}"
+        return f"R$ {item.desconto_aplicado:.2f}"
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUNAS[section]
+
+    def _avisar_linha(self, linha: int):
+        self.dataChanged.emit(
+            self.index(linha, 0),
+            self.index(linha, len(self.COLUNAS) - 1),
+            [Qt.ItemDataRole.DisplayRole]
+        )
+
+    # Operações do carrinho
+
+    @property
+    def total(self) -> Decimal:
+        return self.subtotal - self.desconto
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter_item(self, linha: int) -> ItemCarrinho:
+        """Item exibido na linha informada."""
+        return self._itens[linha]
+
+    def quantidade_de(self, id_produto: int) -> int:
+        """Quantidade do produto no carrinho (zero se ausente)."""
+        linha = self._indice.get(id_produto)
+        return 0 if linha is None else self._itens[linha].quantidade
+
+    def quantidades(self) -> Dict[int, int]:
+        """Carrinho no formato {id_produto: quantidade} usado pelo VendaServico."""
+        return {item.id_produto: item.quantidade for item in self._itens}
+
+    def _calcular_desconto(self, item: ItemCarrinho) -> Decimal:
+        return (item.subtotal * self.percentual_desconto).quantize(CENTAVOS)
+
+    def _aplicar_quantidade(self, item: ItemCarrinho, quantidade: int):
+        """Troca a quantidade do item e soma aos totais apenas a diferença."""
+        subtotal_anterior = item.subtotal
+        desconto_anterior = item.desconto_aplicado
+        item.quantidade = quantidade
+        item.desconto_aplicado = self._calcular_desconto(item)
+        self.subtotal += item.subtotal - subtotal_anterior
+        self.desconto += item.desconto_aplicado - desconto_anterior
+
+    def adicionar(self, id_produto: int, nome: str, preco_unitario: Decimal, quantidade: int = 1):
+        """Soma `quantidade` unidades do produto, criando a linha se necessário."""
+        if quantidade <= 0:
+            raise Exception("Quantidade deve ser maior que zero")
+
+        linha = self._indice.get(id_produto)
+        if linha is not None:
+            item = self._itens[linha]
+            self._aplicar_quantidade(item, item.quantidade + quantidade)
+            self._avisar_linha(linha)
+            return
+
+        item = ItemCarrinho(id_produto, nome, preco_unitario)
+        linha = len(self._itens)
+        self.beginInsertRows(QModelIndex(), linha, linha)
+        self._itens.append(item)
+        self._indice[id_produto] = linha
+        self._aplicar_quantidade(item, quantidade)
+        self.endInsertRows()
+
+    def remover(self, id_produto: int, quantidade: int = 1) -> int:
+        """
+        Tira até `quantidade` unidades do produto e retorna quantas foram de
+        fato retiradas. A linha que chega a zero sai do carrinho: a última
+        linha ocupa o lugar dela, para que a remoção não desloque as demais.
+        """
+        linha = self._indice.get(id_produto)
+        if linha is None or quantidade <= 0:
+            return 0
+
+        item = self._itens[linha]
+        retiradas = min(quantidade, item.quantidade)
+        self._aplicar_quantidade(item, item.quantidade - retiradas)
+        if item.quantidade > 0:
+            self._avisar_linha(linha)
+            return retiradas
+
+        ultima = len(self._itens) - 1
+        if linha != ultima:
+            movido = self._itens[ultima]
+            self._itens[linha] = movido
+            self._indice[movido.id_produto] = linha
+            self._avisar_linha(linha)
+        self.beginRemoveRows(QModelIndex(), ultima, ultima)
+        self._itens.pop()
+        del self._indice[id_produto]
+        self.endRemoveRows()
+        return retiradas
+
+    def definir_percentual_desconto(self, percentual: Decimal):
+        """
+        Muda o percentual de desconto (ex.: 0.05 ao selecionar um cliente) e
+        recalcula o desconto de cada linha, avisando a view só da coluna Desconto.
+        """
+        if percentual == self.percentual_desconto:
+            return
+
+        self.percentual_desconto = percentual
+        self.desconto = Decimal("0.00")
+        for item in self._itens:
+            item.desconto_aplicado = self._calcular_desconto(item)
+            self.desconto += item.desconto_aplicado
+        if self._itens:
+            coluna = len(self.COLUNAS) - 1
+            self.dataChanged.emit(
+                self.index(0, coluna),
+                self.index(len(self._itens) - 1, coluna),
+                [Qt.ItemDataRole.DisplayRole]
+            )
+
+    def limpar(self):
+        """Esvazia o carrinho."""
+        self.beginResetModel()
+        self._itens.clear()
+        self._indice.clear()
+        self.subtotal = Decimal("0.00")
+        self.desconto = Decimal("0.00")
+        self.endResetModel()
+
+    def obter_linha(self, id_produto: int) -> Optional[int]:
+        """Linha do produto na tabela, ou None se ele não está no carrinho."""
+        return self._indice.get(id_produto)
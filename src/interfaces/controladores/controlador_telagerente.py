@@ -1,45 +1,24 @@
 # type: ignore[misc]
 
+from datetime import datetime, time
+from functools import partial
 from typing import List
-from PyQt6.QtWidgets import QDialog, QMessageBox
+from PyQt6.QtWidgets import QDialog, QMessageBox, QInputDialog, QFileDialog
 from PyQt6 import uic
-from PyQt6.QtCore import Qt, QAbstractTableModel
+from PyQt6.QtCore import Qt, QThreadPool
 
 from src.modelos.tabelas_bd import Funcionario, Produto, Cliente, CargoEnum
 from src.servicos.servico_funcionario import FuncionarioServico
 from src.servicos.servico_produto import ProdutoServico
 from src.servicos.servico_cliente import ClienteServico
+from src.servicos.servico_exportacao import ExportacaoServico
+from src.servicos.servico_importacao import ImportacaoServico
+from src.servicos.servico_analise_estoque import AnaliseEstoqueServico
+from src.servicos.filtros_tabela import FILTROS_CLIENTE, FILTROS_FUNCIONARIO, FILTROS_PRODUTO, interpretar_filtros
+from src.interfaces.controladores.trabalhador import Trabalhador
+from src.interfaces.controladores.modelo_tabela import ConsultaTabela, ModeloTabelaPaginado
+from src.interfaces.controladores.busca_adiada import BuscaAdiada
 
-class SimpleTableModel(QAbstractTableModel):
-    """
-    Modelo de tabela simples para uso com QTableView, 
-    parametrizado para qualquer lista de objetos com colunas dinâmicas.
-    """
-
-    def __init__(self, data: List, columns: List[str], row_to_values_func):
-
-        super().__init__()
-        self._data = data
-        self._columns = columns
-        self._row_to_values = row_to_values_func
-
-    """Construção do modelo do CRUD / Tabela."""
-    def rowCount(self, parent=None) -> int:
-        return len(self._data)
-
-    def columnCount(self, parent=None) -> int:
-        
-        return len(self._columns)
-
-    def data(self, index, role):
-        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
-            return None
-        row_obj = self._data[index.row()]
-        return self._row_to_values(row_obj)[index.column()]
-
-    def headerData(self, section, orientation, role):
-        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
-            return self._columns[section]
 
 class ControladorTelaGerente:
     """
@@ -58,11 +37,20 @@ class ControladorTelaGerente:
         self.funcionario_servico = FuncionarioServico()
         self.produto_servico = ProdutoServico()
         self.cliente_servico = ClienteServico()
+        self.analise_servico = AnaliseEstoqueServico()
+        self.classes_abc = {}
+
+        # Exportações rodam fora da thread da interface
+        self.pool_threads = QThreadPool.globalInstance()
+        self.trabalho_exportacao = None
+        self.trabalho_importacao = None
+        self.trabalho_classificacao = None
 
         # Carrega a interface Qt Designer e define título com nome do funcionário logado
         self.dialog: QDialog = uic.loadUi("src/interfaces/telas/Tela_Admin.ui")
         self.dialog.setWindowTitle(f"Painel Admin - {funcionario_logado.nome}")
 
+        self.criar_modelos()
         self.conectar_eventos()
         self.atualizar_listas()
 
@@ -74,23 +62,125 @@ class ControladorTelaGerente:
         # Botão de logout
         self.dialog.botao_deslogar.clicked.connect(self.deslogar)
 
+        # Exportação do histórico de vendas
+        self.dialog.botao_exportarVendas.clicked.connect(self.exportar_vendas)
+
+        # Importação em massa de produtos e clientes
+        self.dialog.botao_importarProdutos.clicked.connect(self.importar_produtos)
+        self.dialog.botao_importarClientes.clicked.connect(self.importar_clientes)
+
+        # Classificação ABC dos produtos
+        self.dialog.botao_curvaABC.clicked.connect(self.calcular_curva_abc)
+
         # Eventos relacionados a funcionários
         self.dialog.botao_adicionarFuncionario.clicked.connect(self.adicionar_funcionario)
         self.dialog.botao_editarFuncionario.clicked.connect(self.editar_funcionario)
         self.dialog.botao_excluirFuncionario.clicked.connect(self.excluir_funcionario)
-        self.dialog.lineEdit_buscaFuncionarios.textChanged.connect(self.buscar_funcionarios)
 
         # Eventos relacionados a produtos
         self.dialog.botao_adicionarProduto.clicked.connect(self.adicionar_produto)
         self.dialog.botao_editarProduto.clicked.connect(self.editar_produto)
         self.dialog.botao_excluirProduto.clicked.connect(self.excluir_produto)
-        self.dialog.lineEdit_buscaProdutos.textChanged.connect(self.buscar_produtos)
 
         # Eventos relacionados a clientes
         self.dialog.botao_adicionarCliente.clicked.connect(self.adicionar_cliente)
         self.dialog.botao_editarCliente.clicked.connect(self.editar_cliente)
         self.dialog.botao_excluirCliente.clicked.connect(self.excluir_cliente)
-        self.dialog.lineEdit_buscaClientes.textChanged.connect(self.buscar_clientes)
+
+        # Campos de busca: filtram no banco, em segundo plano, quando o usuário para de digitar
+        self.busca_funcionarios = BuscaAdiada(
+            self.dialog.lineEdit_buscaFuncionarios,
+            lambda termo: self.buscar_funcionarios(termo, self.modelo_func.consulta, self.modelo_func.tamanho_pagina),
+            partial(self._exibir_busca, self.modelo_func),
+            self.pool_threads, self._busca_falhou
+        )
+        self.busca_produtos = BuscaAdiada(
+            self.dialog.lineEdit_buscaProdutos,
+            lambda termo: self.buscar_produtos(termo, self.modelo_prod.consulta, self.modelo_prod.tamanho_pagina),
+            partial(self._exibir_busca, self.modelo_prod),
+            self.pool_threads, self._busca_falhou
+        )
+        self.busca_clientes = BuscaAdiada(
+            self.dialog.lineEdit_buscaClientes,
+            lambda termo: self.buscar_clientes(termo, self.modelo_cliente.consulta, self.modelo_cliente.tamanho_pagina),
+            partial(self._exibir_busca, self.modelo_cliente),
+            self.pool_threads, self._busca_falhou
+        )
+
+    def criar_modelos(self):
+        """
+        Cria os modelos das tabelas, carregados sob demanda: cada tabela busca
+        uma página por vez conforme é rolada. Clicar no cabeçalho ordena a
+        tabela no banco, pelas colunas indexadas (as demais não ordenam).
+        """
+        self.modelo_func = ModeloTabelaPaginado(
+            self._buscar_pagina_funcionarios,
+            ["ID", "Nome", "Usuário", "Cargo"],
+            lambda f: [f.id_funcionario, f.nome, f.nome_usuario, f.cargo.value],
+            lambda f: f.id_funcionario,
+            pool=self.pool_threads,
+            campos_ordenacao={0: None, 1: "nome", 2: "nome_usuario"},
+        )
+        # Produtos exibem a classe ABC da última classificação
+        self.modelo_prod = ModeloTabelaPaginado(
+            self._buscar_pagina_produtos,
+            ["ID", "Nome", "Preço", "Estoque", "Curva ABC"],
+            lambda p: [p.id_produto, p.nome, f"R$ {p.preco:.2f}", p.quantidade_estoque,
+                       self.classes_abc.get(p.id_produto, "-")],
+            lambda p: p.id_produto,
+            pool=self.pool_threads,
+            campos_ordenacao={0: None, 1: "nome", 2: "preco", 3: "quantidade_estoque"},
+        )
+        self.modelo_cliente = ModeloTabelaPaginado(
+            self._buscar_pagina_clientes,
+            ["ID", "Nome", "CPF", "Telefone"],
+            lambda c: [c.id_cliente, c.nome, c.cpf, c.telefone],
+            lambda c: c.id_cliente,
+            pool=self.pool_threads,
+            campos_ordenacao={0: None, 1: "nome", 2: "cpf"},
+        )
+        for tabela, modelo in (
+            (self.dialog.tableView_funcionarios, self.modelo_func),
+            (self.dialog.tableView_produtos, self.modelo_prod),
+            (self.dialog.tableView_clientes, self.modelo_cliente),
+        ):
+            tabela.setModel(modelo)
+            # Começa na ordem por ID, a mesma da consulta inicial do modelo
+            tabela.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+            tabela.setSortingEnabled(True)
+            tabela.horizontalHeader().sortIndicatorChanged.connect(
+                partial(self._manter_indicador_ordenacao, tabela, modelo)
+            )
+
+    @staticmethod
+    def _manter_indicador_ordenacao(tabela, modelo: ModeloTabelaPaginado, coluna: int, _ordem):
+        """Clicar numa coluna que não ordena devolve o indicador à coluna ordenada."""
+        if coluna != modelo.coluna_ordenada:
+            ordem = Qt.SortOrder.DescendingOrder if modelo.consulta.decrescente else Qt.SortOrder.AscendingOrder
+            tabela.horizontalHeader().setSortIndicator(modelo.coluna_ordenada, ordem)
+
+    @staticmethod
+    def _buscar_pagina_funcionarios(apos, limite: int, consulta: ConsultaTabela) -> List[Funcionario]:
+        """Página de funcionários (o repositório abre uma sessão por consulta; roda também no pool)."""
+        return FuncionarioServico().buscar_funcionarios_paginado(apos, limite, *consulta)
+
+    @staticmethod
+    def _buscar_pagina_produtos(apos, limite: int, consulta: ConsultaTabela) -> List[Produto]:
+        """Página de produtos, com serviço e sessão próprios (roda também no pool)."""
+        servico = ProdutoServico()
+        try:
+            return servico.buscar_produtos_paginado(apos, limite, *consulta)
+        finally:
+            servico.produto_repo.fechar_sessao()
+
+    @staticmethod
+    def _buscar_pagina_clientes(apos, limite: int, consulta: ConsultaTabela) -> List[Cliente]:
+        """Página de clientes, com serviço e sessão próprios (roda também no pool)."""
+        servico = ClienteServico()
+        try:
+            return servico.buscar_clientes_paginado(apos, limite, *consulta)
+        finally:
+            servico.cliente_repo.fechar_sessao()
 
     def atualizar_listas(self):
         """Atualiza todas as tabelas da interface com os dados atuais do banco."""
@@ -100,105 +190,63 @@ class ControladorTelaGerente:
 
     def atualizar_lista_funcionarios(self):
         """Atualiza a tabela de funcionários com dados atuais."""
-        funcionarios = self.funcionario_servico.buscar_todos_funcionarios()
-        self.modelo_func = SimpleTableModel(
-            funcionarios,
-            ["ID", "Nome", "Usuário", "Cargo"],
-            lambda f: [f.id_funcionario, f.nome, f.nome_usuario, f.cargo.value],
-        )
-        self.dialog.tableView_funcionarios.setModel(self.modelo_func)
+        self.busca_funcionarios.cancelar()
+        self.modelo_func.recarregar()
 
     def atualizar_lista_produtos(self):
         """Atualiza a tabela de produtos com dados atuais."""
-        produtos = self.produto_servico.buscar_todos_produtos()
-        self.modelo_prod = SimpleTableModel(
-            produtos,
-            ["ID", "Nome", "Preço", "Estoque"],
-            lambda p: [p.id_produto, p.nome, f"R$ {p.preco:.2f}", p.quantidade_estoque],
-        )
-        self.dialog.tableView_produtos.setModel(self.modelo_prod)
+        self.classes_abc = self.analise_servico.buscar_classes_produtos()
+        self.busca_produtos.cancelar()
+        self.modelo_prod.recarregar()
 
     def atualizar_lista_clientes(self):
         """Atualiza a tabela de clientes com dados atuais."""
-        clientes = self.cliente_servico.buscar_todos_clientes()
-        self.modelo_cliente = SimpleTableModel(
-            clientes,
-            ["ID", "Nome", "CPF", "Telefone"],
-            lambda c: [c.id_cliente, c.nome, c.cpf, c.telefone],
-        )
-        self.dialog.tableView_clientes.setModel(self.modelo_cliente)
+        self.busca_clientes.cancelar()
+        self.modelo_cliente.recarregar()
 
-    def buscar_funcionarios(self):
+    @staticmethod
+    def buscar_funcionarios(termo: str, consulta: ConsultaTabela, tamanho_pagina: int) -> tuple:
         """
-        Busca funcionário(s) por ID digitado no campo de busca.
-        Se vazio, exibe todos os funcionários.
-        O valor escrito, deve ser um número.
+        Filtra os funcionários pelo texto do campo de busca (ex.: "ana",
+        "usuario:adm", "id:7"; ver interpretar_filtros), mantendo a ordenação
+        da tabela. Roda na thread do pool. Retorna (consulta, primeira página).
         """
-        termo = self.dialog.lineEdit_buscaFuncionarios.text().strip()
+        consulta = consulta._replace(filtros=interpretar_filtros(termo, FILTROS_FUNCIONARIO))
+        return consulta, ControladorTelaGerente._buscar_pagina_funcionarios(None, tamanho_pagina, consulta)
 
-        if termo == '':
-            funcionarios = self.funcionario_servico.buscar_todos_funcionarios()
-        elif termo.isdigit():
-            funcionario = self.funcionario_servico.buscar_funcionario_por_id(int(termo))
-            funcionarios = [funcionario] if funcionario else []
-        else:
-            funcionarios = []
-
-        self.dialog.tableView_funcionarios.setModel(
-            SimpleTableModel(
-                funcionarios,
-                ["ID", "Nome", "Usuário", "Cargo"],
-                lambda f: [f.id_funcionario, f.nome, f.nome_usuario, f.cargo.value],
-            )
-        )
-
-    def buscar_produtos(self):
+    @staticmethod
+    def buscar_produtos(termo: str, consulta: ConsultaTabela, tamanho_pagina: int) -> tuple:
         """
-        Busca produto(s) por ID digitado no campo de busca.
-        Se vazio, exibe todos os produtos.
-        O valor escrito, deve ser um número.
+        Filtra os produtos pelo texto do campo de busca (ex.: "parafuso",
+        "preco:10-50 estoque:-5", "id:7"; ver interpretar_filtros), mantendo a
+        ordenação da tabela. Roda na thread do pool. Retorna (consulta, primeira página).
         """
-        termo = self.dialog.lineEdit_buscaProdutos.text().strip()
-
-        if termo == '':
-            produtos = self.produto_servico.buscar_todos_produtos()
-        elif termo.isdigit():
-            produto = self.produto_servico.buscar_produto_por_id(int(termo))
-            produtos = [produto] if produto else []
-        else:
-            produtos = []
-
-        self.dialog.tableView_produtos.setModel(
-            SimpleTableModel(
-                produtos,
-                ["ID", "Nome", "Preço", "Estoque"],
-                lambda p: [p.id_produto, p.nome, f"R$ {p.preco:.2f}", p.quantidade_estoque],
-            )
-        )
+        consulta = consulta._replace(filtros=interpretar_filtros(termo, FILTROS_PRODUTO))
+        return consulta, ControladorTelaGerente._buscar_pagina_produtos(None, tamanho_pagina, consulta)
 
-    def buscar_clientes(self):
+    @staticmethod
+    def buscar_clientes(termo: str, consulta: ConsultaTabela, tamanho_pagina: int) -> tuple:
         """
-        Busca cliente(s) por ID digitado no campo de busca.
-        Se vazio, exibe todos os clientes.
-        O valor escrito, deve ser um número.
+        Filtra os clientes pelo texto do campo de busca (ex.: "maria",
+        "cpf:123", "id:7"; ver interpretar_filtros), mantendo a ordenação da
+        tabela. Roda na thread do pool. Retorna (consulta, primeira página).
         """
-        termo = self.dialog.lineEdit_buscaClientes.text().strip()
+        consulta = consulta._replace(filtros=interpretar_filtros(termo, FILTROS_CLIENTE))
+        return consulta, ControladorTelaGerente._buscar_pagina_clientes(None, tamanho_pagina, consulta)
 
-        if termo == '':
-            clientes = self.cliente_servico.buscar_todos_clientes()
-        elif termo.isdigit():
-            cliente = self.cliente_servico.buscar_cliente_por_id(int(termo))
-            clientes = [cliente] if cliente else []
+    def _exibir_busca(self, modelo: ModeloTabelaPaginado, resultado: tuple):
+        """
+        Mostra na tabela o resultado da busca mais recente. Se a ordenação
+        mudou enquanto a busca rodava, refaz a primeira página na ordem nova.
+        """
+        consulta, objetos = resultado
+        if consulta[:2] == modelo.consulta[:2]:
+            modelo.recarregar(objetos, consulta)
         else:
-            clientes = []
+            modelo.recarregar(consulta=modelo.consulta._replace(filtros=consulta.filtros))
 
-        self.dialog.tableView_clientes.setModel(
-            SimpleTableModel(
-                clientes,
-                ["ID", "Nome", "CPF", "Telefone"],
-                lambda c: [c.id_cliente, c.nome, c.cpf, c.telefone],
-            )
-        )
+    def _busca_falhou(self, mensagem: str):
+        QMessageBox.warning(self.dialog, "Busca", mensagem)
 
     def adicionar_funcionario(self):
         """
@@ -222,7 +270,10 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um funcionário para editar.")
             return
 
-        func = self.modelo_func._data[sel[0].row()]
+        func = self.modelo_func.obter_objeto(sel[0].row())
+        if func is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O funcionário selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
         form = uic.loadUi("src/interfaces/telas/Form_Funcionario.ui")
         form.setWindowTitle(f"Editar Funcionário - {func.nome}")
 
@@ -295,6 +346,12 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um funcionário para excluir.")
             return
 
+        funcionario = self.modelo_func.obter_objeto(sel[0].row())
+        if funcionario is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O funcionário selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
+        id_funcionario = funcionario.id_funcionario
+
         resposta = QMessageBox.question(
             self.dialog,
             "Confirmação",
@@ -304,9 +361,6 @@ class ControladorTelaGerente:
         if resposta != QMessageBox.StandardButton.Yes:
             return
 
-        funcionario = self.modelo_func._data[sel[0].row()]
-        id_funcionario = funcionario.id_funcionario
-
         try:
             self.funcionario_servico.deletar_funcionario(id_funcionario)
             QMessageBox.information(self.dialog, "Sucesso", f"Funcionário ID {id_funcionario} excluído com sucesso.")
@@ -336,7 +390,10 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um produto para editar.")
             return
 
-        prod = self.modelo_prod._data[sel[0].row()]
+        prod = self.modelo_prod.obter_objeto(sel[0].row())
+        if prod is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O produto selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
         form = uic.loadUi("src/interfaces/telas/Form_Produto.ui")
         form.setWindowTitle(f"Editar Produto - {prod.nome}")
 
@@ -394,6 +451,12 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um produto para excluir.")
             return
 
+        produto = self.modelo_prod.obter_objeto(sel[0].row())
+        if produto is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O produto selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
+        id_produto = produto.id_produto
+
         resposta = QMessageBox.question(
             self.dialog,
             "Confirmação",
@@ -403,9 +466,6 @@ class ControladorTelaGerente:
         if resposta != QMessageBox.StandardButton.Yes:
             return
 
-        produto = self.modelo_prod._data[sel[0].row()]
-        id_produto = produto.id_produto
-
         try:
             self.produto_servico.deletar_produto(id_produto)
             QMessageBox.information(self.dialog, "Sucesso", f"Produto ID {id_produto} excluído com sucesso.")
@@ -434,7 +494,10 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um cliente para editar.")
             return
 
-        cli = self.modelo_cliente._data[sel[0].row()]
+        cli = self.modelo_cliente.obter_objeto(sel[0].row())
+        if cli is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O cliente selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
         form = uic.loadUi("src/interfaces/telas/Form_Cliente.ui")
         form.setWindowTitle(f"Editar Cliente - {cli.nome}")
 
@@ -486,6 +549,12 @@ class ControladorTelaGerente:
             QMessageBox.warning(self.dialog, "Atenção", "Selecione um cliente para excluir.")
             return
 
+        cliente = self.modelo_cliente.obter_objeto(sel[0].row())
+        if cliente is None:
+            QMessageBox.warning(self.dialog, "Atenção", "O cliente selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
+        id_cliente = cliente.id_cliente
+
         resposta = QMessageBox.question(
             self.dialog,
             "Confirmação",
@@ -495,9 +564,6 @@ class ControladorTelaGerente:
         if resposta != QMessageBox.StandardButton.Yes:
             return
 
-        cliente = self.modelo_cliente._data[sel[0].row()]
-        id_cliente = cliente.id_cliente
-
         try:
             self.cliente_servico.deletar_cliente(id_cliente)
             QMessageBox.information(self.dialog, "Sucesso", f"Cliente ID {id_cliente} excluído com sucesso.")
@@ -505,6 +571,179 @@ class ControladorTelaGerente:
         except Exception as e:
             QMessageBox.critical(self.dialog, "Erro", str(e))
 
+    def exportar_vendas(self):
+        """
+        Pergunta o período e o arquivo de destino e exporta as vendas em segundo
+        plano, mantendo a interface responsiva durante a exportação.
+        """
+        if self.trabalho_exportacao is not None:
+            QMessageBox.information(self.dialog, "Exportação", "Já existe uma exportação em andamento.")
+            return
+
+        hoje = datetime.now().strftime("%Y-%m-%d")
+        inicio, ok = QInputDialog.getText(self.dialog, "Exportar Vendas", "Data inicial (AAAA-MM-DD):", text=hoje[:8] + "01")
+        if not ok:
+            return
+        fim, ok = QInputDialog.getText(self.dialog, "Exportar Vendas", "Data final (AAAA-MM-DD):", text=hoje)
+        if not ok:
+            return
+
+        try:
+            data_inicio = datetime.strptime(inicio.strip(), "%Y-%m-%d")
+            data_fim = datetime.combine(datetime.strptime(fim.strip(), "%Y-%m-%d").date(), time.max)
+        except ValueError:
+            QMessageBox.warning(self.dialog, "Erro", "Datas devem estar no formato AAAA-MM-DD.")
+            return
+
+        caminho, _ = QFileDialog.getSaveFileName(
+            self.dialog, "Salvar exportação", "vendas.csv",
+            "CSV (*.csv);;Parquet (*.parquet);;NumPy (*.npz)"
+        )
+        if not caminho:
+            return
+
+        self.trabalho_exportacao = Trabalhador(self._executar_exportacao, data_inicio, data_fim, caminho)
+        self.trabalho_exportacao.sinais.concluido.connect(self._exportacao_concluida)
+        self.trabalho_exportacao.sinais.erro.connect(self._exportacao_falhou)
+        self.dialog.botao_exportarVendas.setEnabled(False)
+        self.pool_threads.start(self.trabalho_exportacao)
+
+    @staticmethod
+    def _executar_exportacao(data_inicio: datetime, data_fim: datetime, caminho: str) -> dict:
+        """Roda na thread do pool, com serviço e sessão próprios."""
+        servico = ExportacaoServico()
+        try:
+            return servico.exportar_vendas(data_inicio, data_fim, caminho)
+        finally:
+            servico.venda_repo.fechar_sessao()
+
+    def _exportacao_concluida(self, resumo: dict):
+        self.trabalho_exportacao = None
+        self.dialog.botao_exportarVendas.setEnabled(True)
+        QMessageBox.information(
+            self.dialog, "Exportação concluída",
+            f"{resumo['linhas']} linhas exportadas para {resumo['caminho']} em {resumo['segundos']:.1f}s."
+        )
+
+    def _exportacao_falhou(self, mensagem: str):
+        self.trabalho_exportacao = None
+        self.dialog.botao_exportarVendas.setEnabled(True)
+        QMessageBox.critical(self.dialog, "Erro", mensagem)
+
+    def importar_produtos(self):
+        """
+        Importa em segundo plano um catálogo de produtos em CSV escolhido pelo
+        usuário; produtos com o mesmo nome são atualizados.
+        """
+        self._iniciar_importacao("produtos")
+
+    def importar_clientes(self):
+        """
+        Importa em segundo plano uma base de clientes em CSV escolhida pelo
+        usuário; CPFs inválidos, repetidos ou já cadastrados são reportados.
+        """
+        self._iniciar_importacao("clientes")
+
+    def _iniciar_importacao(self, tipo: str):
+        if self.trabalho_importacao is not None:
+            QMessageBox.information(self.dialog, "Importação", "Já existe uma importação em andamento.")
+            return
+
+        caminho, _ = QFileDialog.getOpenFileName(
+            self.dialog, f"Importar {tipo}", "", "CSV (*.csv)"
+        )
+        if not caminho:
+            return
+
+        self.trabalho_importacao = Trabalhador(self._executar_importacao, tipo, caminho)
+        self.trabalho_importacao.sinais.concluido.connect(self._importacao_concluida)
+        self.trabalho_importacao.sinais.erro.connect(self._importacao_falhou)
+        self._habilitar_botoes_importacao(False)
+        self.pool_threads.start(self.trabalho_importacao)
+
+    @staticmethod
+    def _executar_importacao(tipo: str, caminho: str) -> tuple:
+        """Roda na thread do pool, com serviço e sessão próprios."""
+        servico = ImportacaoServico()
+        try:
+            if tipo == "clientes":
+                resumo = servico.importar_clientes_csv(caminho)
+                return tipo, resumo["clientes_gravados"], resumo
+            resumo = servico.importar_produtos_csv(caminho)
+            return tipo, resumo["produtos_gravados"], resumo
+        finally:
+            servico.session.close()
+
+    def _habilitar_botoes_importacao(self, habilitar: bool):
+        self.dialog.botao_importarProdutos.setEnabled(habilitar)
+        self.dialog.botao_importarClientes.setEnabled(habilitar)
+
+    def _importacao_concluida(self, resultado: tuple):
+        tipo, gravados, resumo = resultado
+        self.trabalho_importacao = None
+        self._habilitar_botoes_importacao(True)
+        if tipo == "clientes":
+            self.atualizar_lista_clientes()
+        else:
+            self.atualizar_lista_produtos()
+
+        mensagem = (f"{gravados} {tipo} gravados de "
+                    f"{resumo['linhas_lidas']} linhas em {resumo['segundos']:.1f}s.")
+        if resumo["erros"]:
+            detalhes = "\n".join(f"Linha {linha}: {erro}" for linha, erro in resumo["erros"][:20])
+            if len(resumo["erros"]) > 20:
+                detalhes += f"\n... e mais {len(resumo['erros']) - 20} erros"
+            QMessageBox.warning(self.dialog, "Importação concluída com erros", f"{mensagem}\n\n{detalhes}")
+        else:
+            QMessageBox.information(self.dialog, "Importação concluída", mensagem)
+
+    def _importacao_falhou(self, mensagem: str):
+        self.trabalho_importacao = None
+        self._habilitar_botoes_importacao(True)
+        QMessageBox.critical(self.dialog, "Erro", mensagem)
+
+    def calcular_curva_abc(self):
+        """
+        Recalcula em segundo plano a classificação ABC dos produtos pela receita
+        dos últimos 12 meses e mostra a coluna atualizada na tabela de produtos.
+        """
+        if self.trabalho_classificacao is not None:
+            return
+
+        self.trabalho_classificacao = Trabalhador(self._executar_classificacao)
+        self.trabalho_classificacao.sinais.concluido.connect(self._classificacao_concluida)
+        self.trabalho_classificacao.sinais.erro.connect(self._classificacao_falhou)
+        self.dialog.botao_curvaABC.setEnabled(False)
+        self.pool_threads.start(self.trabalho_classificacao)
+
+    @staticmethod
+    def _executar_classificacao() -> dict:
+        """Roda na thread do pool, com serviço e sessão próprios."""
+        servico = AnaliseEstoqueServico()
+        try:
+            return servico.calcular_classificacao_abc()
+        finally:
+            servico.classificacao_repo.fechar_sessao()
+
+    def _classificacao_concluida(self, resumo: dict):
+        self.trabalho_classificacao = None
+        self.dialog.botao_curvaABC.setEnabled(True)
+        self.atualizar_lista_produtos()
+
+        linhas = "\n".join(
+            f"Classe {c['classe']}: {c['produtos']} produtos, R$ {c['receita']:.2f}"
+            for c in resumo["classes"]
+        )
+        QMessageBox.information(
+            self.dialog, "Curva ABC",
+            f"{resumo['produtos']} produtos classificados em {resumo['segundos']:.1f}s.\n\n{linhas}"
+        )
+
+    def _classificacao_falhou(self, mensagem: str):
+        self.trabalho_classificacao = None
+        self.dialog.botao_curvaABC.setEnabled(True)
+        QMessageBox.critical(self.dialog, "Erro", mensagem)
+
     def deslogar(self):
         """Fecha a janela da aplicação, efetivando o logout do usuário."""
         self.dialog.close()
@@ -1,58 +1,13 @@
 from decimal import Decimal
 from PyQt6.QtWidgets import QDialog, QMessageBox
 from PyQt6 import uic
-from PyQt6.QtCore import Qt, QAbstractTableModel
 from src.modelos.tabelas_bd import Produto
 from src.servicos.servico_produto import ProdutoServico
 from src.servicos.servico_cliente import ClienteServico
 from src.servicos.servico_itens_venda import ItensVendaServico
-
-
-class SimpleTableModel(QAbstractTableModel):
-    """
-    Modelo de tabela simples para exibição de listas genéricas,
-    com suporte a atualização dos dados e alteração visual da quantidade de produtos.
-    """
-    def __init__(self, data: list, columns: list, row_to_values_func):
-        super().__init__()
-        self._data = data
-        self._columns = columns
-        self._row_to_values = row_to_values_func
-
-    def rowCount(self, parent=None) -> int:
-        return len(self._data)
-
-    def columnCount(self, parent=None) -> int:
-        return len(self._columns)
-
-    def data(self, index, role):
-        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
-            return None
-        row_obj = self._data[index.row()]
-        return self._row_to_values(row_obj)[index.column()]
-
-    def headerData(self, section, orientation, role):
-        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
-            return self._columns[section]
-
-    def atualizar_dados(self, novos_dados: list):
-        self.beginResetModel()
-        self._data = novos_dados
-        self.endResetModel()
-
-    def atualizar_quantidade_produto(self, id_produto: int, delta: int):
-        """
-        Atualiza a quantidade visual do produto pelo delta fornecido (positivo ou negativo)
-        e emite o sinal para atualização da view.
-        """
-        for produto in self._data:
-            if produto.id_produto == id_produto:
-                produto.quantidade_estoque += delta
-                linha = self._data.index(produto)
-                topo_esquerda = self.createIndex(linha, 0)
-                fundo_direita = self.createIndex(linha, len(self._columns) - 1)
-                self.dataChanged.emit(topo_esquerda, fundo_direita, [Qt.ItemDataRole.DisplayRole])
-                break
+from src.servicos.servico_venda import VendaServico
+from src.interfaces.controladores.modelo_tabela import ConsultaTabela, ModeloTabelaPaginado
+from src.interfaces.controladores.carrinho import Carrinho
 
 
 class ControladorTelaVendedor:
@@ -67,9 +22,10 @@ class ControladorTelaVendedor:
         self.produto_servico = ProdutoServico()
         self.cliente_servico = ClienteServico()
         self.itens_venda_servico = ItensVendaServico()
+        self.venda_servico = VendaServico()
 
-        # Carrinho local mapeia {id_produto: quantidade}
-        self.carrinho_local = {}
+        # Carrinho local, também usado como modelo da tabela do carrinho
+        self.carrinho = Carrinho()
 
         # Interface carregada via arquivo .ui
         self.dialog = uic.loadUi("src/interfaces/telas/Menu_Vendas.ui")
@@ -85,27 +41,18 @@ class ControladorTelaVendedor:
         self.dialog.table_carrinho.setSelectionBehavior(self.dialog.table_carrinho.SelectionBehavior.SelectRows)
 
         # Inicialização dos modelos de dados para as tabelas
-        self.modelo_produtos = SimpleTableModel(
-            [],
+        self.modelo_produtos = ModeloTabelaPaginado(
+            self._buscar_pagina_produtos,
             ["ID", "Nome", "Preço", "Estoque"],
-            row_to_values_func=lambda p: [p.id_produto, p.nome, f"R$ {p.preco:.2f}", p.quantidade_estoque]
-        )
-        self.modelo_carrinho = SimpleTableModel(
-            [],
-            ["Produto", "Qtd", "Unitário", "Desconto"],
-            row_to_values_func=lambda i: [
-                self.produto_servico.buscar_produto_por_id(i.id_produto).nome if i.id_produto else "Produto Desconhecido",
-                i.quantidade,
-                f"R$ {i.preco_unitario:.2f}",
-                f"R$ {i.desconto_aplicado:.2f}"
-            ]
+            row_to_values_func=lambda p: [p.id_produto, p.nome, f"R$ {p.preco:.2f}", self.estoque_disponivel(p)],
+            chave_func=lambda p: p.id_produto
         )
         self.dialog.table_produtos.setModel(self.modelo_produtos)
-        self.dialog.table_carrinho.setModel(self.modelo_carrinho)
+        self.dialog.table_carrinho.setModel(self.carrinho)
 
         self.carregar_produtos()
         self.carregar_clientes()
-        self.dialog.comboBox_clientes.currentIndexChanged.connect(self.atualizar_carrinho_local)
+        self.dialog.comboBox_clientes.currentIndexChanged.connect(self.atualizar_desconto_cliente)
 
 
     def executar(self):
@@ -116,10 +63,23 @@ class ControladorTelaVendedor:
 
     def carregar_produtos(self):
         """
-        Busca todos os produtos do banco e atualiza o modelo da tabela de produtos.
+        Recarrega a tabela de produtos a partir da primeira página; as demais
+        são buscadas conforme a tabela é rolada.
         """
-        produtos = self.produto_servico.buscar_todos_produtos()
-        self.modelo_produtos.atualizar_dados(produtos)
+        self.modelo_produtos.recarregar()
+
+    @staticmethod
+    def _buscar_pagina_produtos(apos, limite: int, consulta: ConsultaTabela) -> list:
+        """Página de produtos, com serviço e sessão próprios (roda também no pool)."""
+        servico = ProdutoServico()
+        try:
+            return servico.buscar_produtos_paginado(apos, limite, *consulta)
+        finally:
+            servico.produto_repo.fechar_sessao()
+
+    def estoque_disponivel(self, produto) -> int:
+        """Estoque exibido: o do banco menos as unidades já colocadas no carrinho."""
+        return produto.quantidade_estoque - self.carrinho.quantidade_de(produto.id_produto)
 
     def carregar_clientes(self):
         """
@@ -150,18 +110,20 @@ class ControladorTelaVendedor:
         if not index.isValid():
             QMessageBox.warning(self.dialog, "Aviso", "Selecione um produto")
             return
-        produto = self.modelo_produtos._data[index.row()]
-        if produto.quantidade_estoque <= 0:
+        produto = self.modelo_produtos.obter_objeto(index.row())
+        if produto is None:
+            QMessageBox.warning(self.dialog, "Aviso", "O produto selecionado não está mais na lista. Atualize a tabela e tente novamente.")
+            return
+        if self.estoque_disponivel(produto) <= 0:
             QMessageBox.warning(self.dialog, "Aviso", "Produto sem estoque disponível")
             return
 
-        qtd_atual = self.carrinho_local.get(produto.id_produto, 0)
-        self.carrinho_local[produto.id_produto] = qtd_atual + 1
+        self.carrinho.adicionar(produto.id_produto, produto.nome, produto.preco)
 
         # Atualiza estoque visual (-1), só na UI, não no banco
-        self.modelo_produtos.atualizar_quantidade_produto(produto.id_produto, -1)
+        self.modelo_produtos.atualizar_linha(produto.id_produto)
 
-        self.atualizar_carrinho_local()
+        self.atualizar_valor_total_local()
 
     def remover_item(self):
         """
@@ -171,97 +133,60 @@ class ControladorTelaVendedor:
         if not index.isValid():
             QMessageBox.warning(self.dialog, "Aviso", "Selecione um item do carrinho")
             return
-        item = self.modelo_carrinho._data[index.row()]
-        id_produto = item.id_produto
-        qtd_atual = self.carrinho_local.get(id_produto, 0)
-        if qtd_atual <= 1:
-            self.carrinho_local.pop(id_produto, None)
-        else:
-            self.carrinho_local[id_produto] = qtd_atual - 1
+        id_produto = self.carrinho.obter_item(index.row()).id_produto
+        self.carrinho.remover(id_produto)
 
         # Atualiza estoque visual (+1), só na UI, não no banco
-        self.modelo_produtos.atualizar_quantidade_produto(id_produto, +1)
+        self.modelo_produtos.atualizar_linha(id_produto)
 
-        self.atualizar_carrinho_local()
+        self.atualizar_valor_total_local()
 
-    def atualizar_carrinho_local(self):
+    def atualizar_desconto_cliente(self):
         """
-        Atualiza os itens exibidos no carrinho, aplicando desconto de 5% caso
-        cliente selecionado seja diferente de 'Sem Cliente'.
+        Aplica ao carrinho o desconto de 5% caso o cliente selecionado seja
+        diferente de 'Sem Cliente', ou remove o desconto, e atualiza o total.
         """
         cliente_id = self.obter_cliente_selecionado()
-        aplicar_desconto = cliente_id is not None  # Desconto se cliente selecionado
-
-        itens_exibicao = []
-        for id_produto, quantidade in self.carrinho_local.items():
-            produto = next((p for p in self.modelo_produtos._data if p.id_produto == id_produto), None)
-            if not produto:
-                continue
-
-            item_exibicao = type("ItemExibicao", (), {})()
-            item_exibicao.id_produto = id_produto
-            item_exibicao.quantidade = quantidade
-            item_exibicao.preco_unitario = produto.preco
-
-            # Aplica desconto se cliente válido
-            if aplicar_desconto:
-                item_exibicao.desconto_aplicado = (produto.preco * self.DESCONTO_CLIENTE).quantize(Decimal("0.01"))
-            else:
-                item_exibicao.desconto_aplicado = Decimal("0.00")
-
-            itens_exibicao.append(item_exibicao)
-
-        self.modelo_carrinho.atualizar_dados(itens_exibicao)
+        self.carrinho.definir_percentual_desconto(
+            self.DESCONTO_CLIENTE if cliente_id is not None else Decimal("0"))
         self.atualizar_valor_total_local()
 
     def atualizar_valor_total_local(self):
         """
-        Atualiza o valor total exibido na tela, considerando o desconto
-        de 5% para clientes cadastrados.
+        Exibe o valor total mantido pelo carrinho, já com o desconto de 5%
+        para clientes cadastrados.
         """
-        cliente_id = self.obter_cliente_selecionado()
-        aplicar_desconto = cliente_id is not None
-
-        total = Decimal("0.0")
-        for id_produto, quantidade in self.carrinho_local.items():
-            produto = next((p for p in self.modelo_produtos._data if p.id_produto == id_produto), None)
-            if produto:
-                subtotal = produto.preco * quantidade
-                if aplicar_desconto:
-                    desconto = subtotal * self.DESCONTO_CLIENTE
-                    subtotal -= desconto
-                total += subtotal
-
-        self.dialog.label_valorTotal.setText(f"Valor Total: R$ {total:.2f}")
+        self.dialog.label_valorTotal.setText(f"Valor Total: R$ {self.carrinho.total:.2f}")
 
     def concluir_compra(self):
         """
-        Finaliza a compra reduzindo o estoque no banco e atualizando a UI.
-        Aplica desconto visual na exibição, mas o banco registra o valor total
-        sem desconto (pode ser adaptado para salvar desconto se desejar).
+        Finaliza a compra registrando a venda, seus itens e a baixa de estoque
+        de todo o carrinho em uma única transação, e atualiza a UI.
+        O desconto de 5% para clientes cadastrados é gravado nos itens da venda.
         """
-        if not self.carrinho_local:
+        if len(self.carrinho) == 0:
             QMessageBox.information(self.dialog, "Atenção", "Carrinho vazio")
             return
 
         try:
-            # Reposição visual do estoque na UI antes da redução no banco
-            for id_produto, quantidade in self.carrinho_local.items():
-                self.modelo_produtos.atualizar_quantidade_produto(id_produto, quantidade)
+            venda = self.venda_servico.concluir_compra(
+                self.id_funcionario,
+                self.carrinho.quantidades(),
+                self.obter_cliente_selecionado()
+            )
 
-            # Redução do estoque efetiva no banco
-            for id_produto, quantidade in self.carrinho_local.items():
-                self.produto_servico.reduzir_estoque(id_produto, quantidade)
+            QMessageBox.information(
+                self.dialog, "Sucesso",
+                f"Compra concluída com sucesso! Total: R$ {venda.valor_total:.2f}")
 
-            QMessageBox.information(self.dialog, "Sucesso", "Compra concluída com sucesso!")
+            # Limpa o carrinho antes de recarregar: o estoque exibido desconta
+            # as unidades do carrinho, que agora já saíram do banco
+            self.carrinho.limpar()
+            self.atualizar_valor_total_local()
 
             # Atualiza a tabela de produtos para refletir estoque atualizado
             self.carregar_produtos()
 
-            # Limpa carrinho e atualiza UI
-            self.carrinho_local.clear()
-            self.atualizar_carrinho_local()
-
         except Exception as e:
             QMessageBox.critical(self.dialog, "Erro", f"Erro ao concluir compra: {str(e)}")
 
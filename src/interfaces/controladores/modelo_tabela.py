@@ -0,0 +1,379 @@
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool
+from src.configs.config_globais import PAGINAS_EM_MEMORIA_TABELAS, TAMANHO_PAGINA_TABELAS
+from src.interfaces.controladores.trabalhador import Trabalhador
+
+"""
+Este arquivo define o modelo de tabela compartilhado pelas telas do sistema.
+Cada objeto é formatado uma única vez, quando os dados são carregados ou quando
+a linha muda, em uma tupla com os valores já prontos para exibição; o data()
+chamado pela view a cada pintura apenas indexa essa tupla. Com uma função de
+chave, o modelo mantém também um índice chave -> linha para localizar e
+atualizar uma linha sem percorrer a lista.
+O ModeloTabelaPaginado segue a mesma ideia para tabelas grandes: em vez de
+receber a lista inteira, busca páginas por chave (keyset) conforme a view rola
+até o fim, antecipa a próxima página em segundo plano e descarta da memória as
+páginas distantes da região exibida, recarregando-as se o usuário voltar.
+A ordenação pelo cabeçalho e os filtros da busca também ficam no banco: o modelo
+guarda a consulta atual (coluna, sentido e filtros) e a repassa a cada página,
+de modo que reordenar uma tabela grande custa uma consulta indexada de uma
+página, e não a ordenação da lista inteira em memória.
+"""
+
+
+class ConsultaTabela(NamedTuple):
+    """Ordenação e filtros repassados a buscar_pagina (None ordena pela chave)."""
+    ordenar_por: Optional[str] = None
+    decrescente: bool = False
+    filtros: Optional[dict] = None
+
+
+class SimpleTableModel(QAbstractTableModel):
+    """
+    Modelo de tabela simples para uso com QTableView, parametrizado para
+    qualquer lista de objetos com colunas dinâmicas. `row_to_values_func`
+    transforma um objeto nos valores de suas colunas; `chave_func`, opcional,
+    devolve o identificador do objeto (ex.: lambda p: p.id_produto).
+    """
+
+    def __init__(self, data: List, columns: List[str], row_to_values_func: Callable[[Any], list],
+                 chave_func: Optional[Callable[[Any], Hashable]] = None):
+        super().__init__()
+        self._columns = columns
+        self._row_to_values = row_to_values_func
+        self._chave = chave_func
+        self._preencher(data)
+
+    def _preencher(self, data: List):
+        self._data = list(data)
+        self._linhas = [tuple(self._row_to_values(obj)) for obj in self._data]
+        self._indice = {self._chave(obj): linha for linha, obj in enumerate(self._data)} if self._chave else {}
+
+    def rowCount(self, parent=None) -> int:
+        return len(self._linhas)
+
+    def columnCount(self, parent=None) -> int:
+        return len(self._columns)
+
+    def data(self, index, role):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self._linhas[index.row()][index.column()]
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section]
+
+    def atualizar_dados(self, novos_dados: List):
+        """Substitui todos os objetos da tabela, formatando cada linha uma vez."""
+        self.beginResetModel()
+        self._preencher(novos_dados)
+        self.endResetModel()
+
+    def obter_objeto(self, linha: int):
+        """Objeto exibido na linha informada."""
+        return self._data[linha]
+
+    def linha_da_chave(self, chave: Hashable) -> Optional[int]:
+        """Linha do objeto com a chave informada, ou None se não estiver na tabela."""
+        return self._indice.get(chave)
+
+    def obter_por_chave(self, chave: Hashable):
+        """Objeto com a chave informada, ou None se não estiver na tabela."""
+        linha = self._indice.get(chave)
+        return None if linha is None else self._data[linha]
+
+    def atualizar_linha(self, chave: Hashable) -> bool:
+        """
+        Reformata apenas a linha do objeto com a chave informada, depois que ele
+        foi alterado, e avisa a view. Retorna False se a chave não está na tabela.
+        """
+        linha = self._indice.get(chave)
+        if linha is None:
+            return False
+
+        self._linhas[linha] = tuple(self._row_to_values(self._data[linha]))
+        self.dataChanged.emit(
+            self.index(linha, 0),
+            self.index(linha, len(self._columns) - 1),
+            [Qt.ItemDataRole.DisplayRole]
+        )
+        return True
+
+
+class ModeloTabelaPaginado(QAbstractTableModel):
+    """
+    Modelo de tabela carregado sob demanda, com a mesma interface de consulta
+    do SimpleTableModel (obter_objeto, obter_por_chave, atualizar_linha...).
+    `buscar_pagina(apos, limite, consulta)` deve retornar até `limite` objetos
+    posteriores a `apos` (None na primeira página) na ordem da ConsultaTabela,
+    e abrir a própria sessão de banco, pois também roda em threads do pool.
+    `apos` é a chave do último objeto (devolvida por `chave_func`) ou, com
+    consulta.ordenar_por, o par (valor do atributo, chave). `campos_ordenacao`
+    liga cada coluna ordenável ao atributo (None para a ordem da chave); clicar
+    nas demais colunas não muda a ordenação.
+    """
+
+    def __init__(self, buscar_pagina: Callable[[Any, int, ConsultaTabela], List], columns: List[str],
+                 row_to_values_func: Callable[[Any], list], chave_func: Callable[[Any], Hashable],
+                 tamanho_pagina: int = TAMANHO_PAGINA_TABELAS,
+                 paginas_em_memoria: int = PAGINAS_EM_MEMORIA_TABELAS,
+                 pool: QThreadPool | None = None,
+                 campos_ordenacao: Optional[Dict[int, Optional[str]]] = None):
+        super().__init__()
+        if tamanho_pagina <= 0 or paginas_em_memoria < 2:
+            raise Exception("Página deve ter ao menos uma linha e a memória ao menos duas páginas")
+
+        self._buscar_pagina = buscar_pagina
+        self._columns = columns
+        self._row_to_values = row_to_values_func
+        self._chave = chave_func
+        self._tamanho_pagina = tamanho_pagina
+        self._paginas_em_memoria = paginas_em_memoria
+        self._pool = pool or QThreadPool.globalInstance()
+        self._campos_ordenacao = campos_ordenacao or {}
+        self._consulta = ConsultaTabela()
+        self._geracao = 0
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Esquece todas as páginas; a nova geração invalida antecipações em andamento."""
+        self._geracao += 1
+        self._objetos: Dict[int, list] = {}
+        self._linhas: Dict[int, List[tuple]] = {}
+        self._inicios: List[Any] = []   # cursor anterior à primeira linha de cada página
+        self._indice: Dict[Hashable, int] = {}
+        self._ultima_chave = None
+        self._total = 0
+        self._fim = False
+        self._lista_fixa = False
+        self._pagina_atual = 0
+        self._antecipacao: Optional[Trabalhador] = None
+        self._pagina_pronta: Optional[Tuple[list, List[tuple]]] = None
+        self._aguardando_antecipacao = False
+
+    def _buscar(self, apos: Any, consulta: ConsultaTabela) -> Tuple[list, List[tuple]]:
+        """Busca e formata uma página; roda tanto na interface quanto no pool."""
+        objetos = list(self._buscar_pagina(apos, self._tamanho_pagina, consulta))
+        return objetos, [tuple(self._row_to_values(obj)) for obj in objetos]
+
+    def _cursor(self, obj) -> Any:
+        """Posição do objeto na ordem da consulta, usada como `apos` da página seguinte."""
+        if self._consulta.ordenar_por is None:
+            return self._chave(obj)
+        return getattr(obj, self._consulta.ordenar_por), self._chave(obj)
+
+    def _guardar(self, pagina: int, objetos: list, linhas: List[tuple]):
+        self._objetos[pagina] = objetos
+        self._linhas[pagina] = linhas
+        primeira = pagina * self._tamanho_pagina
+        for deslocamento, obj in enumerate(objetos):
+            self._indice[self._chave(obj)] = primeira + deslocamento
+
+    def _descartar_distantes(self):
+        """Mantém em memória apenas as páginas mais próximas da região exibida."""
+        if self._lista_fixa:
+            return
+        while len(self._linhas) > self._paginas_em_memoria:
+            distante = max(self._linhas, key=lambda pagina: abs(pagina - self._pagina_atual))
+            for obj in self._objetos.pop(distante):
+                self._indice.pop(self._chave(obj), None)
+            del self._linhas[distante]
+
+    def _garantir_pagina(self, pagina: int):
+        """Recarrega pela chave de início uma página que foi descartada."""
+        self._pagina_atual = pagina
+        if pagina in self._linhas:
+            return
+        objetos, linhas = self._buscar(self._inicios[pagina], self._consulta)
+        self._guardar(pagina, objetos, linhas)
+        self._descartar_distantes()
+
+    def _anexar_pagina(self, objetos: list, linhas: List[tuple]):
+        """Acrescenta a próxima página ao fim da tabela e antecipa a seguinte."""
+        if len(objetos) < self._tamanho_pagina:
+            self._fim = True
+        if objetos:
+            pagina = len(self._inicios)
+            self.beginInsertRows(QModelIndex(), self._total, self._total + len(objetos) - 1)
+            self._inicios.append(self._ultima_chave)
+            self._guardar(pagina, objetos, linhas)
+            self._ultima_chave = self._cursor(objetos[-1])
+            self._total += len(objetos)
+            self.endInsertRows()
+            self._pagina_atual = pagina
+            self._descartar_distantes()
+        self._antecipar()
+
+    def _antecipar(self):
+        if self._fim or self._antecipacao is not None or self._pagina_pronta is not None:
+            return
+        self._antecipacao = Trabalhador(self._buscar_em_segundo_plano, self._geracao, self._ultima_chave,
+                                        self._consulta)
+        self._antecipacao.sinais.concluido.connect(self._antecipacao_concluida)
+        self._antecipacao.sinais.erro.connect(self._antecipacao_falhou)
+        self._pool.start(self._antecipacao)
+
+    def _buscar_em_segundo_plano(self, geracao: int, apos: Any, consulta: ConsultaTabela) -> tuple:
+        """Roda na thread do pool."""
+        return (geracao, apos) + self._buscar(apos, consulta)
+
+    def _antecipacao_concluida(self, resultado: tuple):
+        geracao, apos, objetos, linhas = resultado
+        if geracao != self._geracao:
+            return
+        self._antecipacao = None
+        if apos != self._ultima_chave:
+            self._antecipar()
+        elif self._aguardando_antecipacao:
+            self._aguardando_antecipacao = False
+            self._anexar_pagina(objetos, linhas)
+        else:
+            self._pagina_pronta = (objetos, linhas)
+
+    def _antecipacao_falhou(self, mensagem: str):
+        # Sem a página antecipada, o próximo fetchMore busca na própria interface
+        self._antecipacao = None
+        self._aguardando_antecipacao = False
+
+    # Modelo Qt
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._total
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self._columns)
+
+    def data(self, index, role):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        pagina, deslocamento = divmod(index.row(), self._tamanho_pagina)
+        self._garantir_pagina(pagina)
+        linhas = self._linhas[pagina]
+        if deslocamento >= len(linhas):
+            return None
+        return linhas[deslocamento][index.column()]
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section]
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._fim
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fim:
+            return
+        if self._pagina_pronta is not None:
+            objetos, linhas = self._pagina_pronta
+            self._pagina_pronta = None
+            self._anexar_pagina(objetos, linhas)
+        elif self._antecipacao is not None:
+            self._aguardando_antecipacao = True
+        else:
+            self._anexar_pagina(*self._buscar(self._ultima_chave, self._consulta))
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """
+        Chamado pela view ao clicar no cabeçalho: refaz a consulta a partir da
+        primeira página na nova ordem, mantendo os filtros.
+        """
+        if column not in self._campos_ordenacao:
+            return
+        consulta = self._consulta._replace(
+            ordenar_por=self._campos_ordenacao[column],
+            decrescente=order == Qt.SortOrder.DescendingOrder
+        )
+        if consulta != self._consulta:
+            self.recarregar(consulta=consulta)
+
+    # Consulta e atualização
+
+    @property
+    def tamanho_pagina(self) -> int:
+        return self._tamanho_pagina
+
+    @property
+    def consulta(self) -> ConsultaTabela:
+        return self._consulta
+
+    @property
+    def coluna_ordenada(self) -> int:
+        """Coluna cuja ordenação está em uso (a da chave, se nenhuma foi escolhida)."""
+        for coluna, campo in self._campos_ordenacao.items():
+            if campo == self._consulta.ordenar_por:
+                return coluna
+        return 0
+
+    def recarregar(self, primeira_pagina: Optional[List] = None, consulta: Optional[ConsultaTabela] = None):
+        """
+        Volta ao início da consulta paginada, buscando apenas a primeira página.
+        `consulta`, se informada, passa a ser a consulta da tabela (ordenação e
+        filtros). `primeira_pagina`, se informada, é usada no lugar da busca
+        (ex.: já feita em segundo plano com buscar_pagina(None, tamanho_pagina,
+        consulta)).
+        """
+        self.beginResetModel()
+        if consulta is not None:
+            self._consulta = consulta
+        self._reiniciar()
+        self.endResetModel()
+        if primeira_pagina is None:
+            self._anexar_pagina(*self._buscar(None, self._consulta))
+        else:
+            objetos = list(primeira_pagina)
+            self._anexar_pagina(objetos, [tuple(self._row_to_values(obj)) for obj in objetos])
+
+    def atualizar_dados(self, novos_dados: List):
+        """
+        Exibe uma lista já pronta (ex.: resultado de uma busca) no lugar da
+        consulta paginada, até o próximo recarregar().
+        """
+        self.beginResetModel()
+        self._reiniciar()
+        self._lista_fixa = True
+        self._fim = True
+        novos_dados = list(novos_dados)
+        for pagina, inicio in enumerate(range(0, len(novos_dados), self._tamanho_pagina)):
+            objetos = novos_dados[inicio:inicio + self._tamanho_pagina]
+            self._inicios.append(None)
+            self._guardar(pagina, objetos, [tuple(self._row_to_values(obj)) for obj in objetos])
+        self._total = len(novos_dados)
+        self.endResetModel()
+
+    def obter_objeto(self, linha: int):
+        """Objeto exibido na linha informada (None se a linha sumiu ao recarregar a página)."""
+        pagina, deslocamento = divmod(linha, self._tamanho_pagina)
+        self._garantir_pagina(pagina)
+        objetos = self._objetos[pagina]
+        return objetos[deslocamento] if deslocamento < len(objetos) else None
+
+    def linha_da_chave(self, chave: Hashable) -> Optional[int]:
+        """Linha do objeto com a chave informada, se a página dele está em memória."""
+        return self._indice.get(chave)
+
+    def obter_por_chave(self, chave: Hashable):
+        """Objeto com a chave informada, se a página dele está em memória."""
+        linha = self._indice.get(chave)
+        if linha is None:
+            return None
+        pagina, deslocamento = divmod(linha, self._tamanho_pagina)
+        return self._objetos[pagina][deslocamento]
+
+    def atualizar_linha(self, chave: Hashable) -> bool:
+        """
+        Reformata apenas a linha do objeto com a chave informada e avisa a
+        view. Retorna False se a página do objeto não está em memória.
+        """
+        linha = self._indice.get(chave)
+        if linha is None:
+            return False
+
+        pagina, deslocamento = divmod(linha, self._tamanho_pagina)
+        self._linhas[pagina][deslocamento] = tuple(self._row_to_values(self._objetos[pagina][deslocamento]))
+        self.dataChanged.emit(
+            self.index(linha, 0),
+            self.index(linha, len(self._columns) - 1),
+            [Qt.ItemDataRole.DisplayRole]
+        )
+        return True
@@ -0,0 +1,36 @@
+from typing import Callable
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+"""
+Este arquivo define um executor genérico para rodar operações demoradas (consultas
+grandes, exportações) no QThreadPool, fora da thread da interface. O resultado ou
+a mensagem de erro volta para a interface através de sinais Qt.
+"""
+
+
+class SinaisTrabalhador(QObject):
+    """Sinais emitidos pelo Trabalhador ao terminar."""
+    concluido = pyqtSignal(object)
+    erro = pyqtSignal(str)
+
+
+class Trabalhador(QRunnable):
+    """
+    Executa `funcao` em uma thread do pool. A função não deve usar a sessão de
+    banco da interface: cada trabalho deve abrir seus próprios serviços.
+    """
+
+    def __init__(self, funcao: Callable, *args, **kwargs):
+        super().__init__()
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.sinais = SinaisTrabalhador()
+
+    def run(self):
+        try:
+            resultado = self.funcao(*self.args, **self.kwargs)
+        except Exception as e:
+            self.sinais.erro.emit(str(e))
+        else:
+            self.sinais.concluido.emit(resultado)
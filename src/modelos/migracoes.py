@@ -0,0 +1,279 @@
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Table, Column, Integer, String, DateTime, select, func, inspect, text, bindparam, update
+from sqlalchemy.engine import Connection, Engine
+from src.configs.config_bd import Base
+from src.modelos import tabelas_bd
+
+"""
+Este arquivo implementa um executor simples de migrações versionadas do esquema.
+O Base.metadata.create_all cria apenas tabelas inexistentes e nunca adiciona
+índices ou colunas a tabelas que já existem em produção, então cada alteração
+desse tipo é registrada aqui como uma migração numerada. A versão aplicada fica
+gravada na tabela versao_esquema e cada migração roda em sua própria transação.
+"""
+
+versao_esquema = Table(
+    'versao_esquema',
+    Base.metadata,
+    Column('versao', Integer, primary_key=True, autoincrement=False),
+    Column('descricao', String(255), nullable=False),
+    Column('data_aplicacao', DateTime, nullable=False),
+)
+
+Migracao = Tuple[int, str, Callable[[Connection], None]]
+
+MIGRACOES: List[Migracao] = []
+
+
+def migracao(versao: int, descricao: str):
+    """Registra a função decorada como a migração de número `versao`."""
+    def registrar(funcao: Callable[[Connection], None]):
+        if any(m[0] == versao for m in MIGRACOES):
+            raise Exception(f"Migração {versao} registrada em duplicidade")
+        MIGRACOES.append((versao, descricao, funcao))
+        return funcao
+    return registrar
+
+
+def _criar_indices(conexao: Connection, tabela: Table, nomes: List[str]):
+    """Cria os índices declarados no modelo, ignorando os que já existem."""
+    for indice in tabela.indexes:
+        if indice.name in nomes:
+            indice.create(conexao, checkfirst=True)
+
+
+@migracao(1, "Índices secundários de venda, itens_venda e produto")
+def _m001_indices_filtros(conexao: Connection):
+    _criar_indices(conexao, tabelas_bd.Venda.__table__, [
+        'ix_venda_data_venda',
+        'ix_venda_funcionario_data',
+        'ix_venda_cliente_data',
+    ])
+    _criar_indices(conexao, tabelas_bd.ItensVenda.__table__, [
+        'ix_itens_venda_venda',
+        'ix_itens_venda_produto',
+    ])
+    _criar_indices(conexao, tabelas_bd.Produto.__table__, [
+        'ix_produto_quantidade_estoque',
+    ])
+
+
+def _sqlite_tem_fts5(conexao: Connection) -> bool:
+    """Verifica se o SQLite em uso foi compilado com o módulo FTS5."""
+    opcoes = conexao.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in opcoes
+
+
+@migracao(2, "Índice de texto completo em produto (nome, descricao)")
+def _m002_busca_texto_produto(conexao: Connection):
+    _criar_indices(conexao, tabelas_bd.Produto.__table__, ['ix_produto_nome'])
+
+    dialeto = conexao.dialect.name
+    if dialeto == "sqlite" and _sqlite_tem_fts5(conexao):
+        # Tabela FTS5 de conteúdo externo, mantida em sincronia por triggers
+        conexao.exec_driver_sql("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS produto_fts USING fts5(
+                nome, descricao,
+                content='produto', content_rowid='id_produto',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        conexao.exec_driver_sql("""
+            CREATE TRIGGER IF NOT EXISTS produto_fts_ai AFTER INSERT ON produto BEGIN
+                INSERT INTO produto_fts(rowid, nome, descricao)
+                VALUES (new.id_produto, new.nome, new.descricao);
+            END
+        """)
+        conexao.exec_driver_sql("""
+            CREATE TRIGGER IF NOT EXISTS produto_fts_ad AFTER DELETE ON produto BEGIN
+                INSERT INTO produto_fts(produto_fts, rowid, nome, descricao)
+                VALUES ('delete', old.id_produto, old.nome, old.descricao);
+            END
+        """)
+        conexao.exec_driver_sql("""
+            CREATE TRIGGER IF NOT EXISTS produto_fts_au AFTER UPDATE OF nome, descricao ON produto BEGIN
+                INSERT INTO produto_fts(produto_fts, rowid, nome, descricao)
+                VALUES ('delete', old.id_produto, old.nome, old.descricao);
+                INSERT INTO produto_fts(rowid, nome, descricao)
+                VALUES (new.id_produto, new.nome, new.descricao);
+            END
+        """)
+        conexao.exec_driver_sql("INSERT INTO produto_fts(produto_fts) VALUES ('rebuild')")
+
+    elif dialeto == "mysql":
+        indices = {i["name"] for i in inspect(conexao).get_indexes("produto")}
+        if "ft_produto_nome_descricao" not in indices:
+            conexao.execute(text(
+                "ALTER TABLE produto ADD FULLTEXT INDEX ft_produto_nome_descricao (nome, descricao)"
+            ))
+
+
+def _adicionar_coluna(conexao: Connection, tabela: Table, nome_coluna: str):
+    """Adiciona ao banco uma coluna declarada no modelo, se ela ainda não existir."""
+    existentes = {c["name"] for c in inspect(conexao).get_columns(tabela.name)}
+    if nome_coluna in existentes:
+        return
+    coluna = tabela.c[nome_coluna]
+    tipo = coluna.type.compile(dialect=conexao.dialect)
+    conexao.execute(text(f"ALTER TABLE {tabela.name} ADD COLUMN {nome_coluna} {tipo}"))
+
+
+@migracao(3, "Chave única de nome normalizado em produto")
+def _m003_nome_normalizado_produto(conexao: Connection):
+    tabela = tabelas_bd.Produto.__table__
+    _adicionar_coluna(conexao, tabela, 'nome_normalizado')
+
+    # Preenche a chave dos produtos existentes. Em nomes que já colidem, apenas o
+    # produto mais antigo recebe a chave; os demais ficam NULL até serem renomeados.
+    usados = set()
+    parametros = []
+    for id_produto, nome in conexao.execute(
+            select(tabela.c.id_produto, tabela.c.nome).order_by(tabela.c.id_produto)):
+        chave = tabelas_bd.normalizar_nome_produto(nome)
+        if chave in usados:
+            continue
+        usados.add(chave)
+        parametros.append({"b_id_produto": id_produto, "b_nome_normalizado": chave})
+
+    if parametros:
+        conexao.execute(
+            update(tabela)
+            .where(tabela.c.id_produto == bindparam("b_id_produto"))
+            .values(nome_normalizado=bindparam("b_nome_normalizado")),
+            parametros
+        )
+
+    _criar_indices(conexao, tabela, ['ux_produto_nome_normalizado'])
+
+
+@migracao(4, "Resumo diário de vendas (venda_resumo_diario)")
+def _m004_resumo_diario_vendas(conexao: Connection):
+    # A tabela é criada pelo create_all; aqui ela é preenchida com o histórico
+    from src.repositorios.repositorio_resumo_venda import reconstruir_resumo_diario
+    tabelas_bd.VendaResumoDiario.__table__.create(conexao, checkfirst=True)
+    reconstruir_resumo_diario(conexao)
+
+
+@migracao(5, "Preço de custo em produto (margem e valorização do estoque)")
+def _m005_preco_custo_produto(conexao: Connection):
+    _adicionar_coluna(conexao, tabelas_bd.Produto.__table__, 'preco_custo')
+
+
+@migracao(6, "Classificação ABC de produtos (produto_classificacao)")
+def _m006_classificacao_abc(conexao: Connection):
+    # Preenchida sob demanda pelo AnaliseEstoqueServico
+    tabelas_bd.ProdutoClassificacao.__table__.create(conexao, checkfirst=True)
+
+
+@migracao(7, "Ponto de reposição de produtos (produto_reposicao)")
+def _m007_ponto_reposicao(conexao: Connection):
+    # Preenchida sob demanda pelo AnaliseEstoqueServico
+    tabelas_bd.ProdutoReposicao.__table__.create(conexao, checkfirst=True)
+
+
+@migracao(8, "Contadores de vendas por produto (produto_venda_contador e produto_venda_diaria)")
+def _m008_contadores_produto(conexao: Connection):
+    # As tabelas são criadas pelo create_all; aqui elas são preenchidas com o histórico
+    from src.repositorios.repositorio_contador_produto import reconstruir_contadores_produto
+    tabelas_bd.ProdutoVendaContador.__table__.create(conexao, checkfirst=True)
+    tabelas_bd.ProdutoVendaDiaria.__table__.create(conexao, checkfirst=True)
+    reconstruir_contadores_produto(conexao)
+
+
+@migracao(9, "Índices de ordenação e filtro das tabelas de gestão (produto.preco, cliente.nome, funcionario.nome)")
+def _m009_indices_ordenacao_tabelas(conexao: Connection):
+    _criar_indices(conexao, tabelas_bd.Produto.__table__, ['ix_produto_preco'])
+    _criar_indices(conexao, tabelas_bd.Cliente.__table__, ['ix_cliente_nome'])
+    _criar_indices(conexao, tabelas_bd.Funcionario.__table__, ['ix_funcionario_nome'])
+
+
+@migracao(10, "CPFs de clientes gravados apenas com dígitos")
+def _m010_normalizar_cpfs_clientes(conexao: Connection):
+    # Cadastros feitos pela tela gravavam o CPF como digitado (ex.: 529.982.247-25)
+    cliente = tabelas_bd.Cliente.__table__
+    resultado = conexao.execution_options(yield_per=10000).execute(select(cliente.c.id_cliente, cliente.c.cpf))
+    formatados = [
+        (id_cliente, tabelas_bd.normalizar_cpf(cpf))
+        for id_cliente, cpf in resultado
+        if cpf != tabelas_bd.normalizar_cpf(cpf)
+    ]
+
+    ocupados = set()
+    for inicio in range(0, len(formatados), 500):
+        normalizados = [cpf for _, cpf in formatados[inicio:inicio + 500]]
+        ocupados.update(conexao.execute(
+            select(cliente.c.cpf).where(cliente.c.cpf.in_(normalizados))
+        ).scalars())
+
+    atualizacoes, conflitos = [], []
+    for id_cliente, cpf in formatados:
+        if cpf in ocupados:
+            conflitos.append(id_cliente)
+        else:
+            ocupados.add(cpf)
+            atualizacoes.append({"id": id_cliente, "novo_cpf": cpf})
+
+    if atualizacoes:
+        conexao.execute(
+            update(cliente).where(cliente.c.id_cliente == bindparam("id")).values(cpf=bindparam("novo_cpf")),
+            atualizacoes
+        )
+    if conflitos:
+        # Mesmo CPF cadastrado duas vezes: mantidos como estão para revisão manual
+        print(f"CPFs duplicados mantidos sem normalizar (id_cliente): {', '.join(map(str, conflitos))}")
+
+
+@migracao(11, "Nome normalizado (busca sem diferenciar acentos e maiúsculas) em cliente e funcionario")
+def _m011_nome_normalizado_pessoas(conexao: Connection):
+    for modelo, chave_primaria, indice in (
+            (tabelas_bd.Cliente, 'id_cliente', 'ix_cliente_nome_normalizado'),
+            (tabelas_bd.Funcionario, 'id_funcionario', 'ix_funcionario_nome_normalizado')):
+        tabela = modelo.__table__
+        _adicionar_coluna(conexao, tabela, 'nome_normalizado')
+
+        resultado = conexao.execution_options(yield_per=10000).execute(
+            select(tabela.c[chave_primaria], tabela.c.nome))
+        parametros = [
+            {"b_id": id_registro, "b_nome_normalizado": tabelas_bd.normalizar_nome_produto(nome)}
+            for id_registro, nome in resultado
+        ]
+        if parametros:
+            conexao.execute(
+                update(tabela)
+                .where(tabela.c[chave_primaria] == bindparam("b_id"))
+                .values(nome_normalizado=bindparam("b_nome_normalizado")),
+                parametros
+            )
+
+        _criar_indices(conexao, tabela, [indice])
+
+
+def obter_versao_atual(conexao: Connection) -> int:
+    """Retorna a maior versão já aplicada (0 para um banco sem migrações)."""
+    return conexao.execute(select(func.max(versao_esquema.c.versao))).scalar() or 0
+
+
+def aplicar_migracoes(engine: Engine) -> List[int]:
+    """Aplica, em ordem, todas as migrações pendentes e retorna as versões aplicadas."""
+    versao_esquema.create(engine, checkfirst=True)
+
+    with engine.connect() as conexao:
+        versao_atual = obter_versao_atual(conexao)
+
+    aplicadas = []
+    for versao, descricao, funcao in sorted(MIGRACOES, key=lambda m: m[0]):
+        if versao <= versao_atual:
+            continue
+
+        with engine.begin() as conexao:
+            funcao(conexao)
+            conexao.execute(versao_esquema.insert().values(
+                versao=versao,
+                descricao=descricao,
+                data_aplicacao=datetime.now()
+            ))
+        print(f"Migração {versao} aplicada: {descricao}")
+        aplicadas.append(versao)
+
+    return aplicadas
@@ -1,8 +1,9 @@
 from typing import Optional
-from sqlalchemy import Integer, String, Text, Numeric, Enum as SQLAlchemyEnum, DateTime, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Integer, String, Text, Numeric, Float, Enum as SQLAlchemyEnum, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from src.configs.config_bd import Base
 import enum
+import unicodedata
 
 """
 Este arquivo define os modelos de dados (ORM) para o sistema de vendas,
@@ -12,31 +13,70 @@ o diagrama de entidades do sistema.
 """
 
 
+def normalizar_nome_produto(nome: str) -> str:
+    """Chave de unicidade do nome: sem acentos, minúsculas e espaços simples."""
+    decomposto = unicodedata.normalize("NFKD", nome)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def normalizar_cpf(cpf: str) -> str:
+    """CPF como é gravado: apenas os dígitos, sem pontos, traço ou espaços."""
+    return "".join(c for c in cpf if c.isdigit())
+
+
 class Produto(Base):
     __tablename__ = 'produto'
+    __table_args__ = (
+        Index('ix_produto_quantidade_estoque', 'quantidade_estoque'),
+        Index('ix_produto_nome', 'nome'),
+        Index('ux_produto_nome_normalizado', 'nome_normalizado', unique=True),
+        Index('ix_produto_preco', 'preco'),
+    )
 
     id_produto: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     nome: Mapped[str] = mapped_column(String(255), nullable=False)
+    nome_normalizado: Mapped[Optional[str]] = mapped_column(String(255))
     descricao: Mapped[Optional[str]] = mapped_column(Text)
     quantidade_estoque: Mapped[int] = mapped_column(Integer, default=0)
     preco: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    preco_custo: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
 
     itens_venda: Mapped[list["ItensVenda"]] = relationship(back_populates="produto")
 
+    @validates('nome')
+    def _validar_nome(self, chave, nome):
+        self.nome_normalizado = normalizar_nome_produto(nome) if nome is not None else None
+        return nome
+
     def __repr__(self):
         return f"<Produto(id_produto={self.id_produto}, nome='{self.nome}', preco={self.preco})>"
 
 
 class Cliente(Base):
     __tablename__ = 'cliente'
+    __table_args__ = (
+        Index('ix_cliente_nome', 'nome'),
+        Index('ix_cliente_nome_normalizado', 'nome_normalizado'),
+    )
 
     id_cliente: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     nome: Mapped[str] = mapped_column(String(255), nullable=False)
+    nome_normalizado: Mapped[Optional[str]] = mapped_column(String(255))
     cpf: Mapped[str] = mapped_column(String(11), unique=True, nullable=False)
     telefone: Mapped[Optional[str]] = mapped_column(String(15))
 
     vendas: Mapped[list["Venda"]] = relationship(back_populates="cliente")
 
+    @validates('nome')
+    def _validar_nome(self, chave, nome):
+        self.nome_normalizado = normalizar_nome_produto(nome) if nome is not None else None
+        return nome
+
+    @validates('cpf')
+    def _validar_cpf(self, chave, cpf):
+        return normalizar_cpf(cpf) if cpf is not None else None
+
     def __repr__(self):
         return f"<Cliente(id_cliente={self.id_cliente}, nome='{self.nome}', cpf='{self.cpf}')>"
 
@@ -48,21 +88,36 @@ class CargoEnum(enum.Enum):
 
 class Funcionario(Base):
     __tablename__ = 'funcionario'
+    __table_args__ = (
+        Index('ix_funcionario_nome', 'nome'),
+        Index('ix_funcionario_nome_normalizado', 'nome_normalizado'),
+    )
 
     id_funcionario: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     nome: Mapped[str] = mapped_column(String(255), nullable=False)
+    nome_normalizado: Mapped[Optional[str]] = mapped_column(String(255))
     cargo: Mapped[CargoEnum] = mapped_column(SQLAlchemyEnum(CargoEnum), nullable=False)
     nome_usuario: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     senha: Mapped[str] = mapped_column(String(255), nullable=False)
 
     vendas: Mapped[list["Venda"]] = relationship(back_populates="funcionario")
 
+    @validates('nome')
+    def _validar_nome(self, chave, nome):
+        self.nome_normalizado = normalizar_nome_produto(nome) if nome is not None else None
+        return nome
+
     def __repr__(self):
         return f"<Funcionario(id_funcionario={self.id_funcionario}, nome='{self.nome}', cargo='{self.cargo.value}')>"
 
 
 class Venda(Base):
     __tablename__ = 'venda'
+    __table_args__ = (
+        Index('ix_venda_data_venda', 'data_venda'),
+        Index('ix_venda_funcionario_data', 'id_funcionario', 'data_venda'),
+        Index('ix_venda_cliente_data', 'id_cliente', 'data_venda'),
+    )
 
     id_venda: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     data_venda: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
@@ -82,6 +137,10 @@ class Venda(Base):
 
 class ItensVenda(Base):
     __tablename__ = 'itens_venda'
+    __table_args__ = (
+        Index('ix_itens_venda_venda', 'id_venda'),
+        Index('ix_itens_venda_produto', 'id_produto'),
+    )
 
     id_item_venda: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_venda: Mapped[int] = mapped_column(ForeignKey('venda.id_venda'), nullable=False)
@@ -99,3 +158,116 @@ class ItensVenda(Base):
             f"<ItensVenda(id_item_venda={self.id_item_venda}, id_venda={self.id_venda}, "
             f"id_produto={self.id_produto}, quantidade={self.quantidade})>"
         )
+
+
+class VendaResumoDiario(Base):
+    """
+    Agregado de vendas por dia e funcionário, mantido incrementalmente na mesma
+    transação das vendas (ver ResumoVendaRepositorio). Os valores são brutos:
+    o líquido é valor_bruto - desconto_total.
+    """
+    __tablename__ = 'venda_resumo_diario'
+
+    data: Mapped[Date] = mapped_column(Date, primary_key=True)
+    id_funcionario: Mapped[int] = mapped_column(ForeignKey('funcionario.id_funcionario'), primary_key=True)
+
+    quantidade_vendas: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    valor_bruto: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0.0)
+    desconto_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0.0)
+    quantidade_itens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<VendaResumoDiario(data='{self.data}', id_funcionario={self.id_funcionario}, "
+            f"quantidade_vendas={self.quantidade_vendas}, valor_bruto={self.valor_bruto})>"
+        )
+
+
+class ProdutoClassificacao(Base):
+    """
+    Classificação ABC (curva de Pareto) de cada produto por receita e por
+    quantidade vendida no período analisado, recalculada em lote pelo
+    AnaliseEstoqueServico.
+    """
+    __tablename__ = 'produto_classificacao'
+    __table_args__ = (
+        Index('ix_produto_classificacao_classe_receita', 'classe_receita'),
+    )
+
+    id_produto: Mapped[int] = mapped_column(ForeignKey('produto.id_produto', ondelete='CASCADE'), primary_key=True)
+    classe_receita: Mapped[str] = mapped_column(String(1), nullable=False)
+    classe_quantidade: Mapped[str] = mapped_column(String(1), nullable=False)
+    receita: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0.0)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    participacao_receita: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    participacao_acumulada: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    data_calculo: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ProdutoClassificacao(id_produto={self.id_produto}, classe_receita='{self.classe_receita}', "
+            f"classe_quantidade='{self.classe_quantidade}')>"
+        )
+
+
+class ProdutoReposicao(Base):
+    """
+    Demanda diária estimada e ponto de reposição de cada produto, recalculados
+    em lote pelo AnaliseEstoqueServico a partir do histórico de itens_venda.
+    O estoque está baixo quando quantidade_estoque <= ponto_reposicao.
+    """
+    __tablename__ = 'produto_reposicao'
+
+    id_produto: Mapped[int] = mapped_column(ForeignKey('produto.id_produto', ondelete='CASCADE'), primary_key=True)
+    demanda_media: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    desvio_demanda: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    estoque_seguranca: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ponto_reposicao: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    data_calculo: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ProdutoReposicao(id_produto={self.id_produto}, demanda_media={self.demanda_media}, "
+            f"ponto_reposicao={self.ponto_reposicao})>"
+        )
+
+
+class ProdutoVendaContador(Base):
+    """
+    Totais vendidos de cada produto em todo o histórico, mantidos
+    incrementalmente na mesma transação das vendas (ver ContadorProdutoRepositorio).
+    A receita é líquida de descontos; numero_vendas conta as linhas de venda.
+    """
+    __tablename__ = 'produto_venda_contador'
+    __table_args__ = (
+        Index('ix_produto_venda_contador_quantidade', 'quantidade'),
+        Index('ix_produto_venda_contador_receita', 'receita'),
+    )
+
+    id_produto: Mapped[int] = mapped_column(ForeignKey('produto.id_produto', ondelete='CASCADE'), primary_key=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    receita: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0.0)
+    numero_vendas: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<ProdutoVendaContador(id_produto={self.id_produto}, quantidade={self.quantidade}, "
+            f"receita={self.receita})>"
+        )
+
+
+class ProdutoVendaDiaria(Base):
+    """Os mesmos totais de ProdutoVendaContador separados por dia, para consultas por período."""
+    __tablename__ = 'produto_venda_diaria'
+
+    data: Mapped[Date] = mapped_column(Date, primary_key=True)
+    id_produto: Mapped[int] = mapped_column(ForeignKey('produto.id_produto', ondelete='CASCADE'), primary_key=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    receita: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0.0)
+    numero_vendas: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<ProdutoVendaDiaria(data='{self.data}', id_produto={self.id_produto}, "
+            f"quantidade={self.quantidade})>"
+        )
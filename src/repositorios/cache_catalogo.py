@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import NamedTuple, Optional
+from src.configs.config_globais import TAMANHO_CACHE_CATALOGO
+from src.modelos.tabelas_bd import Produto
+
+"""
+Este arquivo implementa o cache em memória do catálogo de produtos, consultado
+pelo ProdutoRepositorio antes de ir ao banco. Guarda cópias imutáveis dos
+produtos (não objetos ORM, que pertencem a uma sessão) em um LRU limitado.
+Toda escrita do repositório atualiza ou invalida a entrada após o commit, e um
+contador de versão impede que uma leitura iniciada antes de uma invalidação
+grave no cache um valor já desatualizado.
+"""
+
+
+class ProdutoCatalogo(NamedTuple):
+    """Cópia somente leitura dos dados de um produto."""
+    id_produto: int
+    nome: str
+    descricao: Optional[str]
+    preco: Decimal
+    quantidade_estoque: int
+
+    @classmethod
+    def de_produto(cls, produto: Produto) -> "ProdutoCatalogo":
+        return cls(
+            id_produto=produto.id_produto,
+            nome=produto.nome,
+            descricao=produto.descricao,
+            preco=Decimal(str(produto.preco)),
+            quantidade_estoque=produto.quantidade_estoque
+        )
+
+
+class CacheCatalogo:
+    """Cache LRU de produtos por id_produto, com invalidação por versão."""
+
+    def __init__(self, capacidade: int = TAMANHO_CACHE_CATALOGO):
+        self.capacidade = capacidade
+        self._entradas: "OrderedDict[int, ProdutoCatalogo]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._versao = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    @property
+    def versao(self) -> int:
+        """Versão atual; muda a cada invalidação. Capture-a antes de ler do banco."""
+        return self._versao
+
+    def obter(self, id_produto: int) -> Optional[ProdutoCatalogo]:
+        """Retorna o produto em cache (marcando-o como recente) ou None."""
+        with self._trava:
+            produto = self._entradas.get(id_produto)
+            if produto is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(id_produto)
+            self.acertos += 1
+            return produto
+
+    def armazenar(self, produto: ProdutoCatalogo, versao_leitura: int):
+        """
+        Guarda um produto lido do banco, desde que nenhuma invalidação tenha
+        ocorrido depois que a leitura começou (versao_leitura).
+        """
+        if self.capacidade <= 0:
+            return
+        with self._trava:
+            if versao_leitura != self._versao:
+                return
+            self._guardar(produto)
+
+    def atualizar(self, produto: ProdutoCatalogo):
+        """Write-through: substitui a entrada pelo valor recém-confirmado no banco."""
+        with self._trava:
+            self._versao += 1
+            if self.capacidade > 0:
+                self._guardar(produto)
+
+    def invalidar(self, *ids_produto: int):
+        """Remove os produtos informados do cache."""
+        with self._trava:
+            self._versao += 1
+            for id_produto in ids_produto:
+                self._entradas.pop(id_produto, None)
+
+    def invalidar_tudo(self):
+        """Esvazia o cache (usado após escritas em massa)."""
+        with self._trava:
+            self._versao += 1
+            self._entradas.clear()
+
+    def estatisticas(self) -> dict:
+        """Contadores para dimensionar o cache."""
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "tamanho": len(self._entradas),
+                "capacidade": self.capacidade,
+                "versao": self._versao
+            }
+
+    def _guardar(self, produto: ProdutoCatalogo):
+        self._entradas[produto.id_produto] = produto
+        self._entradas.move_to_end(produto.id_produto)
+        while len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+
+
+# Instância única do processo, compartilhada por todos os repositórios
+cache_catalogo = CacheCatalogo()
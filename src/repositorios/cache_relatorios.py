@@ -0,0 +1,197 @@
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, FrozenSet, NamedTuple, Optional, Tuple
+from src.configs.config_globais import TAMANHO_CACHE_RELATORIOS, TTL_CACHE_RELATORIOS
+
+"""
+Este arquivo implementa o cache em memória dos resultados de relatórios e
+agregações (totais, rankings, valor do estoque), consultado pelos repositórios
+antes de ir ao banco. Cada resultado é guardado por método e parâmetros, junto
+com o escopo de que depende: o domínio ("vendas" ou "estoque") e, para vendas,
+o intervalo de dias. Escritas invalidam após o commit apenas as entradas do
+domínio e dos dias afetados; o TTL limita por quanto tempo uma escrita feita
+fora dos repositórios pode passar despercebida, e o LRU limita a memória.
+"""
+
+VENDAS = "vendas"
+ESTOQUE = "estoque"
+
+# Recebe os argumentos da chamada ({nome: valor}) e devolve (primeiro dia, último dia)
+Periodo = Callable[[dict], Tuple[date, date]]
+
+
+class EscopoRelatorio(NamedTuple):
+    """Dados de que um resultado em cache depende."""
+    dominios: FrozenSet[str]
+    data_inicio: Optional[date]     # None = sem limite
+    data_fim: Optional[date]
+
+    def afetado_por(self, dominio: str, data_inicio: Optional[date], data_fim: Optional[date]) -> bool:
+        if dominio not in self.dominios:
+            return False
+        return ((self.data_fim is None or data_inicio is None or data_inicio <= self.data_fim)
+                and (self.data_inicio is None or data_fim is None or self.data_inicio <= data_fim))
+
+
+class _Entrada(NamedTuple):
+    valor: object
+    escopo: EscopoRelatorio
+    expira_em: float
+
+
+def _dia(valor) -> Optional[date]:
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+class CacheRelatorios:
+    """Cache LRU com TTL de resultados de relatórios, com invalidação por escopo."""
+
+    def __init__(self, capacidade: int = TAMANHO_CACHE_RELATORIOS, ttl: float = TTL_CACHE_RELATORIOS):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._entradas: "OrderedDict[tuple, _Entrada]" = OrderedDict()
+        self._trava = threading.Lock()
+        self._versao = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.invalidados = 0
+        self.descartados = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.capacidade > 0 and self.ttl > 0
+
+    @property
+    def versao(self) -> int:
+        """Versão atual; muda a cada invalidação. Capture-a antes de ler do banco."""
+        return self._versao
+
+    def obter(self, chave: tuple) -> Tuple[bool, object]:
+        """Retorna (encontrado, cópia do resultado), descartando entradas vencidas."""
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada.expira_em <= time.monotonic():
+                del self._entradas[chave]
+                self.expirados += 1
+                entrada = None
+            if entrada is None:
+                self.falhas += 1
+                return False, None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+        # Cópia: quem chama pode alterar o dicionário/lista recebido
+        return True, copy.deepcopy(entrada.valor)
+
+    def armazenar(self, chave: tuple, valor, escopo: EscopoRelatorio, versao_leitura: int):
+        """
+        Guarda um resultado lido do banco, desde que nenhuma invalidação tenha
+        ocorrido depois que a leitura começou (versao_leitura).
+        """
+        if not self.ativo:
+            return
+        entrada = _Entrada(copy.deepcopy(valor), escopo, time.monotonic() + self.ttl)
+        with self._trava:
+            if versao_leitura != self._versao:
+                return
+            self._entradas[chave] = entrada
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+                self.descartados += 1
+
+    def invalidar(self, dominio: str, data_inicio: Optional[date] = None, data_fim: Optional[date] = None):
+        """
+        Remove os resultados do domínio cujo período cruza [data_inicio, data_fim]
+        (None = sem limite; sem datas, todos os do domínio).
+        """
+        data_inicio, data_fim = _dia(data_inicio), _dia(data_fim)
+        with self._trava:
+            self._versao += 1
+            afetadas = [
+                chave for chave, entrada in self._entradas.items()
+                if entrada.escopo.afetado_por(dominio, data_inicio, data_fim)
+            ]
+            for chave in afetadas:
+                del self._entradas[chave]
+            self.invalidados += len(afetadas)
+
+    def invalidar_tudo(self):
+        """Esvazia o cache."""
+        with self._trava:
+            self._versao += 1
+            self.invalidados += len(self._entradas)
+            self._entradas.clear()
+
+    def estatisticas(self) -> dict:
+        """Contadores para dimensionar o cache."""
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "expirados": self.expirados,
+                "invalidados": self.invalidados,
+                "descartados": self.descartados,
+                "tamanho": len(self._entradas),
+                "capacidade": self.capacidade,
+                "ttl": self.ttl,
+                "versao": self._versao
+            }
+
+
+# Instância única do processo, compartilhada por todos os repositórios
+cache_relatorios = CacheRelatorios()
+
+
+def periodo_entre(inicio: str, fim: str) -> Periodo:
+    """Período dado por dois parâmetros do método (datas ou datas/horas, inclusive)."""
+    return lambda argumentos: (argumentos[inicio], argumentos[fim])
+
+
+def relatorio_em_cache(*dominios: str, periodo: Optional[Periodo] = None):
+    """
+    Decora um método de consulta de um repositório para guardar o resultado no
+    cache_relatorios, com chave (método, parâmetros). Use apenas em métodos que
+    retornam valores simples (números, dicionários, listas), nunca objetos ORM.
+    Sem `periodo`, o resultado depende de todas as datas do domínio.
+    Dentro de uma unidade de trabalho o cache não é lido nem gravado, pois a
+    transação pode conter escritas ainda não confirmadas.
+    """
+    def decorador(metodo):
+        assinatura = inspect.signature(metodo)
+
+        @functools.wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            if not cache_relatorios.ativo or self.em_unidade_de_trabalho:
+                return metodo(self, *args, **kwargs)
+
+            chamada = assinatura.bind(self, *args, **kwargs)
+            chamada.apply_defaults()
+            argumentos = dict(chamada.arguments)
+            argumentos.pop("self")
+            chave = (metodo.__qualname__, tuple(argumentos.items()))
+            try:
+                encontrado, valor = cache_relatorios.obter(chave)
+            except TypeError:
+                # Parâmetro não hasheável (ex.: lista): não há como montar a chave
+                return metodo(self, *args, **kwargs)
+            if encontrado:
+                return valor
+
+            versao = cache_relatorios.versao
+            valor = metodo(self, *args, **kwargs)
+            inicio, fim = periodo(argumentos) if periodo else (None, None)
+            escopo = EscopoRelatorio(frozenset(dominios), _dia(inicio), _dia(fim))
+            cache_relatorios.armazenar(chave, valor, escopo, versao)
+            return valor
+
+        return envoltorio
+
+    return decorador
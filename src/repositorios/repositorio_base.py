@@ -0,0 +1,123 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
+from src.configs.config_bd import Session as SessionLocal
+
+"""
+Este arquivo define a base comum dos repositórios que mantêm uma sessão própria.
+Centraliza a decisão de confirmar (commit) ou apenas enviar (flush) as alterações:
+quando a sessão pertence a uma UnidadeDeTrabalho, quem confirma a transação é a
+unidade, uma única vez ao final da operação de negócio.
+"""
+
+CHAVE_UNIDADE_DE_TRABALHO = "unidade_de_trabalho"
+
+
+class RepositorioBase:
+    """Base para repositórios com sessão compartilhável."""
+
+    # Colunas aceitas em buscar_pagina(ordenar_por=...): todas NOT NULL e indexadas
+    ORDENACOES_PAGINA: Dict[str, Any] = {}
+
+    def __init__(self, session: Session | None = None):
+        self.session = session or SessionLocal()
+
+    @property
+    def em_unidade_de_trabalho(self) -> bool:
+        """Indica se a sessão está sob controle de uma UnidadeDeTrabalho."""
+        return bool(self.session.info.get(CHAVE_UNIDADE_DE_TRABALHO))
+
+    def _confirmar(self, *objetos):
+        """
+        Faz commit e recarrega os objetos informados; dentro de uma unidade de
+        trabalho apenas envia as alterações (flush), deixando o commit para ela.
+        """
+        if self.em_unidade_de_trabalho:
+            self.session.flush()
+            return
+
+        self.session.commit()
+        for objeto in objetos:
+            self.session.refresh(objeto)
+
+    def _desfazer(self):
+        """Desfaz a transação, exceto dentro de uma unidade de trabalho (que decide sozinha)."""
+        if not self.em_unidade_de_trabalho:
+            self.session.rollback()
+
+    @staticmethod
+    def _paginar_por_chave(query: Query, coluna_chave, apos: Optional[Any], limite: int) -> List:
+        """
+        Paginação por chave (keyset): retorna até `limite` linhas com chave maior
+        que `apos`, em ordem crescente. O custo independe da posição da página.
+        """
+        if apos is not None:
+            query = query.filter(coluna_chave > apos)
+        return query.order_by(coluna_chave).limit(limite).all()
+
+    @staticmethod
+    def _paginar_ordenado(query: Query, coluna_chave, apos: Optional[Any], limite: int,
+                          coluna_ordem=None, decrescente: bool = False) -> List:
+        """
+        Paginação por chave com ordenação escolhida: ordena por (coluna_ordem,
+        chave) e retorna até `limite` linhas depois de `apos`, o par (valor,
+        chave) da última linha da página anterior. Sem coluna_ordem, ordena só
+        pela chave e `apos` é a própria chave. A condição começa por
+        coluna_ordem >= valor para que o banco percorra o índice da coluna a
+        partir do ponto certo; o índice secundário já contém a chave primária,
+        então o desempate não exige outro índice. coluna_ordem deve ser NOT NULL.
+        """
+        if coluna_ordem is None:
+            if apos is not None:
+                query = query.filter(coluna_chave < apos if decrescente else coluna_chave > apos)
+            return query.order_by(coluna_chave.desc() if decrescente else coluna_chave).limit(limite).all()
+
+        if apos is not None:
+            valor, chave = apos
+            if decrescente:
+                query = query.filter(coluna_ordem <= valor, or_(coluna_ordem < valor, coluna_chave < chave))
+            else:
+                query = query.filter(coluna_ordem >= valor, or_(coluna_ordem > valor, coluna_chave > chave))
+        ordem = (coluna_ordem.desc(), coluna_chave.desc()) if decrescente else (coluna_ordem, coluna_chave)
+        return query.order_by(*ordem).limit(limite).all()
+
+    def _coluna_ordenacao(self, ordenar_por: Optional[str]):
+        """Coluna de ORDENACOES_PAGINA para o nome informado (None ordena pela chave)."""
+        if ordenar_por is None:
+            return None
+        if ordenar_por not in self.ORDENACOES_PAGINA:
+            raise Exception(f"Ordenação inválida: '{ordenar_por}' (use {', '.join(self.ORDENACOES_PAGINA)})")
+        return self.ORDENACOES_PAGINA[ordenar_por]
+
+    @staticmethod
+    def _filtro_prefixo(coluna, prefixo: str):
+        """
+        Condição "coluna começa com prefixo" escrita como a faixa
+        [prefixo, sucessor do prefixo), que usa o índice da coluna em qualquer
+        banco (o LIKE 'x%' do SQLite não usa índices de colação binária).
+        """
+        sucessor = prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+        return and_(coluna >= prefixo, coluna < sucessor)
+
+    @staticmethod
+    def _filtro_faixa(coluna, faixa: Tuple[Optional[Any], Optional[Any]]) -> list:
+        """Condições minimo <= coluna <= maximo, omitindo os limites ausentes (None)."""
+        minimo, maximo = faixa
+        condicoes = []
+        if minimo is not None:
+            condicoes.append(coluna >= minimo)
+        if maximo is not None:
+            condicoes.append(coluna <= maximo)
+        return condicoes
+
+    @staticmethod
+    def _iterar_em_lotes(query: Query, tamanho_lote: int) -> Iterator:
+        """
+        Percorre o resultado com cursor no servidor (stream_results), carregando
+        `tamanho_lote` objetos por vez em vez de materializar a tabela inteira.
+        """
+        yield from query.yield_per(tamanho_lote)
+
+    def fechar_sessao(self):
+        """Fecha a sessão do banco de dados."""
+        self.session.close()
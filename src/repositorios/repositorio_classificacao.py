@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import delete, func, insert
+from sqlalchemy.engine import Row
+from src.repositorios.repositorio_base import RepositorioBase
+from src.modelos.tabelas_bd import ItensVenda, Produto, ProdutoClassificacao, Venda
+
+"""
+Este arquivo implementa o repositório da classificação ABC dos produtos (tabela
+produto_classificacao). Fornece os totais vendidos de todos os produtos em uma
+única consulta agregada, para o cálculo da curva feito pelo
+AnaliseEstoqueServico, e grava o resultado substituindo a classificação
+anterior de uma vez.
+"""
+
+
+class ClassificacaoRepositorio(RepositorioBase):
+    """Repositório da classificação ABC de produtos."""
+
+    def obter_vendas_por_produto(self, data_inicio: datetime, data_fim: datetime) -> List[Row]:
+        """
+        Quantidade e receita líquida vendidas em [data_inicio, data_fim) de todos
+        os produtos cadastrados (zero para os que não venderam), ordenadas por
+        id_produto. Cada linha traz id_produto, quantidade e receita.
+        """
+        itens = self.session.query(
+            ItensVenda.id_produto,
+            func.sum(ItensVenda.quantidade).label("quantidade"),
+            func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario
+                     - func.coalesce(ItensVenda.desconto_aplicado, 0)).label("receita"),
+        ).join(
+            Venda, Venda.id_venda == ItensVenda.id_venda
+        ).filter(
+            Venda.data_venda >= data_inicio,
+            Venda.data_venda < data_fim
+        ).group_by(ItensVenda.id_produto).subquery()
+
+        return self.session.query(
+            Produto.id_produto,
+            func.coalesce(itens.c.quantidade, 0).label("quantidade"),
+            func.coalesce(itens.c.receita, 0).label("receita"),
+        ).outerjoin(
+            itens, itens.c.id_produto == Produto.id_produto
+        ).order_by(Produto.id_produto).all()
+
+    def substituir(self, linhas: List[dict]) -> int:
+        """
+        Troca toda a classificação pelas linhas informadas (DELETE e um INSERT
+        executemany na mesma transação). Retorna a quantidade de linhas gravadas.
+        """
+        try:
+            self.session.execute(delete(ProdutoClassificacao))
+            if linhas:
+                self.session.execute(insert(ProdutoClassificacao), linhas)
+            self.session.expire_all()
+            self._confirmar()
+            return len(linhas)
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    def buscar_classes(self) -> Dict[int, str]:
+        """Classe por receita de cada produto classificado ({id_produto: classe})."""
+        return dict(self.session.query(
+            ProdutoClassificacao.id_produto, ProdutoClassificacao.classe_receita
+        ).all())
+
+    def buscar_por_classe(self, classe: str) -> List[ProdutoClassificacao]:
+        """Produtos de uma classe por receita, da maior para a menor receita."""
+        return self.session.query(ProdutoClassificacao).filter(
+            ProdutoClassificacao.classe_receita == classe
+        ).order_by(ProdutoClassificacao.receita.desc()).all()
+
+    def obter_resumo(self) -> List[dict]:
+        """Quantidade de produtos, receita e quantidade vendida por classe de receita."""
+        resultado = self.session.query(
+            ProdutoClassificacao.classe_receita,
+            func.count(ProdutoClassificacao.id_produto).label("produtos"),
+            func.sum(ProdutoClassificacao.receita).label("receita"),
+            func.sum(ProdutoClassificacao.quantidade).label("quantidade"),
+            func.max(ProdutoClassificacao.data_calculo).label("data_calculo"),
+        ).group_by(ProdutoClassificacao.classe_receita).order_by(ProdutoClassificacao.classe_receita).all()
+
+        return [
+            {
+                "classe": r.classe_receita,
+                "produtos": r.produtos,
+                "receita": float(r.receita or 0),
+                "quantidade": int(r.quantidade or 0),
+                "data_calculo": r.data_calculo
+            }
+            for r in resultado
+        ]
@@ -1,7 +1,7 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from src.configs.config_bd import Session as SessionLocal
-from src.modelos.tabelas_bd import Cliente
+from typing import Any, Iterable, Iterator, List, Optional, Set
+from sqlalchemy import insert
+from src.repositorios.repositorio_base import RepositorioBase
+from src.modelos.tabelas_bd import Cliente, normalizar_nome_produto
 
 """
 Este arquivo implementa o repositório para operações CRUD da entidade Cliente,
@@ -11,21 +11,22 @@ de dados e a lógica de negócio da aplicação.
 """
 
 
-class ClienteRepositorio:
+class ClienteRepositorio(RepositorioBase):
     """Repositório para operações CRUD da entidade Cliente."""
 
-    def __init__(self, session: Session | None = None):
-        self.session = session or SessionLocal()
+    ORDENACOES_PAGINA = {
+        "nome": Cliente.nome,
+        "cpf": Cliente.cpf,
+    }
 
     def salvar(self, cliente: Cliente) -> Cliente:
         """Salva um cliente no banco de dados."""
         try:
             self.session.add(cliente)
-            self.session.commit()
-            self.session.refresh(cliente)
+            self._confirmar(cliente)
             return cliente
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def criar(self, nome: str, cpf: str, telefone: Optional[str] = None) -> Cliente:
@@ -37,11 +38,26 @@ class ClienteRepositorio:
                 telefone=telefone
             )
             self.session.add(cliente)
-            self.session.commit()
-            self.session.refresh(cliente)
+            self._confirmar(cliente)
             return cliente
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
+            raise e
+
+    def inserir_em_lote(self, linhas: List[dict]) -> int:
+        """
+        Insere vários clientes (dicionários com nome, nome_normalizado, cpf e
+        telefone) em um único
+        INSERT em lote, sem criar objetos ORM. Retorna a quantidade inserida.
+        """
+        if not linhas:
+            return 0
+        try:
+            self.session.execute(insert(Cliente), linhas)
+            self._confirmar()
+            return len(linhas)
+        except Exception as e:
+            self._desfazer()
             raise e
 
     def buscar_por_id(self, id_cliente: int) -> Optional[Cliente]:
@@ -52,6 +68,38 @@ class ClienteRepositorio:
         """Retorna todos os clientes cadastrados."""
         return self.session.query(Cliente).all()
 
+    def buscar_pagina(self, apos: Optional[Any] = None, limite: int = 100, ordenar_por: Optional[str] = None,
+                      decrescente: bool = False, filtros: Optional[dict] = None) -> List[Cliente]:
+        """
+        Retorna uma página de clientes começando após `apos`, ordenada por ID ou
+        pela coluna `ordenar_por` (nome ou cpf; então `apos` é o par (valor, id)
+        da última linha). `filtros` aceita id, nome (começo do nome, sem
+        diferenciar acentos e maiúsculas) e cpf (começo do CPF).
+        """
+        query = self.session.query(Cliente).filter(*self._condicoes_filtro(filtros or {}))
+        return self._paginar_ordenado(query, Cliente.id_cliente, apos, limite,
+                                      self._coluna_ordenacao(ordenar_por), decrescente)
+
+    def _condicoes_filtro(self, filtros: dict) -> list:
+        condicoes = []
+        for campo, valor in filtros.items():
+            if campo == "id":
+                condicoes.append(Cliente.id_cliente == valor)
+            elif campo == "nome":
+                prefixo = normalizar_nome_produto(valor)
+                if prefixo:
+                    condicoes.append(self._filtro_prefixo(Cliente.nome_normalizado, prefixo))
+            elif campo == "cpf":
+                condicoes.append(self._filtro_prefixo(Cliente.cpf, valor))
+            else:
+                raise Exception(f"Filtro inválido para clientes: '{campo}'")
+        return condicoes
+
+    def iterar_todos(self, tamanho_lote: int = 1000) -> Iterator[Cliente]:
+        """Percorre todos os clientes em lotes, com memória constante."""
+        return self._iterar_em_lotes(
+            self.session.query(Cliente).order_by(Cliente.id_cliente), tamanho_lote)
+
     def buscar_por_cpf(self, cpf: str) -> Optional[Cliente]:
         """Busca um cliente pelo CPF."""
         return self.session.query(Cliente).filter(Cliente.cpf == cpf).first()
@@ -70,10 +118,10 @@ class ClienteRepositorio:
         """Atualiza um cliente existente."""
         try:
             self.session.merge(cliente)
-            self.session.commit()
+            self._confirmar()
             return cliente
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_por_id(self, id_cliente: int, nome: Optional[str] = None, cpf: Optional[str] = None,
@@ -89,11 +137,11 @@ class ClienteRepositorio:
                 if telefone is not None:
                     cliente.telefone = telefone
 
-                self.session.commit()
+                self._confirmar()
                 return cliente
             return None
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def deletar(self, id_cliente: int) -> bool:
@@ -102,20 +150,24 @@ class ClienteRepositorio:
             cliente = self.buscar_por_id(id_cliente)
             if cliente:
                 self.session.delete(cliente)
-                self.session.commit()
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
+    def buscar_cpfs_existentes(self, cpfs: Iterable[str]) -> Set[str]:
+        """Retorna, em uma única consulta, quais dos CPFs informados já estão cadastrados."""
+        cpfs = list(cpfs)
+        if not cpfs:
+            return set()
+        consulta = self.session.query(Cliente.cpf).filter(Cliente.cpf.in_(cpfs))
+        return {cpf for (cpf,) in consulta}
+
     def verificar_cpf_existe(self, cpf: str, id_cliente: Optional[int] = None) -> bool:
         """Verifica se um CPF já existe no banco (exceto para o próprio cliente)."""
         query = self.session.query(Cliente).filter(Cliente.cpf == cpf)
         if id_cliente:
             query = query.filter(Cliente.id_cliente != id_cliente)
         return query.first() is not None
-
-    def fechar_sessao(self):
-        """Fecha a sessão do banco de dados."""
-        self.session.close()
@@ -0,0 +1,165 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+from src.configs.config_bd import executar_apos_commit
+from src.repositorios.cache_relatorios import ESTOQUE, VENDAS, cache_relatorios, periodo_entre, relatorio_em_cache
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.sql_portavel import montar_upsert
+from src.modelos.tabelas_bd import ItensVenda, Produto, ProdutoVendaContador, ProdutoVendaDiaria, Venda
+
+"""
+Este arquivo implementa o repositório dos contadores de vendas por produto
+(tabelas produto_venda_contador, com os totais de todo o histórico, e
+produto_venda_diaria, com os mesmos totais por dia). Cada venda, item ou
+cancelamento soma seus deltas aos contadores com dois upserts em lote, na mesma
+transação da operação; o ranking dos mais vendidos é uma leitura indexada do
+contador, e o ranking de um período soma apenas os dias do período, em vez de
+agrupar todo o itens_venda. Os rankings passam pelo cache_relatorios; cada
+registro invalida, após o commit, os rankings que incluem o dia da venda. A
+reconstrução serve para carga inicial e para corrigir divergências.
+"""
+
+ORDENACOES_MAIS_VENDIDOS = ("quantidade", "receita")
+
+
+def reconstruir_contadores_produto(conexao: Connection) -> int:
+    """
+    Recalcula os contadores de todos os produtos a partir de venda/itens_venda,
+    com DELETE e INSERT ... SELECT. Retorna a quantidade de linhas diárias gravadas.
+    """
+    contador = ProdutoVendaContador.__table__
+    diaria = ProdutoVendaDiaria.__table__
+    colunas = ["quantidade", "receita", "numero_vendas"]
+    somas = (
+        func.sum(ItensVenda.quantidade),
+        func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario
+                 - func.coalesce(ItensVenda.desconto_aplicado, 0)),
+        func.count(ItensVenda.id_item_venda),
+    )
+
+    dia = func.date(Venda.data_venda)
+    conexao.execute(delete(diaria))
+    linhas = conexao.execute(insert(diaria).from_select(
+        ["data", "id_produto"] + colunas,
+        select(dia, ItensVenda.id_produto, *somas).join(
+            Venda, Venda.id_venda == ItensVenda.id_venda
+        ).group_by(dia, ItensVenda.id_produto)
+    )).rowcount
+
+    conexao.execute(delete(contador))
+    conexao.execute(insert(contador).from_select(
+        ["id_produto"] + colunas,
+        select(ItensVenda.id_produto, *somas).group_by(ItensVenda.id_produto)
+    ))
+    return linhas
+
+
+class ContadorProdutoRepositorio(RepositorioBase):
+    """Repositório dos contadores de vendas por produto."""
+
+    def registrar(self, data: date, linhas: List[dict]):
+        """
+        Soma aos contadores geral e do dia os deltas de cada linha (id_produto,
+        quantidade, receita e numero_vendas; negativos para cancelamentos e
+        remoções), com um upsert executemany por tabela.
+        """
+        if not linhas:
+            return
+
+        dialeto = self.session.get_bind().dialect.name
+        parametros = [
+            {
+                "id_produto": l["id_produto"],
+                "quantidade": l["quantidade"],
+                "receita": l["receita"],
+                "numero_vendas": l["numero_vendas"]
+            }
+            for l in linhas
+        ]
+        try:
+            for tabela, chave, extras in (
+                (ProdutoVendaContador.__table__, ["id_produto"], {}),
+                (ProdutoVendaDiaria.__table__, ["data", "id_produto"], {"data": data}),
+            ):
+                comando = montar_upsert(dialeto, tabela, chave, lambda novo, t=tabela: {
+                    "quantidade": t.c.quantidade + novo.quantidade,
+                    "receita": t.c.receita + novo.receita,
+                    "numero_vendas": t.c.numero_vendas + novo.numero_vendas,
+                })
+                self.session.execute(comando, [dict(p, **extras) for p in parametros])
+            executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(VENDAS, data, data))
+            self._confirmar()
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    # ESTOQUE também, pois o ranking traz o nome atual de cada produto
+    @relatorio_em_cache(VENDAS, ESTOQUE, periodo=periodo_entre("data_inicio", "data_fim"))
+    def buscar_mais_vendidos(self, limite: int = 10, data_inicio: Optional[date] = None,
+                             data_fim: Optional[date] = None, ordenar_por: str = "quantidade") -> List[dict]:
+        """
+        Os `limite` produtos mais vendidos por quantidade ou receita, com nome e
+        totais. Sem período, lê o contador geral pelo índice da ordenação; com
+        período (dias inclusivos), soma apenas os contadores diários do período.
+        """
+        if ordenar_por not in ORDENACOES_MAIS_VENDIDOS:
+            raise Exception(f"Ordenação inválida: '{ordenar_por}' (use {', '.join(ORDENACOES_MAIS_VENDIDOS)})")
+
+        if data_inicio is None and data_fim is None:
+            origem = ProdutoVendaContador
+            id_produto = origem.id_produto
+            quantidade = origem.quantidade
+            receita = origem.receita
+            numero_vendas = origem.numero_vendas
+        else:
+            filtros = []
+            if data_inicio is not None:
+                filtros.append(ProdutoVendaDiaria.data >= data_inicio)
+            if data_fim is not None:
+                filtros.append(ProdutoVendaDiaria.data <= data_fim)
+            origem = self.session.query(
+                ProdutoVendaDiaria.id_produto,
+                func.sum(ProdutoVendaDiaria.quantidade).label("quantidade"),
+                func.sum(ProdutoVendaDiaria.receita).label("receita"),
+                func.sum(ProdutoVendaDiaria.numero_vendas).label("numero_vendas"),
+            ).filter(*filtros).group_by(ProdutoVendaDiaria.id_produto).subquery()
+            id_produto = origem.c.id_produto
+            quantidade = origem.c.quantidade
+            receita = origem.c.receita
+            numero_vendas = origem.c.numero_vendas
+
+        ordem = quantidade if ordenar_por == "quantidade" else receita
+        resultado = self.session.query(
+            Produto.id_produto,
+            Produto.nome,
+            quantidade.label("quantidade"),
+            receita.label("receita"),
+            numero_vendas.label("numero_vendas"),
+        ).select_from(origem).join(
+            Produto, Produto.id_produto == id_produto
+        ).filter(ordem > 0).order_by(ordem.desc()).limit(limite).all()
+
+        return [
+            {
+                "id_produto": r.id_produto,
+                "nome": r.nome,
+                "total_vendido": int(r.quantidade),
+                "receita": Decimal(str(r.receita)).quantize(Decimal("0.01")),
+                "numero_vendas": int(r.numero_vendas)
+            }
+            for r in resultado
+        ]
+
+    def reconstruir(self) -> int:
+        """Recalcula todos os contadores a partir das vendas (ver reconstruir_contadores_produto)."""
+        try:
+            linhas = reconstruir_contadores_produto(self.session.connection())
+            self.session.expire_all()
+            executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(VENDAS))
+            self._confirmar()
+            return linhas
+        except Exception as e:
+            self._desfazer()
+            raise e
@@ -1,14 +1,20 @@
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from contextlib import contextmanager
 from src.configs.config_bd import Session as SessionLocal
-from src.modelos.tabelas_bd import Funcionario
+from src.repositorios.repositorio_base import RepositorioBase
+from src.modelos.tabelas_bd import Funcionario, normalizar_nome_produto
 from src.modelos.tabelas_bd import CargoEnum
 
 class FuncionarioRepositorio:
     """Repositório para operações CRUD da entidade Funcionario."""
 
+    ORDENACOES_PAGINA = {
+        "nome": Funcionario.nome,
+        "nome_usuario": Funcionario.nome_usuario,
+    }
+
     @contextmanager
     def session_scope(self):
         """
@@ -65,6 +71,48 @@ class FuncionarioRepositorio:
         with SessionLocal() as session:
             return session.query(Funcionario).all()
 
+    def buscar_pagina(self, apos: Optional[Any] = None, limite: int = 100, ordenar_por: Optional[str] = None,
+                      decrescente: bool = False, filtros: Optional[dict] = None) -> List[Funcionario]:
+        """
+        Retorna uma página de funcionários começando após `apos`, ordenada por ID
+        ou pela coluna `ordenar_por` (nome ou nome_usuario; então `apos` é o par
+        (valor, id) da última linha). `filtros` aceita id, nome (começo do nome,
+        sem diferenciar acentos e maiúsculas) e usuario (começo do nome de
+        usuário, como digitado no login).
+        """
+        if ordenar_por is not None and ordenar_por not in self.ORDENACOES_PAGINA:
+            raise Exception(f"Ordenação inválida: '{ordenar_por}' (use {', '.join(self.ORDENACOES_PAGINA)})")
+
+        condicoes = []
+        for campo, valor in (filtros or {}).items():
+            if campo == "id":
+                condicoes.append(Funcionario.id_funcionario == valor)
+            elif campo == "nome":
+                prefixo = normalizar_nome_produto(valor)
+                if prefixo:
+                    condicoes.append(RepositorioBase._filtro_prefixo(Funcionario.nome_normalizado, prefixo))
+            elif campo == "usuario":
+                prefixo = " ".join(valor.split())
+                if prefixo:
+                    condicoes.append(RepositorioBase._filtro_prefixo(Funcionario.nome_usuario, prefixo))
+            else:
+                raise Exception(f"Filtro inválido para funcionários: '{campo}'")
+
+        with SessionLocal() as session:
+            return RepositorioBase._paginar_ordenado(
+                session.query(Funcionario).filter(*condicoes), Funcionario.id_funcionario, apos, limite,
+                self.ORDENACOES_PAGINA.get(ordenar_por), decrescente
+            )
+
+    def iterar_todos(self, tamanho_lote: int = 500) -> Iterator[Funcionario]:
+        """
+        Percorre todos os funcionários em lotes, com memória constante.
+        """
+        with SessionLocal() as session:
+            yield from session.query(Funcionario).order_by(
+                Funcionario.id_funcionario
+            ).yield_per(tamanho_lote)
+
     def buscar_por_nome_usuario(self, nome_usuario: str) -> Optional[Funcionario]:
         """
         Busca um funcionário pelo nome de usuário.
@@ -1,7 +1,8 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.configs.config_bd import Session as SessionLocal
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.repositorio_contador_produto import ContadorProdutoRepositorio
 from src.modelos.tabelas_bd import ItensVenda
 
 """
@@ -12,21 +13,17 @@ de dados e a lógica de negócio da aplicação.
 """
 
 
-class ItensVendaRepositorio:
+class ItensVendaRepositorio(RepositorioBase):
     """Repositório para operações CRUD da entidade ItensVenda."""
 
-    def __init__(self, session: Session | None = None):
-        self.session = session or SessionLocal()
-
     def salvar(self, item_venda: ItensVenda) -> ItensVenda:
         """Salva um item de venda no banco de dados."""
         try:
             self.session.add(item_venda)
-            self.session.commit()
-            self.session.refresh(item_venda)
+            self._confirmar(item_venda)
             return item_venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def criar(self, id_venda: int, id_produto: int, quantidade: int = 1,
@@ -41,23 +38,36 @@ class ItensVendaRepositorio:
                 desconto_aplicado=desconto_aplicado
             )
             self.session.add(item_venda)
-            self.session.commit()
-            self.session.refresh(item_venda)
+            self._confirmar(item_venda)
             return item_venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def criar_multiplos(self, itens_venda: List[ItensVenda]) -> List[ItensVenda]:
         """Cria múltiplos itens de venda de uma só vez."""
         try:
             self.session.add_all(itens_venda)
-            self.session.commit()
-            for item in itens_venda:
-                self.session.refresh(item)
+            self._confirmar(*itens_venda)
             return itens_venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
+            raise e
+
+    def inserir_em_lote(self, linhas: List[dict]) -> int:
+        """
+        Insere vários itens de venda (dicionários com as colunas) em um único
+        INSERT em lote (executemany/insertmanyvalues), sem criar objetos ORM.
+        Retorna a quantidade de linhas inseridas.
+        """
+        if not linhas:
+            return 0
+        try:
+            self.session.execute(insert(ItensVenda), linhas)
+            self._confirmar()
+            return len(linhas)
+        except Exception as e:
+            self._desfazer()
             raise e
 
     def buscar_por_id(self, id_item_venda: int) -> Optional[ItensVenda]:
@@ -76,14 +86,39 @@ class ItensVendaRepositorio:
             ItensVenda.id_produto == id_produto
         ).all()
 
+    def buscar_pagina(self, apos_id: Optional[int] = None, limite: int = 100,
+                      id_venda: Optional[int] = None, id_produto: Optional[int] = None) -> List[ItensVenda]:
+        """
+        Retorna uma página de itens ordenada por ID, começando após `apos_id`,
+        opcionalmente restrita a uma venda ou a um produto.
+        """
+        query = self.session.query(ItensVenda)
+        if id_venda is not None:
+            query = query.filter(ItensVenda.id_venda == id_venda)
+        if id_produto is not None:
+            query = query.filter(ItensVenda.id_produto == id_produto)
+        return self._paginar_por_chave(query, ItensVenda.id_item_venda, apos_id, limite)
+
+    def iterar_todos(self, tamanho_lote: int = 1000) -> Iterator[ItensVenda]:
+        """Percorre todos os itens de venda em lotes, com memória constante."""
+        return self._iterar_em_lotes(
+            self.session.query(ItensVenda).order_by(ItensVenda.id_item_venda), tamanho_lote)
+
+    def iterar_por_produto(self, id_produto: int, tamanho_lote: int = 1000) -> Iterator[ItensVenda]:
+        """Percorre em lotes todos os itens de venda de um produto."""
+        return self._iterar_em_lotes(
+            self.session.query(ItensVenda).filter(
+                ItensVenda.id_produto == id_produto
+            ).order_by(ItensVenda.id_item_venda), tamanho_lote)
+
     def atualizar(self, item_venda: ItensVenda) -> ItensVenda:
         """Atualiza um item de venda existente."""
         try:
             self.session.merge(item_venda)
-            self.session.commit()
+            self._confirmar()
             return item_venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_por_id(self, id_item_venda: int, id_venda: Optional[int] = None, id_produto: Optional[int] = None,
@@ -104,11 +139,11 @@ class ItensVendaRepositorio:
                 if desconto_aplicado is not None:
                     item_venda.desconto_aplicado = desconto_aplicado
 
-                self.session.commit()
+                self._confirmar()
                 return item_venda
             return None
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def deletar(self, id_item_venda: int) -> bool:
@@ -117,11 +152,11 @@ class ItensVendaRepositorio:
             item_venda = self.buscar_por_id(id_item_venda)
             if item_venda:
                 self.session.delete(item_venda)
-                self.session.commit()
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def deletar_por_venda(self, id_venda: int) -> bool:
@@ -130,10 +165,10 @@ class ItensVendaRepositorio:
             itens = self.buscar_por_venda(id_venda)
             for item in itens:
                 self.session.delete(item)
-            self.session.commit()
+            self._confirmar()
             return True
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def calcular_subtotal(self, id_item_venda: int) -> float:
@@ -154,6 +189,15 @@ class ItensVendaRepositorio:
 
         return float(resultado) if resultado else 0.0
 
+    def calcular_totais_venda(self, id_venda: int) -> Tuple[Decimal, Decimal]:
+        """Valor líquido e desconto total de uma venda, somados no banco a partir dos itens."""
+        desconto = func.coalesce(ItensVenda.desconto_aplicado, 0)
+        valor, descontos = self.session.query(
+            func.coalesce(func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario - desconto), 0),
+            func.coalesce(func.sum(desconto), 0)
+        ).filter(ItensVenda.id_venda == id_venda).one()
+        return Decimal(str(valor)), Decimal(str(descontos))
+
     def contar_itens_venda(self, id_venda: int) -> int:
         """Conta quantos itens uma venda possui."""
         return self.session.query(ItensVenda).filter(
@@ -186,24 +230,8 @@ class ItensVendaRepositorio:
         ).all()
 
     def buscar_produtos_mais_vendidos(self, limite: int = 10) -> List[dict]:
-        """Busca os produtos mais vendidos baseado na quantidade de itens vendidos."""
-        resultado = self.session.query(
-            ItensVenda.id_produto,
-            func.sum(ItensVenda.quantidade).label('total_vendido'),
-            func.count(ItensVenda.id_item_venda).label('numero_vendas')
-        ).group_by(ItensVenda.id_produto).order_by(
-            func.sum(ItensVenda.quantidade).desc()
-        ).limit(limite).all()
-
-        return [
-            {
-                "id_produto": r.id_produto,
-                "total_vendido": r.total_vendido,
-                "numero_vendas": r.numero_vendas
-            }
-            for r in resultado
-        ]
-
-    def fechar_sessao(self):
-        """Fecha a sessão do banco de dados."""
-        self.session.close()
+        """
+        Busca os produtos mais vendidos baseado na quantidade de itens vendidos,
+        com nome e receita, a partir dos contadores por produto.
+        """
+        return ContadorProdutoRepositorio(self.session).buscar_mais_vendidos(limite)
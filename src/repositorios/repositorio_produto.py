@@ -1,31 +1,48 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from src.configs.config_bd import Session as SessionLocal
-from src.modelos.tabelas_bd import Produto
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import and_, bindparam, case, column, func, table, text, update
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm.util import identity_key
+from src.configs.config_bd import executar_apos_commit
+from src.repositorios.cache_catalogo import ProdutoCatalogo, cache_catalogo
+from src.repositorios.cache_relatorios import ESTOQUE, cache_relatorios, relatorio_em_cache
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.sql_portavel import montar_upsert
+from src.modelos.tabelas_bd import Produto, ProdutoClassificacao, ProdutoReposicao, normalizar_nome_produto
 
 """
 Este arquivo implementa o repositório para operações CRUD da entidade Produto,
 seguindo o padrão Repository. Encapsula todas as operações de acesso a dados
 relacionadas aos produtos, fornecendo uma camada de abstração entre o modelo
-de dados e a lógica de negócio da aplicação.
+de dados e a lógica de negócio da aplicação. As leituras de catálogo passam
+pelo cache_catalogo, que é atualizado ou invalidado em todas as escritas; as
+mesmas escritas invalidam os relatórios de estoque do cache_relatorios.
+A busca por nome usa o índice de texto completo criado pela migração 2
+(FTS5 no SQLite, FULLTEXT no MySQL).
 """
 
+# Tabela virtual FTS5 (SQLite) sincronizada com produto por triggers
+produto_fts = table("produto_fts", column("rowid"), column("rank"))
 
-class ProdutoRepositorio:
+
+class ProdutoRepositorio(RepositorioBase):
     """Repositório para operações CRUD da entidade Produto."""
 
-    def __init__(self, session: Session | None = None):
-        self.session = session or SessionLocal()
+    ORDENACOES_PAGINA = {
+        "nome": Produto.nome,
+        "preco": Produto.preco,
+        "quantidade_estoque": Produto.quantidade_estoque,
+    }
 
     def salvar(self, produto: Produto) -> Produto:
         """Salva um produto no banco de dados."""
         try:
             self.session.add(produto)
-            self.session.commit()
-            self.session.refresh(produto)
+            self._gravar_no_cache(produto)
+            self._confirmar(produto)
             return produto
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def criar(self, nome: str, preco: float, descricao: Optional[str] = None,
@@ -39,32 +56,156 @@ class ProdutoRepositorio:
                 quantidade_estoque=quantidade_estoque
             )
             self.session.add(produto)
-            self.session.commit()
-            self.session.refresh(produto)
+            self._gravar_no_cache(produto)
+            self._confirmar(produto)
             return produto
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def buscar_por_id(self, id_produto: int) -> Optional[Produto]:
         """Busca um produto pelo ID."""
         return self.session.query(Produto).filter(Produto.id_produto == id_produto).first()
 
+    def buscar_catalogo_por_id(self, id_produto: int) -> Optional[ProdutoCatalogo]:
+        """
+        Busca os dados (somente leitura) de um produto passando pelo cache do catálogo.
+        Use nos caminhos de leitura frequentes; para alterar o produto use buscar_por_id.
+        """
+        produto = cache_catalogo.obter(id_produto)
+        if produto is not None:
+            return produto
+
+        versao = cache_catalogo.versao
+        # populate_existing: se o produto já está na sessão (que vive tanto
+        # quanto a tela), relê as colunas do banco em vez de devolver valores
+        # antigos, que iriam para o cache compartilhado
+        encontrado = self.session.query(Produto).filter(
+            Produto.id_produto == id_produto
+        ).execution_options(populate_existing=True).first()
+        if encontrado is None:
+            return None
+
+        produto = ProdutoCatalogo.de_produto(encontrado)
+        # Dentro de uma unidade de trabalho o valor lido pode ainda não estar confirmado
+        if not self.em_unidade_de_trabalho:
+            cache_catalogo.armazenar(produto, versao)
+        return produto
+
+    def buscar_por_ids(self, ids_produto: Iterable[int]) -> List[Produto]:
+        """Busca vários produtos pelo ID em uma única consulta."""
+        ids_produto = list(ids_produto)
+        if not ids_produto:
+            return []
+        return self.session.query(Produto).filter(Produto.id_produto.in_(ids_produto)).all()
+
     def buscar_todos(self) -> List[Produto]:
         """Retorna todos os produtos cadastrados."""
         return self.session.query(Produto).all()
 
-    def buscar_por_nome(self, nome: str) -> List[Produto]:
-        """Busca produtos pelo nome (busca parcial)."""
-        return self.session.query(Produto).filter(
-            Produto.nome.ilike(f"%{nome}%")
-        ).all()
+    def buscar_pagina(self, apos: Optional[Any] = None, limite: int = 100, ordenar_por: Optional[str] = None,
+                      decrescente: bool = False, filtros: Optional[dict] = None) -> List[Produto]:
+        """
+        Retorna uma página de produtos começando após `apos`, ordenada por ID ou
+        pela coluna `ordenar_por` (nome, preco ou quantidade_estoque; então
+        `apos` é o par (valor, id) da última linha). `filtros` aceita id, nome
+        (começo do nome, sem diferenciar acentos e maiúsculas), preco e estoque
+        (faixas (mínimo, máximo), com None no limite aberto).
+        """
+        query = self.session.query(Produto).filter(*self._condicoes_filtro(filtros or {}))
+        return self._paginar_ordenado(query, Produto.id_produto, apos, limite,
+                                      self._coluna_ordenacao(ordenar_por), decrescente)
 
-    def buscar_com_estoque_baixo(self, limite: int = 10) -> List[Produto]:
-        """Busca produtos com estoque baixo."""
-        return self.session.query(Produto).filter(
-            Produto.quantidade_estoque <= limite
-        ).all()
+    def _condicoes_filtro(self, filtros: dict) -> list:
+        condicoes = []
+        for campo, valor in filtros.items():
+            if campo == "id":
+                condicoes.append(Produto.id_produto == valor)
+            elif campo == "nome":
+                prefixo = normalizar_nome_produto(valor)
+                if prefixo:
+                    condicoes.append(self._filtro_prefixo(Produto.nome_normalizado, prefixo))
+            elif campo == "preco":
+                condicoes.extend(self._filtro_faixa(Produto.preco, valor))
+            elif campo == "estoque":
+                condicoes.extend(self._filtro_faixa(Produto.quantidade_estoque, valor))
+            else:
+                raise Exception(f"Filtro inválido para produtos: '{campo}'")
+        return condicoes
+
+    def iterar_todos(self, tamanho_lote: int = 1000) -> Iterator[Produto]:
+        """Percorre todos os produtos em lotes, com memória constante."""
+        return self._iterar_em_lotes(
+            self.session.query(Produto).order_by(Produto.id_produto), tamanho_lote)
+
+    def buscar_por_nome(self, nome: str, limite: Optional[int] = None) -> List[Produto]:
+        """
+        Busca produtos cujo nome ou descrição contenham palavras começando pelos
+        termos informados, ordenados por relevância, usando o índice de texto
+        completo. Sem índice disponível, recorre à busca parcial (LIKE) no nome.
+        """
+        termos = re.findall(r"\w+", nome)
+        if not termos:
+            return []
+
+        dialeto = self.session.get_bind().dialect.name
+        if dialeto == "sqlite" and self._possui_indice_texto():
+            consulta = " ".join(f'"{termo}"*' for termo in termos)
+            query = self.session.query(Produto).join(
+                produto_fts, produto_fts.c.rowid == Produto.id_produto
+            ).filter(
+                text("produto_fts MATCH :consulta").bindparams(consulta=consulta)
+            ).order_by(produto_fts.c.rank)
+        elif dialeto == "mysql":
+            relevancia = match(Produto.nome, Produto.descricao,
+                               against=" ".join(f"+{termo}*" for termo in termos)).in_boolean_mode()
+            query = self.session.query(Produto).filter(relevancia).order_by(relevancia.desc())
+        else:
+            query = self.session.query(Produto).filter(
+                Produto.nome.ilike(f"%{nome}%")
+            )
+
+        if limite:
+            query = query.limit(limite)
+        return query.all()
+
+    def _possui_indice_texto(self) -> bool:
+        """Verifica (uma vez por repositório) se a tabela produto_fts existe no SQLite."""
+        if not hasattr(self, "_indice_texto"):
+            self._indice_texto = self.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'produto_fts'"
+            )).first() is not None
+        return self._indice_texto
+
+    def buscar_com_estoque_baixo(self, limite: int = 10,
+                                 limites_por_classe: Optional[Dict[str, int]] = None,
+                                 usar_ponto_reposicao: bool = False) -> List[Produto]:
+        """
+        Busca produtos com estoque baixo. Com usar_ponto_reposicao, o limite de
+        cada produto com demanda é o seu ponto de reposição calculado
+        (produto_reposicao).
+        Com limites_por_classe ({'A': 20, ...}), produtos sem ponto calculado
+        usam o limite da sua classe ABC por receita (produto_classificacao); os
+        demais usam `limite`.
+        """
+        query = self.session.query(Produto)
+        limite_do_produto = limite
+        if limites_por_classe:
+            query = query.outerjoin(
+                ProdutoClassificacao, ProdutoClassificacao.id_produto == Produto.id_produto)
+            limite_do_produto = case(
+                *((ProdutoClassificacao.classe_receita == classe, minimo)
+                  for classe, minimo in limites_por_classe.items()),
+                else_=limite
+            )
+        if usar_ponto_reposicao:
+            # Junção pela chave primária de produto_reposicao: uma busca indexada por produto.
+            # Pontos sem demanda (gravados por cálculos antigos) não substituem o limite
+            query = query.outerjoin(ProdutoReposicao, and_(
+                ProdutoReposicao.id_produto == Produto.id_produto, ProdutoReposicao.demanda_media > 0))
+            limite_do_produto = func.coalesce(ProdutoReposicao.ponto_reposicao, limite_do_produto)
+
+        return query.filter(Produto.quantidade_estoque <= limite_do_produto).all()
 
     def buscar_sem_estoque(self) -> List[Produto]:
         """Busca produtos sem estoque."""
@@ -75,11 +216,12 @@ class ProdutoRepositorio:
     def atualizar(self, produto: Produto) -> Produto:
         """Atualiza um produto existente."""
         try:
-            self.session.merge(produto)
-            self.session.commit()
+            persistido = self.session.merge(produto)
+            self._gravar_no_cache(persistido)
+            self._confirmar()
             return produto
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_por_id(self, id_produto: int, nome: Optional[str] = None, preco: Optional[float] = None,
@@ -97,11 +239,12 @@ class ProdutoRepositorio:
                 if quantidade_estoque is not None:
                     produto.quantidade_estoque = quantidade_estoque
 
-                self.session.commit()
+                self._gravar_no_cache(produto)
+                self._confirmar()
                 return produto
             return None
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def deletar(self, id_produto: int) -> bool:
@@ -110,11 +253,12 @@ class ProdutoRepositorio:
             produto = self.buscar_por_id(id_produto)
             if produto:
                 self.session.delete(produto)
-                self.session.commit()
+                self._invalidar_cache(id_produto)
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_estoque(self, id_produto: int, nova_quantidade: int) -> bool:
@@ -123,39 +267,159 @@ class ProdutoRepositorio:
             produto = self.buscar_por_id(id_produto)
             if produto:
                 produto.quantidade_estoque = nova_quantidade
-                self.session.commit()
+                self._invalidar_cache(id_produto)
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def reduzir_estoque(self, id_produto: int, quantidade: int) -> bool:
-        """Reduz o estoque de um produto."""
+        """
+        Reduz o estoque de um produto com um único UPDATE condicional, atômico
+        mesmo com vários terminais vendendo ao mesmo tempo.
+        Retorna False se o produto não existe ou não tem saldo suficiente.
+        """
         try:
-            produto = self.buscar_por_id(id_produto)
-            if produto and produto.quantidade_estoque >= quantidade:
-                produto.quantidade_estoque -= quantidade
-                self.session.commit()
-                return True
-            return False
+            resultado = self.session.execute(
+                update(Produto)
+                .where(Produto.id_produto == id_produto,
+                       Produto.quantidade_estoque >= quantidade)
+                .values(quantidade_estoque=Produto.quantidade_estoque - quantidade)
+                .execution_options(synchronize_session=False)
+            )
+            self._expirar_estoque([id_produto])
+            self._invalidar_cache(id_produto)
+            self._confirmar()
+            return resultado.rowcount == 1
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
+            raise e
+
+    def reduzir_estoque_em_lote(self, quantidades: Dict[int, int]) -> bool:
+        """
+        Reduz o estoque de vários produtos ({id_produto: quantidade}) em um único
+        lote de UPDATEs condicionais (executemany), dentro de uma transação.
+        Retorna False se algum produto não existe ou não tem saldo suficiente;
+        nesse caso a transação é desfeita, ou, dentro de uma unidade de trabalho,
+        cabe ao chamador abortá-la.
+        """
+        if not quantidades:
+            return True
+
+        tabela = Produto.__table__
+        comando = (
+            update(tabela)
+            .where(tabela.c.id_produto == bindparam("b_id_produto"),
+                   tabela.c.quantidade_estoque >= bindparam("b_quantidade"))
+            .values(quantidade_estoque=tabela.c.quantidade_estoque - bindparam("b_quantidade"))
+        )
+        parametros = [
+            {"b_id_produto": id_produto, "b_quantidade": quantidade}
+            for id_produto, quantidade in quantidades.items()
+        ]
+
+        try:
+            conexao = self.session.connection()
+            if conexao.dialect.supports_sane_multi_rowcount:
+                linhas_afetadas = conexao.execute(comando, parametros).rowcount
+            else:
+                linhas_afetadas = sum(conexao.execute(comando, p).rowcount for p in parametros)
+            self._expirar_estoque(quantidades.keys())
+            self._invalidar_cache(*quantidades.keys())
+
+            if linhas_afetadas != len(parametros):
+                self._desfazer()
+                return False
+
+            self._confirmar()
+            return True
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    def upsert_em_lote(self, linhas: List[dict], somar_estoque: bool = False) -> int:
+        """
+        Insere ou atualiza vários produtos em um único comando executemany, usando
+        nome_normalizado como chave: um produto já cadastrado tem nome, descrição e
+        preço substituídos, e o estoque substituído ou somado (somar_estoque).
+        Cada linha deve trazer nome, nome_normalizado, descricao, preco,
+        preco_custo (None mantém o custo atual) e quantidade_estoque.
+        Retorna a quantidade de linhas enviadas.
+        """
+        if not linhas:
+            return 0
+
+        tabela = Produto.__table__
+        comando = montar_upsert(
+            self.session.get_bind().dialect.name,
+            tabela,
+            ["nome_normalizado"],
+            lambda novo: {
+                "nome": novo.nome,
+                "descricao": novo.descricao,
+                "preco": novo.preco,
+                "preco_custo": func.coalesce(novo.preco_custo, tabela.c.preco_custo),
+                "quantidade_estoque": (
+                    tabela.c.quantidade_estoque + novo.quantidade_estoque
+                    if somar_estoque else novo.quantidade_estoque
+                ),
+            }
+        )
+
+        try:
+            self.session.execute(comando, linhas)
+            # Escrita em massa: mais barato esvaziar o cache do que rastrear ids
+            executar_apos_commit(self.session, cache_catalogo.invalidar_tudo)
+            executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(ESTOQUE))
+            self.session.expire_all()
+            self._confirmar()
+            return len(linhas)
+        except Exception as e:
+            self._desfazer()
             raise e
 
     def aumentar_estoque(self, id_produto: int, quantidade: int) -> bool:
-        """Aumenta o estoque de um produto."""
+        """Aumenta o estoque de um produto com um único UPDATE atômico."""
         try:
-            produto = self.buscar_por_id(id_produto)
-            if produto:
-                produto.quantidade_estoque += quantidade
-                self.session.commit()
-                return True
-            return False
+            resultado = self.session.execute(
+                update(Produto)
+                .where(Produto.id_produto == id_produto)
+                .values(quantidade_estoque=Produto.quantidade_estoque + quantidade)
+                .execution_options(synchronize_session=False)
+            )
+            self._expirar_estoque([id_produto])
+            self._invalidar_cache(id_produto)
+            self._confirmar()
+            return resultado.rowcount == 1
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
+    def _expirar_estoque(self, ids_produto: Iterable[int]):
+        """Descarta o estoque em memória dos produtos alterados direto no banco."""
+        for id_produto in ids_produto:
+            produto = self.session.identity_map.get(identity_key(Produto, id_produto))
+            if produto is not None:
+                self.session.expire(produto, ["quantidade_estoque"])
+
+    def _gravar_no_cache(self, produto: Produto):
+        """Write-through: após o commit, o cache recebe os dados gravados do produto."""
+        self.session.flush()
+        copia = ProdutoCatalogo.de_produto(produto)
+        executar_apos_commit(self.session, lambda: cache_catalogo.atualizar(copia))
+        executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(ESTOQUE))
+
+    def _invalidar_cache(self, *ids_produto: int):
+        """Remove os produtos do cache assim que a transação for confirmada."""
+        executar_apos_commit(self.session, lambda: cache_catalogo.invalidar(*ids_produto))
+        executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(ESTOQUE))
+
+    def obter_estatisticas_cache(self) -> dict:
+        """Contadores de acertos e falhas do cache do catálogo."""
+        return cache_catalogo.estatisticas()
+
     def verificar_estoque_disponivel(self, id_produto: int, quantidade_desejada: int) -> bool:
         """Verifica se há estoque suficiente para uma quantidade desejada."""
         produto = self.buscar_por_id(id_produto)
@@ -181,22 +445,26 @@ class ProdutoRepositorio:
         """Busca produtos ordenados por nome."""
         return self.session.query(Produto).order_by(Produto.nome.asc()).all()
 
+    @relatorio_em_cache(ESTOQUE)
     def contar_produtos(self) -> int:
         """Conta o total de produtos cadastrados."""
         return self.session.query(Produto).count()
 
+    @relatorio_em_cache(ESTOQUE)
     def calcular_valor_total_estoque(self) -> float:
         """Calcula o valor total do estoque."""
-        produtos = self.buscar_todos()
-        return sum(produto.quantidade_estoque * produto.preco for produto in produtos)
+        total = self.session.query(
+            func.sum(Produto.quantidade_estoque * Produto.preco)
+        ).scalar()
+        return float(total) if total is not None else 0.0
 
     def verificar_nome_existe(self, nome: str, id_produto: Optional[int] = None) -> bool:
-        """Verifica se um nome de produto já existe no banco (exceto para o próprio produto)."""
-        query = self.session.query(Produto).filter(Produto.nome == nome)
+        """
+        Verifica se um nome de produto já existe no banco (exceto para o próprio
+        produto), ignorando maiúsculas, acentos e espaços repetidos.
+        """
+        query = self.session.query(Produto.id_produto).filter(
+            Produto.nome_normalizado == normalizar_nome_produto(nome))
         if id_produto:
             query = query.filter(Produto.id_produto != id_produto)
         return query.first() is not None
-
-    def fechar_sessao(self):
-        """Fecha a sessão do banco de dados."""
-        self.session.close()
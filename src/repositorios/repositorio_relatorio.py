@@ -0,0 +1,262 @@
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from sqlalchemy import and_, case, func
+from src.repositorios.cache_relatorios import (ESTOQUE, VENDAS, cache_relatorios, periodo_entre,
+                                               relatorio_em_cache)
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.sql_portavel import inicio_do_periodo
+from src.modelos.tabelas_bd import (Cliente, Funcionario, ItensVenda, Produto, ProdutoReposicao, Venda,
+                                    VendaResumoDiario)
+
+"""
+Este arquivo implementa o repositório de relatórios gerenciais. Cada relatório é
+uma única consulta agregada (GROUP BY, com funções de janela para rankings)
+executada no banco, que devolve apenas as linhas já resumidas como dicionários.
+Relatórios de vendas por período e por funcionário leem o resumo diário
+(venda_resumo_diario); os por cliente e por produto agregam venda/itens_venda
+usando os índices por data. Os resultados passam pelo cache_relatorios e são
+invalidados quando vendas dos dias cobertos ou o estoque mudam.
+"""
+
+
+def _limites_dia(data_inicio: date, data_fim: date):
+    """Converte um intervalo de dias (inclusivo) em [início, fim) de data/hora."""
+    return (datetime.combine(data_inicio, time.min),
+            datetime.combine(data_fim + timedelta(days=1), time.min))
+
+
+def _numero(valor) -> float:
+    return float(valor) if valor is not None else 0.0
+
+
+class RelatorioRepositorio(RepositorioBase):
+    """Repositório de consultas agregadas para relatórios."""
+
+    @property
+    def _dialeto(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
+    def vendas_por_periodo(self, data_inicio: date, data_fim: date, granularidade: str = "dia",
+                           id_funcionario: Optional[int] = None) -> List[dict]:
+        """Totais de vendas agrupados por dia, semana ou mês (início do período)."""
+        periodo = inicio_do_periodo(self._dialeto, VendaResumoDiario.data, granularidade).label("periodo")
+        query = self.session.query(
+            periodo,
+            func.sum(VendaResumoDiario.quantidade_vendas).label("quantidade_vendas"),
+            func.sum(VendaResumoDiario.quantidade_itens).label("quantidade_itens"),
+            func.sum(VendaResumoDiario.valor_bruto).label("valor_bruto"),
+            func.sum(VendaResumoDiario.desconto_total).label("desconto_total"),
+        ).filter(
+            VendaResumoDiario.data >= data_inicio,
+            VendaResumoDiario.data <= data_fim
+        )
+        if id_funcionario is not None:
+            query = query.filter(VendaResumoDiario.id_funcionario == id_funcionario)
+
+        return [
+            self._linha_vendas(r, periodo=r.periodo)
+            for r in query.group_by(periodo).order_by(periodo)
+        ]
+
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
+    def vendas_por_funcionario(self, data_inicio: date, data_fim: date) -> List[dict]:
+        """Totais de vendas por funcionário no período, com posição no ranking."""
+        liquido = func.sum(VendaResumoDiario.valor_bruto - VendaResumoDiario.desconto_total)
+        query = self.session.query(
+            Funcionario.id_funcionario,
+            Funcionario.nome,
+            func.sum(VendaResumoDiario.quantidade_vendas).label("quantidade_vendas"),
+            func.sum(VendaResumoDiario.quantidade_itens).label("quantidade_itens"),
+            func.sum(VendaResumoDiario.valor_bruto).label("valor_bruto"),
+            func.sum(VendaResumoDiario.desconto_total).label("desconto_total"),
+            func.rank().over(order_by=liquido.desc()).label("posicao"),
+        ).join(
+            Funcionario, Funcionario.id_funcionario == VendaResumoDiario.id_funcionario
+        ).filter(
+            VendaResumoDiario.data >= data_inicio,
+            VendaResumoDiario.data <= data_fim
+        ).group_by(Funcionario.id_funcionario, Funcionario.nome).order_by(liquido.desc())
+
+        return [
+            self._linha_vendas(r, posicao=r.posicao, id_funcionario=r.id_funcionario, nome=r.nome)
+            for r in query
+        ]
+
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
+    def vendas_por_cliente(self, data_inicio: date, data_fim: date,
+                           limite: Optional[int] = None) -> List[dict]:
+        """Compras por cliente cadastrado no período, do maior para o menor valor."""
+        inicio, fim = _limites_dia(data_inicio, data_fim)
+        liquido = func.sum(Venda.valor_total)
+        query = self.session.query(
+            Cliente.id_cliente,
+            Cliente.nome,
+            func.count(Venda.id_venda).label("quantidade_vendas"),
+            liquido.label("valor_liquido"),
+            func.sum(Venda.desconto_total).label("desconto_total"),
+            func.max(Venda.data_venda).label("ultima_compra"),
+            func.rank().over(order_by=liquido.desc()).label("posicao"),
+        ).join(
+            Cliente, Cliente.id_cliente == Venda.id_cliente
+        ).filter(
+            Venda.data_venda >= inicio,
+            Venda.data_venda < fim
+        ).group_by(Cliente.id_cliente, Cliente.nome).order_by(liquido.desc())
+        if limite:
+            query = query.limit(limite)
+
+        return [
+            {
+                "posicao": r.posicao,
+                "id_cliente": r.id_cliente,
+                "nome": r.nome,
+                "quantidade_vendas": r.quantidade_vendas,
+                "valor_liquido": _numero(r.valor_liquido),
+                "desconto_total": _numero(r.desconto_total),
+                "ticket_medio": _numero(r.valor_liquido) / r.quantidade_vendas,
+                "ultima_compra": r.ultima_compra
+            }
+            for r in query
+        ]
+
+    @relatorio_em_cache(VENDAS, ESTOQUE, periodo=periodo_entre("data_inicio", "data_fim"))
+    def vendas_por_produto(self, data_inicio: date, data_fim: date,
+                           limite: Optional[int] = None) -> List[dict]:
+        """
+        Quantidade, receita e margem por produto no período, da maior para a menor
+        receita. O custo usa o preco_custo atual do produto; produtos sem custo
+        cadastrado têm custo e margem None.
+        """
+        itens = self._itens_por_produto(data_inicio, data_fim)
+        receita = itens.c.valor_bruto - itens.c.desconto_total
+        query = self.session.query(
+            Produto.id_produto,
+            Produto.nome,
+            itens.c.quantidade,
+            itens.c.valor_bruto,
+            itens.c.desconto_total,
+            (itens.c.quantidade * Produto.preco_custo).label("custo"),
+            func.rank().over(order_by=receita.desc()).label("posicao"),
+        ).select_from(itens).join(
+            Produto, Produto.id_produto == itens.c.id_produto
+        ).order_by(receita.desc())
+        if limite:
+            query = query.limit(limite)
+
+        linhas = []
+        for r in query:
+            liquido = _numero(r.valor_bruto) - _numero(r.desconto_total)
+            custo = float(r.custo) if r.custo is not None else None
+            margem = liquido - custo if custo is not None else None
+            linhas.append({
+                "posicao": r.posicao,
+                "id_produto": r.id_produto,
+                "nome": r.nome,
+                "quantidade": int(r.quantidade),
+                "valor_bruto": _numero(r.valor_bruto),
+                "desconto_total": _numero(r.desconto_total),
+                "valor_liquido": liquido,
+                "custo": custo,
+                "margem": margem,
+                "margem_percentual": margem / liquido * 100 if margem is not None and liquido else None
+            })
+        return linhas
+
+    @relatorio_em_cache(VENDAS, ESTOQUE, periodo=periodo_entre("data_inicio", "data_fim"))
+    def margem_periodo(self, data_inicio: date, data_fim: date) -> dict:
+        """
+        Receita líquida, custo e margem do período em uma linha. Itens de produtos
+        sem preço de custo ficam fora do custo e da margem e são contados à parte.
+        """
+        itens = self._itens_por_produto(data_inicio, data_fim)
+        liquido = itens.c.valor_bruto - itens.c.desconto_total
+        com_custo = Produto.preco_custo.isnot(None)
+        r = self.session.query(
+            func.sum(liquido).label("valor_liquido"),
+            func.sum(case((com_custo, liquido), else_=0)).label("valor_liquido_com_custo"),
+            func.sum(case((com_custo, itens.c.quantidade * Produto.preco_custo), else_=0)).label("custo"),
+            func.sum(case((com_custo, 0), else_=itens.c.quantidade)).label("itens_sem_custo"),
+        ).select_from(itens).join(
+            Produto, Produto.id_produto == itens.c.id_produto
+        ).one()
+
+        com_custo_liquido = _numero(r.valor_liquido_com_custo)
+        margem = com_custo_liquido - _numero(r.custo)
+        return {
+            "valor_liquido": _numero(r.valor_liquido),
+            "valor_liquido_com_custo": com_custo_liquido,
+            "custo": _numero(r.custo),
+            "margem": margem,
+            "margem_percentual": margem / com_custo_liquido * 100 if com_custo_liquido else None,
+            "itens_sem_custo": int(r.itens_sem_custo or 0)
+        }
+
+    def _itens_por_produto(self, data_inicio: date, data_fim: date):
+        """
+        Subconsulta com os itens vendidos no período já somados por produto; o
+        join com produto acontece depois, uma vez por produto e não por item.
+        """
+        inicio, fim = _limites_dia(data_inicio, data_fim)
+        return self.session.query(
+            ItensVenda.id_produto,
+            func.sum(ItensVenda.quantidade).label("quantidade"),
+            func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario).label("valor_bruto"),
+            func.sum(func.coalesce(ItensVenda.desconto_aplicado, 0)).label("desconto_total"),
+        ).join(
+            Venda, Venda.id_venda == ItensVenda.id_venda
+        ).filter(
+            Venda.data_venda >= inicio,
+            Venda.data_venda < fim
+        ).group_by(ItensVenda.id_produto).subquery()
+
+    @relatorio_em_cache(ESTOQUE)
+    def valorizacao_estoque(self, limite_minimo: int = 5) -> dict:
+        """
+        Quantidade, valor de venda e valor de custo do estoque em uma única
+        consulta. O estoque baixo segue a regra de buscar_produtos_em_falta:
+        estoque no ponto de reposição calculado ou abaixo dele, e
+        `limite_minimo` para os produtos ainda sem ponto calculado.
+        """
+        limite_do_produto = func.coalesce(ProdutoReposicao.ponto_reposicao, limite_minimo)
+        r = self.session.query(
+            func.count(Produto.id_produto).label("total_produtos"),
+            func.sum(Produto.quantidade_estoque).label("total_itens"),
+            func.sum(Produto.quantidade_estoque * Produto.preco).label("valor_venda"),
+            func.sum(Produto.quantidade_estoque * Produto.preco_custo).label("valor_custo"),
+            func.sum(case((Produto.preco_custo.is_(None), 1), else_=0)).label("sem_custo"),
+            func.sum(case((Produto.quantidade_estoque <= limite_do_produto, 1), else_=0)).label("estoque_baixo"),
+            func.sum(case((Produto.quantidade_estoque <= 0, 1), else_=0)).label("sem_estoque"),
+        ).outerjoin(ProdutoReposicao, and_(
+            ProdutoReposicao.id_produto == Produto.id_produto, ProdutoReposicao.demanda_media > 0
+        )).one()
+
+        return {
+            "total_produtos": r.total_produtos,
+            "total_itens": int(r.total_itens or 0),
+            "valor_venda": _numero(r.valor_venda),
+            "valor_custo": _numero(r.valor_custo),
+            "produtos_sem_custo": int(r.sem_custo or 0),
+            "produtos_estoque_baixo": int(r.estoque_baixo or 0),
+            "produtos_sem_estoque": int(r.sem_estoque or 0)
+        }
+
+    @staticmethod
+    def obter_estatisticas_cache() -> dict:
+        """Contadores de acertos, falhas e invalidações do cache de relatórios."""
+        return cache_relatorios.estatisticas()
+
+    @staticmethod
+    def _linha_vendas(r, **campos) -> dict:
+        bruto = _numero(r.valor_bruto)
+        desconto = _numero(r.desconto_total)
+        quantidade = int(r.quantidade_vendas or 0)
+        campos.update({
+            "quantidade_vendas": quantidade,
+            "quantidade_itens": int(r.quantidade_itens or 0),
+            "valor_bruto": bruto,
+            "desconto_total": desconto,
+            "valor_liquido": bruto - desconto,
+            "ticket_medio": (bruto - desconto) / quantidade if quantidade else 0.0
+        })
+        return campos
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, func, insert
+from sqlalchemy.engine import Row
+from src.configs.config_bd import executar_apos_commit
+from src.repositorios.cache_relatorios import ESTOQUE, cache_relatorios
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.sql_portavel import inicio_do_periodo
+from src.modelos.tabelas_bd import ItensVenda, Produto, ProdutoReposicao, Venda
+
+"""
+Este arquivo implementa o repositório dos pontos de reposição dos produtos
+(tabela produto_reposicao). Fornece a demanda vendida por produto e por dia
+em uma única consulta agregada, para o cálculo em lote feito pelo
+AnaliseEstoqueServico, e grava o resultado substituindo o cálculo anterior.
+"""
+
+
+class ReposicaoRepositorio(RepositorioBase):
+    """Repositório dos pontos de reposição de produtos."""
+
+    def buscar_ids_produtos(self) -> List[int]:
+        """IDs de todos os produtos cadastrados, em ordem crescente."""
+        return [id_produto for id_produto, in
+                self.session.query(Produto.id_produto).order_by(Produto.id_produto)]
+
+    def obter_demanda_diaria(self, data_inicio: datetime, data_fim: datetime) -> List[Row]:
+        """
+        Quantidade vendida por produto e por dia em [data_inicio, data_fim),
+        apenas dos pares (produto, dia) com venda. Cada linha traz id_produto,
+        dia (date) e quantidade.
+        """
+        dia = inicio_do_periodo(self.session.get_bind().dialect.name, Venda.data_venda, "dia").label("dia")
+        return self.session.query(
+            ItensVenda.id_produto,
+            dia,
+            func.sum(ItensVenda.quantidade).label("quantidade"),
+        ).join(
+            Venda, Venda.id_venda == ItensVenda.id_venda
+        ).filter(
+            Venda.data_venda >= data_inicio,
+            Venda.data_venda < data_fim
+        ).group_by(ItensVenda.id_produto, dia).all()
+
+    def substituir(self, linhas: List[dict]) -> int:
+        """
+        Troca todos os pontos de reposição pelas linhas informadas (DELETE e um
+        INSERT executemany na mesma transação). Retorna a quantidade gravada.
+        """
+        try:
+            self.session.execute(delete(ProdutoReposicao))
+            if linhas:
+                self.session.execute(insert(ProdutoReposicao), linhas)
+            self.session.expire_all()
+            # O estoque baixo dos relatórios depende dos pontos de reposição
+            executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(ESTOQUE))
+            self._confirmar()
+            return len(linhas)
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    def buscar_por_produto(self, id_produto: int) -> Optional[ProdutoReposicao]:
+        """Ponto de reposição calculado de um produto, se houver."""
+        return self.session.get(ProdutoReposicao, id_produto)
@@ -0,0 +1,168 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.engine import Connection
+from src.configs.config_bd import executar_apos_commit
+from src.repositorios.cache_relatorios import VENDAS, cache_relatorios, periodo_entre, relatorio_em_cache
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.sql_portavel import montar_upsert
+from src.modelos.tabelas_bd import ItensVenda, Venda, VendaResumoDiario
+
+"""
+Este arquivo implementa o repositório do resumo diário de vendas (tabela
+venda_resumo_diario). Cada venda, item ou cancelamento soma seus deltas à linha
+(dia, funcionário) com um único upsert, na mesma transação da operação; assim os
+relatórios por dia ou mês leem poucas linhas já agregadas em vez de varrer as
+vendas. A reconstrução a partir de venda/itens_venda serve para carga inicial
+e para corrigir divergências. Toda escrita no resumo invalida, após o commit,
+os relatórios de vendas em cache que cobrem os dias alterados.
+"""
+
+
+def reconstruir_resumo_diario(conexao: Connection, data_inicio: Optional[date] = None,
+                              data_fim: Optional[date] = None) -> int:
+    """
+    Recalcula o resumo dos dias entre data_inicio e data_fim (inclusive; None =
+    sem limite) a partir das vendas, com um DELETE e um INSERT ... SELECT.
+    Retorna a quantidade de linhas (dia, funcionário) gravadas.
+    """
+    resumo = VendaResumoDiario.__table__
+
+    filtro_resumo = []
+    filtro_venda = []
+    if data_inicio is not None:
+        filtro_resumo.append(resumo.c.data >= data_inicio)
+        filtro_venda.append(Venda.data_venda >= datetime.combine(data_inicio, time.min))
+    if data_fim is not None:
+        filtro_resumo.append(resumo.c.data <= data_fim)
+        filtro_venda.append(Venda.data_venda < datetime.combine(data_fim + timedelta(days=1), time.min))
+
+    itens = select(
+        ItensVenda.id_venda,
+        func.sum(ItensVenda.quantidade).label("itens"),
+        func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario).label("bruto"),
+        func.sum(func.coalesce(ItensVenda.desconto_aplicado, 0)).label("desconto"),
+    ).group_by(ItensVenda.id_venda).subquery()
+
+    dia = func.date(Venda.data_venda)
+    agregado = select(
+        dia,
+        Venda.id_funcionario,
+        func.count(Venda.id_venda),
+        func.coalesce(func.sum(itens.c.bruto), 0),
+        func.coalesce(func.sum(itens.c.desconto), 0),
+        func.coalesce(func.sum(itens.c.itens), 0),
+    ).outerjoin(
+        itens, itens.c.id_venda == Venda.id_venda
+    ).where(and_(True, *filtro_venda)).group_by(dia, Venda.id_funcionario)
+
+    conexao.execute(delete(resumo).where(and_(True, *filtro_resumo)))
+    return conexao.execute(insert(resumo).from_select(
+        ["data", "id_funcionario", "quantidade_vendas", "valor_bruto",
+         "desconto_total", "quantidade_itens"],
+        agregado
+    )).rowcount
+
+
+class ResumoVendaRepositorio(RepositorioBase):
+    """Repositório do resumo diário de vendas por funcionário."""
+
+    def registrar(self, data: date, id_funcionario: int, quantidade_vendas: int = 0,
+                  valor_bruto: Decimal = Decimal("0"), desconto_total: Decimal = Decimal("0"),
+                  quantidade_itens: int = 0):
+        """
+        Soma os deltas informados (negativos para cancelamentos e remoções) à
+        linha do dia/funcionário, criando-a se necessário, com um único upsert.
+        """
+        resumo = VendaResumoDiario.__table__
+        comando = montar_upsert(
+            self.session.get_bind().dialect.name,
+            resumo,
+            ["data", "id_funcionario"],
+            lambda novo: {
+                "quantidade_vendas": resumo.c.quantidade_vendas + novo.quantidade_vendas,
+                "valor_bruto": resumo.c.valor_bruto + novo.valor_bruto,
+                "desconto_total": resumo.c.desconto_total + novo.desconto_total,
+                "quantidade_itens": resumo.c.quantidade_itens + novo.quantidade_itens,
+            }
+        )
+        try:
+            self.session.execute(comando, {
+                "data": data,
+                "id_funcionario": id_funcionario,
+                "quantidade_vendas": quantidade_vendas,
+                "valor_bruto": valor_bruto,
+                "desconto_total": desconto_total,
+                "quantidade_itens": quantidade_itens
+            })
+            executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(VENDAS, data, data))
+            self._confirmar()
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    def obter_totais(self, data_inicio: date, data_fim: date,
+                     id_funcionario: Optional[int] = None) -> dict:
+        """Soma o resumo dos dias entre data_inicio e data_fim (inclusive)."""
+        query = self.session.query(
+            func.coalesce(func.sum(VendaResumoDiario.quantidade_vendas), 0),
+            func.coalesce(func.sum(VendaResumoDiario.valor_bruto), 0),
+            func.coalesce(func.sum(VendaResumoDiario.desconto_total), 0),
+            func.coalesce(func.sum(VendaResumoDiario.quantidade_itens), 0),
+        ).filter(
+            VendaResumoDiario.data >= data_inicio,
+            VendaResumoDiario.data <= data_fim
+        )
+        if id_funcionario is not None:
+            query = query.filter(VendaResumoDiario.id_funcionario == id_funcionario)
+
+        vendas, bruto, desconto, itens = query.one()
+        return {
+            "quantidade_vendas": int(vendas),
+            "valor_bruto": Decimal(str(bruto)),
+            "desconto_total": Decimal(str(desconto)),
+            "quantidade_itens": int(itens)
+        }
+
+    def buscar_por_periodo(self, data_inicio: date, data_fim: date) -> List[VendaResumoDiario]:
+        """Linhas do resumo no período, por dia e funcionário."""
+        return self.session.query(VendaResumoDiario).filter(
+            VendaResumoDiario.data >= data_inicio,
+            VendaResumoDiario.data <= data_fim
+        ).order_by(VendaResumoDiario.data, VendaResumoDiario.id_funcionario).all()
+
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
+    def obter_ranking_funcionarios(self, data_inicio: date, data_fim: date) -> List[dict]:
+        """Vendas e valor líquido por funcionário no período, do maior para o menor."""
+        liquido = func.sum(VendaResumoDiario.valor_bruto - VendaResumoDiario.desconto_total)
+        resultado = self.session.query(
+            VendaResumoDiario.id_funcionario,
+            func.sum(VendaResumoDiario.quantidade_vendas).label('total_vendas'),
+            liquido.label('valor_total')
+        ).filter(
+            VendaResumoDiario.data >= data_inicio,
+            VendaResumoDiario.data <= data_fim
+        ).group_by(VendaResumoDiario.id_funcionario).order_by(liquido.desc()).all()
+
+        return [
+            {
+                "id_funcionario": r.id_funcionario,
+                "total_vendas": int(r.total_vendas),
+                "valor_total": float(r.valor_total)
+            }
+            for r in resultado
+        ]
+
+    def reconstruir(self, data_inicio: Optional[date] = None, data_fim: Optional[date] = None) -> int:
+        """Recalcula o resumo do período a partir das vendas (ver reconstruir_resumo_diario)."""
+        try:
+            linhas = reconstruir_resumo_diario(self.session.connection(), data_inicio, data_fim)
+            self.session.expire_all()
+            executar_apos_commit(self.session,
+                                 lambda: cache_relatorios.invalidar(VENDAS, data_inicio, data_fim))
+            self._confirmar()
+            return linhas
+        except Exception as e:
+            self._desfazer()
+            raise e
@@ -1,33 +1,34 @@
-from typing import List, Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from src.configs.config_bd import Session as SessionLocal
-from src.modelos.tabelas_bd import Venda, ItensVenda
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import Row, bindparam, func, and_, or_, select, update
+from src.configs.config_bd import executar_apos_commit
+from sqlalchemy.orm.util import identity_key
+from src.repositorios.cache_relatorios import VENDAS, cache_relatorios, periodo_entre, relatorio_em_cache
+from src.repositorios.repositorio_base import RepositorioBase
+from src.repositorios.repositorio_resumo_venda import ResumoVendaRepositorio
+from src.modelos.tabelas_bd import Venda, ItensVenda, Produto, Cliente, Funcionario
 
 """
 Este arquivo implementa o repositório para operações CRUD da entidade Venda,
 seguindo o padrão Repository. Encapsula todas as operações de acesso a dados
 relacionadas às vendas, fornecendo uma camada de abstração entre o modelo
-de dados e a lógica de negócio da aplicação.
+de dados e a lógica de negócio da aplicação. Os totais e relatórios agregados
+passam pelo cache_relatorios.
 """
 
 
-class VendaRepositorio:
+class VendaRepositorio(RepositorioBase):
     """Repositório para operações CRUD da entidade Venda."""
 
-    def __init__(self, session: Session | None = None):
-        self.session = session or SessionLocal()
-
     def salvar(self, venda: Venda) -> Venda:
         """Salva uma venda no banco de dados."""
         try:
             self.session.add(venda)
-            self.session.commit()
-            self.session.refresh(venda)
+            self._confirmar(venda)
             return venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def criar(self, data_venda: datetime, id_funcionario: int, id_cliente: Optional[int] = None) -> Venda:
@@ -39,11 +40,10 @@ class VendaRepositorio:
                 id_cliente=id_cliente
             )
             self.session.add(venda)
-            self.session.commit()
-            self.session.refresh(venda)
+            self._confirmar(venda)
             return venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def buscar_por_id(self, id_venda: int) -> Optional[Venda]:
@@ -75,6 +75,109 @@ class VendaRepositorio:
             )
         ).all()
 
+    def buscar_pagina(self, apos: Optional[Tuple[datetime, int]] = None, limite: int = 100,
+                      data_inicio: Optional[datetime] = None, data_fim: Optional[datetime] = None,
+                      id_funcionario: Optional[int] = None,
+                      id_cliente: Optional[int] = None) -> List[Venda]:
+        """
+        Retorna uma página de vendas ordenada por (data_venda, id_venda), começando
+        após o cursor `apos` (a tupla da última venda da página anterior).
+        Os filtros opcionais usam os índices de data, funcionário e cliente.
+        """
+        query = self._filtrar(self.session.query(Venda), data_inicio, data_fim,
+                              id_funcionario, id_cliente)
+        if apos is not None:
+            data_cursor, id_cursor = apos
+            query = query.filter(or_(
+                Venda.data_venda > data_cursor,
+                and_(Venda.data_venda == data_cursor, Venda.id_venda > id_cursor)
+            ))
+        return query.order_by(Venda.data_venda, Venda.id_venda).limit(limite).all()
+
+    def iterar_todos(self, tamanho_lote: int = 1000) -> Iterator[Venda]:
+        """Percorre todas as vendas em lotes, com memória constante."""
+        return self.iterar_vendas(tamanho_lote=tamanho_lote)
+
+    def iterar_por_periodo(self, data_inicio: datetime, data_fim: datetime,
+                           tamanho_lote: int = 1000) -> Iterator[Venda]:
+        """Percorre em lotes as vendas de um período, em ordem cronológica."""
+        return self.iterar_vendas(data_inicio, data_fim, tamanho_lote=tamanho_lote)
+
+    def iterar_por_funcionario(self, id_funcionario: int, tamanho_lote: int = 1000) -> Iterator[Venda]:
+        """Percorre em lotes as vendas de um funcionário."""
+        return self.iterar_vendas(id_funcionario=id_funcionario, tamanho_lote=tamanho_lote)
+
+    def iterar_por_cliente(self, id_cliente: int, tamanho_lote: int = 1000) -> Iterator[Venda]:
+        """Percorre em lotes as vendas de um cliente."""
+        return self.iterar_vendas(id_cliente=id_cliente, tamanho_lote=tamanho_lote)
+
+    def iterar_vendas(self, data_inicio: Optional[datetime] = None, data_fim: Optional[datetime] = None,
+                      id_funcionario: Optional[int] = None, id_cliente: Optional[int] = None,
+                      tamanho_lote: int = 1000) -> Iterator[Venda]:
+        """Percorre em lotes (stream_results) as vendas que atendem aos filtros."""
+        query = self._filtrar(self.session.query(Venda), data_inicio, data_fim,
+                              id_funcionario, id_cliente)
+        return self._iterar_em_lotes(
+            query.order_by(Venda.data_venda, Venda.id_venda), tamanho_lote)
+
+    def iterar_linhas_exportacao(self, data_inicio: datetime, data_fim: datetime,
+                                 tamanho_lote: int = 10000) -> Iterator[List[Row]]:
+        """
+        Percorre, em blocos de até `tamanho_lote` linhas, os itens vendidos no período
+        já unidos a venda, produto, cliente e funcionário. Usa cursor no servidor
+        (stream_results) e linhas simples em vez de objetos ORM.
+        """
+        consulta = select(
+            Venda.id_venda,
+            Venda.data_venda,
+            Venda.id_funcionario,
+            Funcionario.nome.label("funcionario"),
+            Venda.id_cliente,
+            Cliente.nome.label("cliente"),
+            ItensVenda.id_item_venda,
+            ItensVenda.id_produto,
+            Produto.nome.label("produto"),
+            ItensVenda.quantidade,
+            ItensVenda.preco_unitario,
+            func.coalesce(ItensVenda.desconto_aplicado, 0).label("desconto_aplicado"),
+        ).select_from(Venda).join(
+            ItensVenda, ItensVenda.id_venda == Venda.id_venda
+        ).join(
+            Produto, Produto.id_produto == ItensVenda.id_produto
+        ).join(
+            Funcionario, Funcionario.id_funcionario == Venda.id_funcionario
+        ).outerjoin(
+            Cliente, Cliente.id_cliente == Venda.id_cliente
+        ).where(
+            Venda.data_venda >= data_inicio,
+            Venda.data_venda <= data_fim
+        ).order_by(Venda.data_venda, Venda.id_venda, ItensVenda.id_item_venda)
+
+        # Execução Core na conexão da sessão: dispensa o carregamento ORM por linha
+        resultado = self.session.connection().execute(
+            consulta,
+            execution_options={"stream_results": True, "yield_per": tamanho_lote}
+        )
+        try:
+            for bloco in resultado.partitions():
+                yield bloco
+        finally:
+            resultado.close()
+
+    @staticmethod
+    def _filtrar(query, data_inicio: Optional[datetime], data_fim: Optional[datetime],
+                 id_funcionario: Optional[int], id_cliente: Optional[int]):
+        """Aplica os filtros opcionais de período, funcionário e cliente."""
+        if data_inicio is not None:
+            query = query.filter(Venda.data_venda >= data_inicio)
+        if data_fim is not None:
+            query = query.filter(Venda.data_venda <= data_fim)
+        if id_funcionario is not None:
+            query = query.filter(Venda.id_funcionario == id_funcionario)
+        if id_cliente is not None:
+            query = query.filter(Venda.id_cliente == id_cliente)
+        return query
+
     def buscar_por_data(self, data: datetime) -> List[Venda]:
         """Busca vendas de uma data específica."""
         data_inicio = data.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -104,10 +207,10 @@ class VendaRepositorio:
         """Atualiza uma venda existente."""
         try:
             self.session.merge(venda)
-            self.session.commit()
+            self._confirmar()
             return venda
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_por_id(self, id_venda: int, data_venda: Optional[datetime] = None,
@@ -124,11 +227,11 @@ class VendaRepositorio:
                 if id_cliente is not None:
                     venda.id_cliente = id_cliente
 
-                self.session.commit()
+                self._confirmar()
                 return venda
             return None
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
     def atualizar_totais_venda(self, id_venda: int, valor_total: float, desconto_total: float) -> bool:
@@ -138,11 +241,36 @@ class VendaRepositorio:
             if venda:
                 venda.valor_total = valor_total
                 venda.desconto_total = desconto_total
-                self.session.commit()
+                data = venda.data_venda
+                executar_apos_commit(self.session, lambda: cache_relatorios.invalidar(VENDAS, data, data))
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
+            raise e
+
+    def somar_aos_totais(self, id_venda: int, valor_total: Decimal, desconto_total: Decimal) -> bool:
+        """
+        Soma os deltas informados (negativos para remoções) aos totais da venda
+        com um único UPDATE, sem recarregar os itens.
+        Retorna False se a venda não existe.
+        """
+        try:
+            resultado = self.session.execute(
+                update(Venda)
+                .where(Venda.id_venda == id_venda)
+                .values(valor_total=Venda.valor_total + valor_total,
+                        desconto_total=Venda.desconto_total + desconto_total)
+                .execution_options(synchronize_session=False)
+            )
+            venda = self.session.identity_map.get(identity_key(Venda, id_venda))
+            if venda is not None:
+                self.session.expire(venda, ["valor_total", "desconto_total"])
+            self._confirmar()
+            return resultado.rowcount == 1
+        except Exception as e:
+            self._desfazer()
             raise e
 
     def deletar(self, id_venda: int) -> bool:
@@ -157,13 +285,14 @@ class VendaRepositorio:
 
                 # Remove a venda
                 self.session.delete(venda)
-                self.session.commit()
+                self._confirmar()
                 return True
             return False
         except Exception as e:
-            self.session.rollback()
+            self._desfazer()
             raise e
 
+    @relatorio_em_cache(VENDAS)
     def contar_vendas(self) -> int:
         """Conta o total de vendas."""
         return self.session.query(Venda).count()
@@ -180,6 +309,7 @@ class VendaRepositorio:
             Venda.id_cliente == id_cliente
         ).count()
 
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
     def contar_vendas_periodo(self, data_inicio: datetime, data_fim: datetime) -> int:
         """Conta vendas em um período específico."""
         return self.session.query(Venda).filter(
@@ -189,11 +319,13 @@ class VendaRepositorio:
             )
         ).count()
 
+    @relatorio_em_cache(VENDAS)
     def calcular_total_vendas(self) -> float:
         """Calcula o valor total de todas as vendas."""
         resultado = self.session.query(func.sum(Venda.valor_total)).scalar()
         return float(resultado) if resultado else 0.0
 
+    @relatorio_em_cache(VENDAS)
     def calcular_total_descontos(self) -> float:
         """Calcula o valor total de todos os descontos."""
         resultado = self.session.query(func.sum(Venda.desconto_total)).scalar()
@@ -224,6 +356,82 @@ class VendaRepositorio:
             "desconto_total": desconto_total
         }
 
+    def obter_intervalo_datas(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Data/hora da primeira e da última venda gravadas (None, None sem vendas)."""
+        return tuple(self.session.query(func.min(Venda.data_venda), func.max(Venda.data_venda)).one())
+
+    def verificar_totais(self, data_inicio: datetime, data_fim: datetime) -> Tuple[int, List[Row]]:
+        """
+        Compara valor_total e desconto_total das vendas de [data_inicio, data_fim)
+        com a soma dos seus itens, em uma única consulta: os itens do período são
+        somados por venda em uma subconsulta e juntados à venda (vendas sem itens
+        devem ter totais zero). Retorna (vendas no período, linhas divergentes
+        com id_venda, data_venda, valor_total, desconto_total, valor_itens e
+        desconto_itens).
+        """
+        no_periodo = and_(Venda.data_venda >= data_inicio, Venda.data_venda < data_fim)
+        desconto = func.coalesce(ItensVenda.desconto_aplicado, 0)
+        itens = self.session.query(
+            ItensVenda.id_venda,
+            func.sum(ItensVenda.quantidade * ItensVenda.preco_unitario - desconto).label("valor"),
+            func.sum(desconto).label("desconto")
+        ).join(
+            Venda, Venda.id_venda == ItensVenda.id_venda
+        ).filter(no_periodo).group_by(ItensVenda.id_venda).subquery()
+
+        # Arredonda as somas em centavos, como as colunas são gravadas
+        valor_itens = func.round(func.coalesce(itens.c.valor, 0), 2)
+        desconto_itens = func.round(func.coalesce(itens.c.desconto, 0), 2)
+        divergentes = self.session.query(
+            Venda.id_venda,
+            Venda.data_venda,
+            Venda.valor_total,
+            Venda.desconto_total,
+            valor_itens.label("valor_itens"),
+            desconto_itens.label("desconto_itens")
+        ).outerjoin(
+            itens, itens.c.id_venda == Venda.id_venda
+        ).filter(
+            no_periodo,
+            or_(Venda.valor_total != valor_itens, Venda.desconto_total != desconto_itens)
+        ).order_by(Venda.id_venda).all()
+
+        quantidade = self.session.query(func.count(Venda.id_venda)).filter(no_periodo).scalar()
+        return quantidade, divergentes
+
+    def atualizar_totais_em_lote(self, linhas: List[dict]) -> int:
+        """
+        Grava os totais informados (id_venda, data_venda, valor_total,
+        desconto_total) em um único UPDATE executemany. Retorna a quantidade de
+        vendas atualizadas.
+        """
+        if not linhas:
+            return 0
+
+        tabela = Venda.__table__
+        comando = (
+            update(tabela)
+            .where(tabela.c.id_venda == bindparam("b_id_venda"))
+            .values(valor_total=bindparam("b_valor_total"), desconto_total=bindparam("b_desconto_total"))
+        )
+        parametros = [
+            {"b_id_venda": l["id_venda"], "b_valor_total": l["valor_total"], "b_desconto_total": l["desconto_total"]}
+            for l in linhas
+        ]
+        datas = [l["data_venda"] for l in linhas]
+
+        try:
+            self.session.connection().execute(comando, parametros)
+            executar_apos_commit(self.session,
+                                 lambda: cache_relatorios.invalidar(VENDAS, min(datas), max(datas)))
+            self.session.expire_all()
+            self._confirmar()
+            return len(parametros)
+        except Exception as e:
+            self._desfazer()
+            raise e
+
+    @relatorio_em_cache(VENDAS)
     def calcular_total_vendas_funcionario(self, id_funcionario: int) -> float:
         """Calcula o valor total de vendas de um funcionário específico."""
         resultado = self.session.query(func.sum(Venda.valor_total)).filter(
@@ -231,6 +439,7 @@ class VendaRepositorio:
         ).scalar()
         return float(resultado) if resultado else 0.0
 
+    @relatorio_em_cache(VENDAS)
     def calcular_total_vendas_cliente(self, id_cliente: int) -> float:
         """Calcula o valor total de vendas de um cliente específico."""
         resultado = self.session.query(func.sum(Venda.valor_total)).filter(
@@ -238,6 +447,7 @@ class VendaRepositorio:
         ).scalar()
         return float(resultado) if resultado else 0.0
 
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
     def calcular_total_vendas_periodo(self, data_inicio: datetime, data_fim: datetime) -> float:
         """Calcula o valor total de vendas em um período."""
         resultado = self.session.query(func.sum(Venda.valor_total)).filter(
@@ -248,6 +458,7 @@ class VendaRepositorio:
         ).scalar()
         return float(resultado) if resultado else 0.0
 
+    @relatorio_em_cache(VENDAS)
     def calcular_media_valor_vendas(self) -> float:
         """Calcula a média do valor das vendas."""
         resultado = self.session.query(func.avg(Venda.valor_total)).scalar()
@@ -255,10 +466,9 @@ class VendaRepositorio:
 
     def buscar_menor_venda(self) -> Optional[Venda]:
         """Busca a venda com menor valor."""
-        rvendas = self.buscar_todos()
-        if rvendas:
-            return min(rvendas, key=lambda v: v.valor_total)
-        return None
+        return self.session.query(Venda).order_by(
+            Venda.valor_total.asc()
+        ).first()
 
     def buscar_vendas_sem_cliente(self) -> List[Venda]:
         """Busca vendas que não possuem cliente associado."""
@@ -273,23 +483,33 @@ class VendaRepositorio:
         ).all()
 
     def obter_relatorio_vendas_diario(self, data: datetime) -> dict:
-        """Gera relatório de vendas do dia."""
-        vendas_dia = self.buscar_por_data(data)
-
-        total_vendas = len(vendas_dia)
-        valor_total = sum(venda.valor_total for venda in vendas_dia)
-        total_descontos = sum(
-            venda.desconto_aplicado or 0 for venda in vendas_dia)
-
+        """Gera relatório de vendas do dia a partir do resumo diário (venda_resumo_diario)."""
+        relatorio = self._obter_relatorio_resumo(data.date(), data.date())
+        relatorio["data"] = data.strftime("%Y-%m-%d")
+        return relatorio
+
+    def obter_relatorio_vendas_mensal(self, ano: int, mes: int) -> dict:
+        """Gera relatório de vendas do mês a partir do resumo diário."""
+        inicio = date(ano, mes, 1)
+        fim = date(ano + (mes == 12), mes % 12 + 1, 1) - timedelta(days=1)
+        relatorio = self._obter_relatorio_resumo(inicio, fim)
+        relatorio["mes"] = inicio.strftime("%Y-%m")
+        return relatorio
+
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("inicio", "fim"))
+    def _obter_relatorio_resumo(self, inicio: date, fim: date) -> dict:
+        totais = ResumoVendaRepositorio(self.session).obter_totais(inicio, fim)
+        total_vendas = totais["quantidade_vendas"]
+        valor_total = float(totais["valor_bruto"] - totais["desconto_total"])
         return {
-            "data": data.strftime("%Y-%m-%d"),
             "total_vendas": total_vendas,
             "valor_total": valor_total,
-            "total_descontos": total_descontos,
-            "valor_medio_venda": valor_total / total_vendas if total_vendas > 0 else 0,
-            "vendas": vendas_dia
+            "total_descontos": float(totais["desconto_total"]),
+            "total_itens": totais["quantidade_itens"],
+            "valor_medio_venda": valor_total / total_vendas if total_vendas > 0 else 0
         }
 
+    @relatorio_em_cache(VENDAS, periodo=periodo_entre("data_inicio", "data_fim"))
     def obter_ranking_funcionarios(self, data_inicio: datetime, data_fim: datetime) -> List[dict]:
         """Obtém ranking de funcionários por vendas em um período."""
         resultado = self.session.query(
@@ -313,7 +533,3 @@ class VendaRepositorio:
             }
             for r in resultado
         ]
-
-    def fechar_sessao(self):
-        """Fecha a sessão do banco de dados."""
-        self.session.close()
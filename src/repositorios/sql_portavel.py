@@ -0,0 +1,69 @@
+from typing import Callable, Dict, List
+from sqlalchemy import Date, Table, func
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.dml import Insert
+
+"""
+Este arquivo reúne construções SQL que cada banco suportado escreve de um jeito.
+O "upsert" (inserir ou, se a chave única já existir, atualizar) é INSERT ...
+ON CONFLICT DO UPDATE no SQLite e INSERT ... ON DUPLICATE KEY UPDATE no MySQL;
+o agrupamento de datas por semana ou mês também muda de função entre os bancos.
+Os repositórios montam essas expressões aqui.
+"""
+
+# Recebe as colunas com os valores "novos" da linha recusada (excluded/inserted)
+# e devolve {coluna: expressão} a aplicar na linha existente.
+AtualizacaoUpsert = Callable[[object], Dict[str, object]]
+
+
+def montar_upsert(dialeto: str, tabela: Table, colunas_chave: List[str],
+                  atualizar: AtualizacaoUpsert) -> Insert:
+    """
+    Monta um INSERT que, em conflito na chave única `colunas_chave`, atualiza a
+    linha existente com as expressões retornadas por `atualizar`. Exemplo:
+        montar_upsert(d, t, ["id"], lambda novo: {"total": t.c.total + novo.total})
+    """
+    if dialeto == "sqlite":
+        comando = sqlite.insert(tabela)
+        return comando.on_conflict_do_update(
+            index_elements=colunas_chave,
+            set_=atualizar(comando.excluded)
+        )
+
+    if dialeto in ("mysql", "mariadb"):
+        comando = mysql.insert(tabela)
+        return comando.on_duplicate_key_update(atualizar(comando.inserted))
+
+    raise Exception(f"Upsert não suportado para o banco '{dialeto}'")
+
+
+GRANULARIDADES = ("dia", "semana", "mes")
+
+
+def inicio_do_periodo(dialeto: str, coluna: ColumnElement, granularidade: str) -> ColumnElement:
+    """
+    Expressão com o primeiro dia do período (dia, semana ISO começando na
+    segunda-feira, ou mês) que contém a data/hora da coluna, para GROUP BY.
+    """
+    if granularidade not in GRANULARIDADES:
+        raise Exception(f"Granularidade inválida: '{granularidade}' (use {', '.join(GRANULARIDADES)})")
+
+    if dialeto == "sqlite":
+        modificadores = {
+            "dia": (),
+            "semana": ("weekday 0", "-6 days"),
+            "mes": ("start of month",),
+        }[granularidade]
+        return func.date(coluna, *modificadores, type_=Date)
+
+    if dialeto in ("mysql", "mariadb"):
+        dia = func.date(coluna, type_=Date)
+        if granularidade == "semana":
+            return func.subdate(dia, func.weekday(dia), type_=Date)
+        if granularidade == "mes":
+            return func.subdate(dia, func.dayofmonth(dia) - 1, type_=Date)
+        return dia
+
+    raise Exception(f"Agrupamento por período não suportado para o banco '{dialeto}'")
+
@@ -0,0 +1,75 @@
+from sqlalchemy.orm import Session
+from src.configs.config_bd import Session as SessionLocal
+from src.repositorios.repositorio_base import CHAVE_UNIDADE_DE_TRABALHO
+from src.repositorios.repositorio_cliente import ClienteRepositorio
+from src.repositorios.repositorio_itens_venda import ItensVendaRepositorio
+from src.repositorios.repositorio_produto import ProdutoRepositorio
+from src.repositorios.repositorio_venda import VendaRepositorio
+
+"""
+Este arquivo implementa o padrão Unit of Work para as operações de negócio.
+Uma UnidadeDeTrabalho agrupa todas as escritas feitas pelos repositórios de uma
+mesma sessão em uma única transação, confirmada uma só vez ao sair do bloco
+`with` (ou desfeita por completo em caso de exceção).
+"""
+
+
+class UnidadeDeTrabalho:
+    """
+    Escopo transacional compartilhado entre repositórios.
+
+    Pode envolver uma sessão existente (a do serviço, por exemplo) ou abrir uma
+    própria, que é fechada ao final. Unidades aninhadas sobre a mesma sessão
+    não confirmam nada: apenas a mais externa faz o commit.
+    """
+
+    def __init__(self, session: Session | None = None):
+        self._sessao_propria = session is None
+        self.session = session
+        self._aninhada = False
+        self._repositorios = {}
+
+    def __enter__(self) -> "UnidadeDeTrabalho":
+        if self.session is None:
+            self.session = SessionLocal(expire_on_commit=False)
+
+        self._aninhada = bool(self.session.info.get(CHAVE_UNIDADE_DE_TRABALHO))
+        self.session.info[CHAVE_UNIDADE_DE_TRABALHO] = True
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, rastreamento):
+        if self._aninhada:
+            return False
+
+        try:
+            self.session.info.pop(CHAVE_UNIDADE_DE_TRABALHO, None)
+            if tipo_excecao is None:
+                self.session.commit()
+            else:
+                self.session.rollback()
+        finally:
+            if self._sessao_propria:
+                self.session.close()
+        return False
+
+    def _repositorio(self, classe):
+        """Retorna (criando uma vez) o repositório da classe ligado à sessão da unidade."""
+        if classe not in self._repositorios:
+            self._repositorios[classe] = classe(self.session)
+        return self._repositorios[classe]
+
+    @property
+    def produtos(self) -> ProdutoRepositorio:
+        return self._repositorio(ProdutoRepositorio)
+
+    @property
+    def clientes(self) -> ClienteRepositorio:
+        return self._repositorio(ClienteRepositorio)
+
+    @property
+    def vendas(self) -> VendaRepositorio:
+        return self._repositorio(VendaRepositorio)
+
+    @property
+    def itens_venda(self) -> ItensVendaRepositorio:
+        return self._repositorio(ItensVendaRepositorio)
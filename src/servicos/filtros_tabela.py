@@ -0,0 +1,100 @@
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Optional, Tuple
+from src.modelos.tabelas_bd import normalizar_nome_produto
+
+"""
+Este arquivo interpreta o texto dos campos de busca das tabelas em filtros para
+os repositórios (buscar_pagina(filtros=...)). O texto é uma sequência de termos
+separados por espaço no formato campo:valor, por exemplo
+    nome:parafuso preco:10-50 estoque:-5
+Os termos sem campo formam juntos o começo do nome, ou o ID se forem um único
+número. Faixas aceitam "min-max", "min-" e "-max"; um campo sem valor (ainda
+sendo digitado) é ignorado.
+"""
+
+ID = "id"
+PREFIXO = "prefixo"
+DIGITOS = "digitos"
+FAIXA_INTEIRA = "faixa_inteira"
+FAIXA_DECIMAL = "faixa_decimal"
+
+# Campo digitado (sem acentos, minúsculo) -> (filtro do repositório, tipo do valor)
+FILTROS_PRODUTO = {
+    "id": ("id", ID),
+    "nome": ("nome", PREFIXO),
+    "preco": ("preco", FAIXA_DECIMAL),
+    "estoque": ("estoque", FAIXA_INTEIRA),
+}
+FILTROS_CLIENTE = {
+    "id": ("id", ID),
+    "nome": ("nome", PREFIXO),
+    "cpf": ("cpf", DIGITOS),
+}
+FILTROS_FUNCIONARIO = {
+    "id": ("id", ID),
+    "nome": ("nome", PREFIXO),
+    "usuario": ("usuario", PREFIXO),
+}
+
+
+def _converter_numero(texto: str, tipo: str, campo: str):
+    try:
+        if tipo == FAIXA_INTEIRA:
+            return int(texto)
+        return Decimal(texto.replace(",", "."))
+    except (ValueError, InvalidOperation):
+        raise Exception(f"Valor inválido para {campo}: '{texto}'")
+
+
+def _interpretar_faixa(texto: str, tipo: str, campo: str) -> Tuple[Optional[object], Optional[object]]:
+    minimo, separador, maximo = texto.partition("-")
+    if not separador:
+        valor = _converter_numero(texto, tipo, campo)
+        return valor, valor
+    return (
+        _converter_numero(minimo, tipo, campo) if minimo else None,
+        _converter_numero(maximo, tipo, campo) if maximo else None,
+    )
+
+
+def interpretar_filtros(texto: str, campos: Dict[str, Tuple[str, str]]) -> dict:
+    """
+    Converte o texto de busca nos filtros aceitos por `campos` (ex.:
+    FILTROS_PRODUTO). Levanta exceção para campos desconhecidos ou valores
+    inválidos.
+    """
+    filtros = {}
+    soltos = []
+    for termo in texto.split():
+        nome_campo, separador, valor = termo.partition(":")
+        if not separador:
+            soltos.append(termo)
+            continue
+
+        chave = normalizar_nome_produto(nome_campo)
+        if chave not in campos:
+            raise Exception(f"Campo de busca desconhecido: '{nome_campo}' (use {', '.join(campos)})")
+        if not valor:
+            continue
+
+        filtro, tipo = campos[chave]
+        if tipo == ID:
+            if not valor.isdigit():
+                raise Exception(f"Valor inválido para {chave}: '{valor}'")
+            filtros[filtro] = int(valor)
+        elif tipo == DIGITOS:
+            # Aceita o CPF formatado (529.982...), gravado só com dígitos
+            digitos = valor.replace(".", "").replace("-", "")
+            if not digitos.isdigit():
+                raise Exception(f"Valor inválido para {chave}: '{valor}'")
+            filtros[filtro] = digitos
+        elif tipo == PREFIXO:
+            filtros[filtro] = valor
+        else:
+            filtros[filtro] = _interpretar_faixa(valor, tipo, chave)
+
+    if len(soltos) == 1 and soltos[0].isdigit() and "id" in campos:
+        filtros[campos["id"][0]] = int(soltos[0])
+    elif soltos and "nome" in campos:
+        filtros[campos["nome"][0]] = " ".join(soltos)
+    return filtros
@@ -0,0 +1,233 @@
+import math
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from statistics import NormalDist
+from typing import Dict, List, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from src.repositorios.repositorio_classificacao import ClassificacaoRepositorio
+from src.repositorios.repositorio_reposicao import ReposicaoRepositorio
+
+"""
+Este arquivo implementa o serviço de análise do estoque. A classificação ABC
+(curva de Pareto) ordena os produtos pela receita, ou pela quantidade vendida,
+e separa os que somam os primeiros 80% (A), os próximos 15% (B) e o restante (C).
+Os totais por produto vêm de uma única consulta agregada; ordenação,
+participações acumuladas e fronteiras das classes são calculadas com NumPy
+sobre o catálogo inteiro de uma vez, e o resultado é gravado na tabela
+produto_classificacao, lida pela tela do gerente e pela consulta de estoque baixo.
+Os pontos de reposição seguem a mesma ideia: a demanda diária de todos os
+produtos vira uma matriz produtos x dias, da qual saem, por colunas, a média
+móvel, a variabilidade e o ponto de reposição de cada produto, gravados em
+produto_reposicao.
+"""
+
+CLASSES_ABC = ("A", "B", "C")
+
+
+def classificar_abc(valores: np.ndarray, limite_a: float = 0.8,
+                    limite_b: float = 0.95) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Classifica cada posição de `valores` em A, B ou C pela participação
+    acumulada, do maior para o menor valor. Um produto é A enquanto a soma dos
+    que vêm antes dele não atinge limite_a (assim o que cruza a fronteira ainda
+    é A), e B enquanto não atinge limite_b; valores zero são sempre C.
+    Retorna (classes, participação de cada um, participação acumulada), na
+    ordem original.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    classes = np.full(valores.shape, "C", dtype="<U1")
+    participacao = np.zeros_like(valores)
+    acumulada = np.zeros_like(valores)
+    total = valores.sum()
+    if valores.size == 0 or total <= 0:
+        return classes, participacao, acumulada
+
+    ordem = np.argsort(-valores, kind="stable")
+    ordenados = valores[ordem]
+    parte = ordenados / total
+    soma = np.cumsum(parte)
+    anterior = soma - parte
+
+    classes[ordem] = np.where(
+        ordenados <= 0, "C",
+        np.where(anterior < limite_a, "A", np.where(anterior < limite_b, "B", "C"))
+    )
+    participacao[ordem] = parte
+    acumulada[ordem] = soma
+    return classes, participacao, acumulada
+
+
+def montar_matriz_demanda(ids_produto: np.ndarray, data_inicio: date, dias: int,
+                          ids_venda: np.ndarray, datas_venda: np.ndarray,
+                          quantidades: np.ndarray) -> np.ndarray:
+    """
+    Matriz (produtos x dias) com a quantidade vendida de cada produto de
+    ids_produto (ordenados) em cada dia a partir de data_inicio; pares
+    (produto, dia) sem venda ficam zero. Vendas de produtos que não estão em
+    ids_produto ou fora do período são ignoradas.
+    """
+    matriz = np.zeros((ids_produto.size, dias), dtype=np.float32)
+    if ids_produto.size == 0 or ids_venda.size == 0:
+        return matriz
+
+    linhas = np.searchsorted(ids_produto, ids_venda).clip(max=ids_produto.size - 1)
+    colunas = (datas_venda.astype("datetime64[D]") - np.datetime64(data_inicio, "D")).astype(np.int64)
+    validas = (ids_produto[linhas] == ids_venda) & (colunas >= 0) & (colunas < dias)
+    np.add.at(matriz, (linhas[validas], colunas[validas]), quantidades[validas])
+    return matriz
+
+
+def calcular_pontos_reposicao(matriz: np.ndarray, janela_media: int, prazo_reposicao: int,
+                              nivel_servico: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    A partir da matriz de demanda diária (produtos x dias, do mais antigo ao
+    mais recente), calcula para todos os produtos de uma vez:
+      - demanda média: média móvel dos últimos `janela_media` dias;
+      - desvio: desvio-padrão amostral da demanda diária em todo o histórico;
+      - estoque de segurança: z * desvio * raiz(prazo), z do nível de serviço;
+      - ponto de reposição: demanda média * prazo + estoque de segurança,
+        arredondados para cima.
+    Retorna (demanda média, desvio, estoque de segurança, ponto de reposição).
+    """
+    dias = matriz.shape[1]
+    demanda = matriz[:, max(dias - janela_media, 0):].mean(axis=1, dtype=np.float64)
+    desvio = matriz.std(axis=1, ddof=1, dtype=np.float64) if dias > 1 else np.zeros(matriz.shape[0])
+
+    z = NormalDist().inv_cdf(nivel_servico)
+    seguranca = np.ceil(z * desvio * math.sqrt(prazo_reposicao)).astype(np.int64)
+    ponto = np.ceil(demanda * prazo_reposicao).astype(np.int64) + seguranca
+    return demanda, desvio, seguranca, ponto
+
+
+class AnaliseEstoqueServico:
+    """Serviço de análise do estoque (classificação ABC e pontos de reposição)."""
+
+    def __init__(self, session: Session | None = None):
+        self.classificacao_repo = ClassificacaoRepositorio(session)
+        self.reposicao_repo = ReposicaoRepositorio(self.classificacao_repo.session)
+
+    def calcular_classificacao_abc(self, dias: int = 365, limite_a: float = 0.8,
+                                   limite_b: float = 0.95) -> dict:
+        """
+        Recalcula a classificação ABC de todos os produtos com as vendas dos
+        últimos `dias` dias e a grava em produto_classificacao.
+        Retorna o resumo por classe (de receita) e o tempo gasto.
+        """
+        if dias <= 0:
+            raise Exception("Quantidade de dias deve ser maior que zero")
+        if not 0 < limite_a < limite_b <= 1:
+            raise Exception("Limites devem satisfazer 0 < limite A < limite B <= 1")
+
+        inicio = time.perf_counter()
+        agora = datetime.now()
+        linhas = self.classificacao_repo.obter_vendas_por_produto(agora - timedelta(days=dias), agora)
+
+        if linhas:
+            ids, quantidades, receitas = (np.asarray(coluna) for coluna in zip(*linhas))
+        else:
+            ids = quantidades = receitas = np.zeros(0)
+        receitas = receitas.astype(np.float64)
+        quantidades = quantidades.astype(np.int64)
+
+        classes_receita, participacao, acumulada = classificar_abc(receitas, limite_a, limite_b)
+        classes_quantidade, _, _ = classificar_abc(quantidades, limite_a, limite_b)
+
+        self.classificacao_repo.substituir([
+            {
+                "id_produto": id_produto,
+                "classe_receita": classe_receita,
+                "classe_quantidade": classe_quantidade,
+                "receita": Decimal(str(round(receita, 2))),
+                "quantidade": quantidade,
+                "participacao_receita": parte,
+                "participacao_acumulada": soma,
+                "data_calculo": agora
+            }
+            for id_produto, classe_receita, classe_quantidade, receita, quantidade, parte, soma in zip(
+                ids.tolist(), classes_receita.tolist(), classes_quantidade.tolist(),
+                receitas.tolist(), quantidades.tolist(), participacao.tolist(), acumulada.tolist()
+            )
+        ])
+
+        return {
+            "produtos": len(linhas),
+            "classes": self.obter_resumo_abc(),
+            "segundos": time.perf_counter() - inicio
+        }
+
+    def obter_resumo_abc(self) -> List[dict]:
+        """Produtos, receita e quantidade por classe da última classificação."""
+        return self.classificacao_repo.obter_resumo()
+
+    def buscar_classes_produtos(self) -> Dict[int, str]:
+        """Classe por receita de cada produto ({id_produto: 'A' | 'B' | 'C'})."""
+        return self.classificacao_repo.buscar_classes()
+
+    def calcular_pontos_reposicao(self, dias_historico: int = 90, janela_media: int = 28,
+                                  prazo_reposicao: int = 7, nivel_servico: float = 0.95) -> dict:
+        """
+        Recalcula demanda, variabilidade e ponto de reposição de todos os
+        produtos com as vendas dos últimos `dias_historico` dias completos e
+        grava o resultado em produto_reposicao. prazo_reposicao é o tempo, em
+        dias, entre fazer o pedido e receber a mercadoria. Só produtos com
+        demanda na janela da média recebem ponto de reposição: os demais
+        continuam usando o limite fixo ou o da classe ABC.
+        """
+        if dias_historico < 2:
+            raise Exception("Histórico deve ter pelo menos 2 dias")
+        if not 0 < janela_media <= dias_historico:
+            raise Exception("Janela da média deve estar entre 1 e o histórico em dias")
+        if prazo_reposicao <= 0:
+            raise Exception("Prazo de reposição deve ser maior que zero")
+        if not 0.5 <= nivel_servico < 1:
+            raise Exception("Nível de serviço deve estar entre 0,5 e 1")
+
+        inicio = time.perf_counter()
+        agora = datetime.now()
+        # Dias completos: o dia de hoje ainda não terminou
+        data_fim = agora.date()
+        data_inicio = data_fim - timedelta(days=dias_historico)
+
+        ids_produto = np.asarray(self.reposicao_repo.buscar_ids_produtos(), dtype=np.int64)
+        vendas = self.reposicao_repo.obter_demanda_diaria(
+            datetime.combine(data_inicio, datetime.min.time()),
+            datetime.combine(data_fim, datetime.min.time())
+        )
+        if vendas:
+            ids_venda, datas_venda, quantidades = zip(*vendas)
+        else:
+            ids_venda = datas_venda = quantidades = ()
+
+        matriz = montar_matriz_demanda(
+            ids_produto, data_inicio, dias_historico,
+            np.asarray(ids_venda, dtype=np.int64),
+            np.asarray(datas_venda, dtype="datetime64[D]"),
+            np.asarray(quantidades, dtype=np.float32)
+        )
+        demanda, desvio, seguranca, ponto = calcular_pontos_reposicao(
+            matriz, janela_media, prazo_reposicao, nivel_servico)
+
+        com_demanda = demanda > 0
+        self.reposicao_repo.substituir([
+            {
+                "id_produto": id_produto,
+                "demanda_media": media,
+                "desvio_demanda": variacao,
+                "estoque_seguranca": minimo,
+                "ponto_reposicao": reposicao,
+                "data_calculo": agora
+            }
+            for id_produto, media, variacao, minimo, reposicao in zip(
+                ids_produto[com_demanda].tolist(), demanda[com_demanda].tolist(), desvio[com_demanda].tolist(),
+                seguranca[com_demanda].tolist(), ponto[com_demanda].tolist()
+            )
+        ])
+
+        return {
+            "produtos": int(ids_produto.size),
+            "produtos_com_demanda": int(np.count_nonzero(com_demanda)),
+            "dias_historico": dias_historico,
+            "segundos": time.perf_counter() - inicio
+        }
@@ -1,6 +1,6 @@
 import re
-from typing import Optional, List
-from src.modelos.tabelas_bd import Cliente
+from typing import Any, Optional, List
+from src.modelos.tabelas_bd import Cliente, normalizar_cpf
 from src.repositorios.repositorio_cliente import ClienteRepositorio
 
 """
@@ -32,7 +32,7 @@ class ClienteServico:
 
         cliente = Cliente(
             nome=nome.strip(),
-            cpf=cpf,
+            cpf=normalizar_cpf(cpf),
             telefone=telefone.strip() if telefone else None
         )
 
@@ -48,11 +48,23 @@ class ClienteServico:
     def buscar_todos_clientes(self) -> List[Cliente]:
         return self.cliente_repo.buscar_todos()
 
+    def buscar_clientes_paginado(self, apos: Optional[Any] = None, limite: int = 100,
+                                 ordenar_por: Optional[str] = None, decrescente: bool = False,
+                                 filtros: Optional[dict] = None) -> List[Cliente]:
+        """
+        Retorna uma página de clientes (paginação por chave), ordenada por ID ou
+        por `ordenar_por` e restrita pelos `filtros` (ver interpretar_filtros).
+        """
+        if limite <= 0:
+            raise Exception("Limite da página deve ser maior que zero")
+
+        return self.cliente_repo.buscar_pagina(apos, limite, ordenar_por, decrescente, filtros)
+
     def buscar_cliente_por_cpf(self, cpf: str) -> Optional[Cliente]:
         if not self.validar_cpf(cpf):
             raise Exception("CPF inválido")
 
-        return self.cliente_repo.buscar_por_cpf(cpf)
+        return self.cliente_repo.buscar_por_cpf(normalizar_cpf(cpf))
 
     def buscar_clientes_por_nome(self, nome: str) -> List[Cliente]:
         if not nome or nome.strip() == "":
@@ -116,5 +128,5 @@ class ClienteServico:
 
     def verificar_cpf_existente(self, cpf: str) -> bool:
         """RN04 - CPF deve ser único no sistema"""
-        cliente_existente = self.cliente_repo.buscar_por_cpf(cpf)
+        cliente_existente = self.cliente_repo.buscar_por_cpf(normalizar_cpf(cpf))
         return cliente_existente is not None
@@ -0,0 +1,166 @@
+import csv
+import time
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from src.repositorios.repositorio_venda import VendaRepositorio
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: sem ele a exportação colunar usa .npz
+    pa = None
+    pq = None
+
+"""
+Este arquivo implementa o serviço de exportação de vendas do sistema de loja de
+hardware. Percorre as vendas de um período unidas aos itens, produtos, clientes e
+funcionários com cursor no servidor, gravando bloco a bloco em CSV ou em formato
+colunar comprimido (Parquet, via pyarrow, ou .npz do NumPy quando o pyarrow não
+está instalado), de modo que o uso de memória não depende do tamanho do período.
+"""
+
+COLUNAS_EXPORTACAO = [
+    "id_venda", "data_venda", "id_funcionario", "funcionario", "id_cliente", "cliente",
+    "id_item_venda", "id_produto", "produto", "quantidade", "preco_unitario", "desconto_aplicado",
+]
+
+# Tipos das colunas no .npz (id_cliente 0 = venda sem cliente)
+TIPOS_NPZ = {
+    "id_venda": np.int64, "data_venda": "datetime64[us]", "id_funcionario": np.int64,
+    "funcionario": np.str_, "id_cliente": np.int64, "cliente": np.str_,
+    "id_item_venda": np.int64, "id_produto": np.int64, "produto": np.str_,
+    "quantidade": np.int64, "preco_unitario": np.float64, "desconto_aplicado": np.float64,
+}
+
+Progresso = Callable[[int], None]
+
+
+class ExportacaoServico:
+    """Serviço para exportação em massa do histórico de vendas."""
+
+    def __init__(self, session: Session | None = None):
+        self.venda_repo = VendaRepositorio(session)
+
+    def exportar_vendas(self, data_inicio: datetime, data_fim: datetime, caminho: str,
+                        progresso: Optional[Progresso] = None) -> dict:
+        """
+        Exporta as vendas do período no formato indicado pela extensão do arquivo
+        (.csv, .parquet ou .npz) e retorna um resumo com linhas, tempo e vazão.
+        """
+        if data_inicio > data_fim:
+            raise Exception("Data de início deve ser anterior à data de fim")
+
+        inicio = time.perf_counter()
+        extensao = caminho.lower().rsplit(".", 1)[-1]
+        if extensao == "csv":
+            linhas = self.exportar_vendas_csv(data_inicio, data_fim, caminho, progresso=progresso)
+        elif extensao == "parquet":
+            linhas = self.exportar_vendas_parquet(data_inicio, data_fim, caminho, progresso=progresso)
+        elif extensao == "npz":
+            linhas = self.exportar_vendas_npz(data_inicio, data_fim, caminho, progresso=progresso)
+        else:
+            raise Exception("Formato de exportação não suportado (use .csv, .parquet ou .npz)")
+
+        segundos = time.perf_counter() - inicio
+        return {
+            "caminho": caminho,
+            "linhas": linhas,
+            "segundos": segundos,
+            "linhas_por_segundo": linhas / segundos if segundos > 0 else 0.0
+        }
+
+    def exportar_vendas_csv(self, data_inicio: datetime, data_fim: datetime, caminho: str,
+                            tamanho_lote: int = 10000, progresso: Optional[Progresso] = None) -> int:
+        """Grava as vendas do período em CSV, um bloco por vez. Retorna o total de linhas."""
+        total = 0
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS_EXPORTACAO)
+            for bloco in self.venda_repo.iterar_linhas_exportacao(data_inicio, data_fim, tamanho_lote):
+                escritor.writerows(bloco)
+                total += len(bloco)
+                if progresso:
+                    progresso(total)
+        return total
+
+    def exportar_vendas_colunar(self, data_inicio: datetime, data_fim: datetime, caminho_base: str,
+                                progresso: Optional[Progresso] = None) -> str:
+        """
+        Grava as vendas do período em Parquet se o pyarrow estiver disponível,
+        senão em .npz. Recebe o caminho sem extensão e retorna o arquivo gerado.
+        """
+        if pq is not None:
+            caminho = f"{caminho_base}.parquet"
+            self.exportar_vendas_parquet(data_inicio, data_fim, caminho, progresso=progresso)
+        else:
+            caminho = f"{caminho_base}.npz"
+            self.exportar_vendas_npz(data_inicio, data_fim, caminho, progresso=progresso)
+        return caminho
+
+    def exportar_vendas_parquet(self, data_inicio: datetime, data_fim: datetime, caminho: str,
+                                tamanho_lote: int = 50000, progresso: Optional[Progresso] = None) -> int:
+        """Grava as vendas do período em Parquet (zstd), um row group por bloco."""
+        if pq is None:
+            raise Exception("Exportação em Parquet requer o pacote pyarrow")
+
+        esquema = pa.schema([
+            ("id_venda", pa.int64()), ("data_venda", pa.timestamp("us")),
+            ("id_funcionario", pa.int64()), ("funcionario", pa.string()),
+            ("id_cliente", pa.int64()), ("cliente", pa.string()),
+            ("id_item_venda", pa.int64()), ("id_produto", pa.int64()), ("produto", pa.string()),
+            ("quantidade", pa.int64()), ("preco_unitario", pa.decimal128(10, 2)),
+            ("desconto_aplicado", pa.decimal128(10, 2)),
+        ])
+
+        total = 0
+        with pq.ParquetWriter(caminho, esquema, compression="zstd") as escritor:
+            for bloco in self.venda_repo.iterar_linhas_exportacao(data_inicio, data_fim, tamanho_lote):
+                colunas = list(zip(*bloco))
+                escritor.write_table(pa.Table.from_arrays(
+                    [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, esquema)],
+                    schema=esquema
+                ))
+                total += len(bloco)
+                if progresso:
+                    progresso(total)
+        return total
+
+    def exportar_vendas_npz(self, data_inicio: datetime, data_fim: datetime, caminho: str,
+                            tamanho_lote: int = 50000, progresso: Optional[Progresso] = None) -> int:
+        """
+        Grava as vendas do período em um .npz comprimido. Cada bloco vira um array
+        por coluna ("coluna/000000", "coluna/000001", ...), para não acumular o
+        período inteiro em memória; use carregar_exportacao_npz para juntá-los.
+        """
+        total = 0
+        with zipfile.ZipFile(caminho, "w", compression=zipfile.ZIP_DEFLATED) as arquivo:
+            for numero, bloco in enumerate(
+                    self.venda_repo.iterar_linhas_exportacao(data_inicio, data_fim, tamanho_lote)):
+                for nome, valores in zip(COLUNAS_EXPORTACAO, zip(*bloco)):
+                    if nome == "id_cliente":
+                        valores = [v or 0 for v in valores]
+                    elif nome == "cliente":
+                        valores = [v or "" for v in valores]
+                    vetor = np.asarray(valores, dtype=TIPOS_NPZ[nome])
+                    with arquivo.open(f"{nome}/{numero:06d}.npy", "w", force_zip64=True) as saida:
+                        np.lib.format.write_array(saida, vetor, allow_pickle=False)
+                total += len(bloco)
+                if progresso:
+                    progresso(total)
+        return total
+
+
+def carregar_exportacao_npz(caminho: str) -> Dict[str, np.ndarray]:
+    """Lê um .npz gerado por exportar_vendas_npz e concatena os blocos de cada coluna."""
+    with np.load(caminho, allow_pickle=False) as dados:
+        blocos: Dict[str, List[np.ndarray]] = {}
+        for chave in sorted(dados.files):
+            nome = chave.split("/", 1)[0]
+            blocos.setdefault(nome, []).append(dados[chave])
+    return {
+        nome: np.concatenate(blocos[nome]) if nome in blocos else np.array([], dtype=TIPOS_NPZ[nome])
+        for nome in COLUNAS_EXPORTACAO
+    }
@@ -1,5 +1,5 @@
 import hashlib
-from typing import List, Optional
+from typing import Any, List, Optional
 from src.modelos.tabelas_bd import Funcionario, CargoEnum
 from src.repositorios.repositorio_funcionario import FuncionarioRepositorio
 
@@ -51,6 +51,18 @@ class FuncionarioServico:
     def buscar_todos_funcionarios(self) -> List[Funcionario]:
         return self.funcionario_repo.buscar_todos()
 
+    def buscar_funcionarios_paginado(self, apos: Optional[Any] = None, limite: int = 100,
+                                     ordenar_por: Optional[str] = None, decrescente: bool = False,
+                                     filtros: Optional[dict] = None) -> List[Funcionario]:
+        """
+        Retorna uma página de funcionários (paginação por chave), ordenada por ID ou
+        por `ordenar_por` e restrita pelos `filtros` (ver interpretar_filtros).
+        """
+        if limite <= 0:
+            raise Exception("Limite da página deve ser maior que zero")
+
+        return self.funcionario_repo.buscar_pagina(apos, limite, ordenar_por, decrescente, filtros)
+
     def buscar_funcionario_por_nome_usuario(self, nome_usuario: str) -> Optional[Funcionario]:
         if not nome_usuario or nome_usuario.strip() == "":
             return None
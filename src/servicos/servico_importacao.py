@@ -0,0 +1,280 @@
+import csv
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from src.configs.config_bd import Session as SessionLocal
+from src.repositorios.repositorio_cliente import ClienteRepositorio
+from src.repositorios.repositorio_produto import ProdutoRepositorio
+from src.modelos.tabelas_bd import normalizar_nome_produto
+
+"""
+Este arquivo implementa o serviço de importação em massa de cadastros a partir de
+arquivos CSV. O arquivo é lido em blocos; cada bloco é validado linha a linha
+(os erros são devolvidos com o número da linha, sem interromper a importação) e
+gravado com um único comando em lote e um único commit, em vez de uma consulta,
+um INSERT e um commit por registro como no cadastro pela interface.
+"""
+
+# (número da linha no arquivo, mensagem)
+ErroImportacao = Tuple[int, str]
+
+# Pesos dos dígitos verificadores do CPF
+_PESOS_DV1 = np.arange(10, 1, -1)
+_PESOS_DV2 = np.arange(11, 1, -1)
+
+
+def _ler_blocos_csv(caminho: str, tamanho_lote: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    """Lê o CSV (separado por vírgula ou ponto e vírgula) em blocos de (linha, registro)."""
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+        try:
+            formato = csv.Sniffer().sniff(amostra, delimiters=",;")
+        except csv.Error:
+            formato = csv.excel
+        leitor = csv.DictReader(arquivo, dialect=formato)
+        leitor.fieldnames = [c.strip().lower() for c in leitor.fieldnames or []]
+
+        # A linha 1 é o cabeçalho
+        numerados = ((leitor.line_num, registro) for registro in leitor)
+        while bloco := list(islice(numerados, tamanho_lote)):
+            yield bloco
+
+
+def validar_cpfs_em_lote(cpfs: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versão vetorizada de ClienteServico.validar_cpf (RN04) para muitos CPFs.
+    Os textos viram uma matriz de bytes; mantêm-se só os dígitos, e os dígitos
+    verificadores de todas as linhas são calculados de uma vez com NumPy.
+    Retorna (CPFs normalizados com 11 dígitos, máscara de válidos); CPFs
+    inválidos ficam como string vazia.
+    """
+    quantidade = len(cpfs)
+    normalizados = np.full(quantidade, "", dtype="<U11")
+    validos = np.zeros(quantidade, dtype=bool)
+    if quantidade == 0:
+        return normalizados, validos
+
+    textos = np.char.encode(np.asarray(cpfs, dtype=np.str_), "ascii", "ignore")
+    largura = textos.dtype.itemsize
+    if largura == 0:
+        return normalizados, validos
+    matriz = textos.view(np.uint8).reshape(quantidade, largura)
+
+    eh_digito = (matriz >= ord("0")) & (matriz <= ord("9"))
+    com_onze = eh_digito.sum(axis=1) == 11
+    digitos = (matriz[com_onze][eh_digito[com_onze]] - ord("0")).astype(np.int64).reshape(-1, 11)
+
+    resto = (digitos[:, :9] @ _PESOS_DV1) % 11
+    dv1 = np.where(resto < 2, 0, 11 - resto)
+    resto = (digitos[:, :10] @ _PESOS_DV2) % 11
+    dv2 = np.where(resto < 2, 0, 11 - resto)
+
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+    corretos = (digitos[:, 9] == dv1) & (digitos[:, 10] == dv2) & ~repetidos
+
+    indices = np.flatnonzero(com_onze)[corretos]
+    validos[indices] = True
+    normalizados[indices] = (digitos[corretos] + ord("0")).astype(np.uint8).view("S11").ravel().astype("<U11")
+    return normalizados, validos
+
+
+class ImportacaoServico:
+    """Serviço para importação em massa de produtos e clientes."""
+
+    def __init__(self, session: Session | None = None):
+        self.session = session or SessionLocal()
+        self.produto_repo = ProdutoRepositorio(self.session)
+        self.cliente_repo = ClienteRepositorio(self.session)
+
+    def importar_produtos_csv(self, caminho: str, tamanho_lote: int = 5000,
+                              somar_estoque: bool = False) -> dict:
+        """
+        Importa produtos de um CSV com as colunas nome, preco e, opcionalmente,
+        descricao, preco_custo e quantidade_estoque. Produtos cujo nome (sem acentos, maiúsculas
+        ou espaços extras) já existe são atualizados; os demais são inseridos.
+        Cada bloco é confirmado separadamente: um bloco que falhe no banco é
+        reportado como erro e os seguintes continuam sendo importados.
+        """
+        if tamanho_lote <= 0:
+            raise Exception("Tamanho do lote deve ser maior que zero")
+
+        inicio = time.perf_counter()
+        lidas = 0
+        gravadas = 0
+        erros: List[ErroImportacao] = []
+
+        for bloco in _ler_blocos_csv(caminho, tamanho_lote):
+            if lidas == 0:
+                faltantes = {"nome", "preco"} - set(bloco[0][1].keys())
+                if faltantes:
+                    raise Exception(f"Colunas obrigatórias ausentes no arquivo: {', '.join(sorted(faltantes))}")
+            lidas += len(bloco)
+
+            linhas, erros_bloco = self._validar_bloco_produtos(bloco, somar_estoque)
+            erros.extend(erros_bloco)
+            try:
+                gravadas += self.produto_repo.upsert_em_lote(list(linhas.values()), somar_estoque)
+            except Exception as e:
+                primeira, ultima = bloco[0][0], bloco[-1][0]
+                erros.append((primeira, f"Bloco das linhas {primeira} a {ultima} não importado: {e}"))
+
+        return {
+            "linhas_lidas": lidas,
+            "produtos_gravados": gravadas,
+            "erros": erros,
+            "segundos": time.perf_counter() - inicio
+        }
+
+    def importar_clientes_csv(self, caminho: str, tamanho_lote: int = 10000) -> dict:
+        """
+        Importa clientes de um CSV com as colunas nome, cpf e, opcionalmente,
+        telefone. CPFs são normalizados (apenas dígitos) e validados em lote;
+        CPFs repetidos no arquivo ou já cadastrados são reportados como erro.
+        A checagem no banco é uma única consulta por bloco, e blocos anteriores
+        já confirmados também são vistos por ela.
+        """
+        if tamanho_lote <= 0:
+            raise Exception("Tamanho do lote deve ser maior que zero")
+
+        inicio = time.perf_counter()
+        lidas = 0
+        gravados = 0
+        erros: List[ErroImportacao] = []
+
+        for bloco in _ler_blocos_csv(caminho, tamanho_lote):
+            if lidas == 0:
+                faltantes = {"nome", "cpf"} - set(bloco[0][1].keys())
+                if faltantes:
+                    raise Exception(f"Colunas obrigatórias ausentes no arquivo: {', '.join(sorted(faltantes))}")
+            lidas += len(bloco)
+
+            linhas, erros_bloco = self._validar_bloco_clientes(bloco)
+            try:
+                existentes = self.cliente_repo.buscar_cpfs_existentes(l["cpf"] for _, l in linhas)
+                novos = []
+                for numero, linha in linhas:
+                    if linha["cpf"] in existentes:
+                        erros_bloco.append((numero, "CPF já cadastrado no sistema"))
+                    else:
+                        novos.append(linha)
+                gravados += self.cliente_repo.inserir_em_lote(novos)
+            except Exception as e:
+                primeira, ultima = bloco[0][0], bloco[-1][0]
+                erros_bloco.append((primeira, f"Bloco das linhas {primeira} a {ultima} não importado: {e}"))
+            erros.extend(sorted(erros_bloco))
+
+        return {
+            "linhas_lidas": lidas,
+            "clientes_gravados": gravados,
+            "erros": erros,
+            "segundos": time.perf_counter() - inicio
+        }
+
+    @staticmethod
+    def _validar_bloco_clientes(bloco: List[Tuple[int, Dict[str, str]]]) -> Tuple[List[Tuple[int, dict]], List[ErroImportacao]]:
+        """
+        Valida nome, telefone e CPF de um bloco (RN04). Retorna as linhas válidas
+        com o número da linha no arquivo e os erros; de um CPF repetido dentro do
+        bloco, só a primeira ocorrência é aceita.
+        """
+        erros: List[ErroImportacao] = []
+        cpfs, validos = validar_cpfs_em_lote([registro.get("cpf") or "" for _, registro in bloco])
+
+        linhas: List[Tuple[int, dict]] = []
+        vistos = set()
+        for (numero, registro), cpf, valido in zip(bloco, cpfs.tolist(), validos.tolist()):
+            nome = (registro.get("nome") or "").strip()
+            telefone = (registro.get("telefone") or "").strip()
+            if not nome:
+                erros.append((numero, "Nome do cliente não pode ser vazio"))
+            elif len(nome) > 255:
+                erros.append((numero, "Nome do cliente excede 255 caracteres"))
+            elif len(telefone) > 15:
+                erros.append((numero, "Telefone excede 15 caracteres"))
+            elif not valido:
+                erros.append((numero, "CPF inválido"))
+            elif cpf in vistos:
+                erros.append((numero, "CPF repetido no arquivo"))
+            else:
+                vistos.add(cpf)
+                linhas.append((numero, {
+                    "nome": nome,
+                    "nome_normalizado": normalizar_nome_produto(nome),
+                    "cpf": cpf,
+                    "telefone": telefone or None
+                }))
+
+        return linhas, erros
+
+    @staticmethod
+    def _validar_bloco_produtos(bloco: List[Tuple[int, Dict[str, str]]],
+                                somar_estoque: bool = False) -> Tuple[Dict[str, dict], List[ErroImportacao]]:
+        """
+        Aplica as mesmas regras de criar_produto (RN04) a um bloco. Retorna as
+        linhas válidas por nome normalizado e os erros encontrados. Se o nome se
+        repete no bloco, o resultado é o de aplicar as linhas em ordem: vale a
+        última ocorrência e, com somar_estoque, as quantidades de todas somam.
+        """
+        validas: Dict[str, dict] = {}
+        erros: List[ErroImportacao] = []
+
+        for numero, registro in bloco:
+            nome = (registro.get("nome") or "").strip()
+            descricao = (registro.get("descricao") or "").strip()
+            if not nome:
+                erros.append((numero, "Nome do produto não pode ser vazio"))
+                continue
+            if len(nome) > 255:
+                erros.append((numero, "Nome do produto excede 255 caracteres"))
+                continue
+
+            try:
+                preco = Decimal((registro.get("preco") or "").strip().replace(",", "."))
+            except InvalidOperation:
+                erros.append((numero, f"Preço inválido: '{registro.get('preco')}'"))
+                continue
+            if not preco.is_finite() or preco <= 0:
+                erros.append((numero, "Preço deve ser maior que zero"))
+                continue
+            if preco >= Decimal("100000000"):
+                erros.append((numero, "Preço excede o limite de 99.999.999,99"))
+                continue
+
+            custo_texto = (registro.get("preco_custo") or "").strip()
+            try:
+                preco_custo = Decimal(custo_texto.replace(",", ".")) if custo_texto else None
+            except InvalidOperation:
+                erros.append((numero, f"Preço de custo inválido: '{custo_texto}'"))
+                continue
+            if preco_custo is not None and (not preco_custo.is_finite() or preco_custo < 0
+                                            or preco_custo >= Decimal("100000000")):
+                erros.append((numero, "Preço de custo deve estar entre 0 e 99.999.999,99"))
+                continue
+
+            estoque: Optional[str] = (registro.get("quantidade_estoque") or "").strip()
+            try:
+                quantidade = int(estoque) if estoque else 0
+            except ValueError:
+                erros.append((numero, f"Quantidade em estoque inválida: '{estoque}'"))
+                continue
+            if quantidade < 0:
+                erros.append((numero, "Quantidade em estoque não pode ser negativa"))
+                continue
+
+            chave = normalizar_nome_produto(nome)
+            if somar_estoque and chave in validas:
+                quantidade += validas[chave]["quantidade_estoque"]
+            validas[chave] = {
+                "nome": nome,
+                "nome_normalizado": chave,
+                "descricao": descricao,
+                "preco": preco.quantize(Decimal("0.01")),
+                "preco_custo": preco_custo.quantize(Decimal("0.01")) if preco_custo is not None else None,
+                "quantidade_estoque": quantidade
+            }
+
+        return validas, erros
@@ -0,0 +1,108 @@
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from src.configs.config_bd import Session as SessionLocal
+from src.repositorios.repositorio_venda import VendaRepositorio
+
+"""
+Este arquivo implementa o serviço de verificação de integridade dos dados
+desnormalizados. Os totais de cada venda (valor_total e desconto_total) são
+cópias da soma dos seus itens, mantidas por vários caminhos de escrita; a
+verificação compara as duas coisas para um período inteiro com uma consulta
+agregada por janela de dias, em vez de uma consulta por venda, e pode corrigir
+as divergências encontradas com um UPDATE em lote por janela.
+"""
+
+
+def _decimal(valor) -> Decimal:
+    return Decimal(str(valor if valor is not None else 0)).quantize(Decimal("0.01"))
+
+
+class IntegridadeServico:
+    """Serviço para verificação e correção de totais desnormalizados."""
+
+    def __init__(self, session: Session | None = None):
+        self.session = session or SessionLocal()
+        self.venda_repo = VendaRepositorio(self.session)
+
+    def verificar_totais_vendas(self, data_inicio: Optional[date] = None, data_fim: Optional[date] = None,
+                                corrigir: bool = False, dias_por_lote: int = 31,
+                                limite_divergencias: int = 100) -> dict:
+        """
+        Compara os totais gravados das vendas entre data_inicio e data_fim
+        (inclusive; None = desde a primeira ou até a última venda) com a soma
+        dos itens, em janelas de `dias_por_lote` dias para limitar a memória e
+        a duração de cada transação. Com corrigir=True, grava os totais
+        recalculados de cada janela antes de passar à próxima.
+        Retorna contagens, a diferença acumulada (gravado - itens) e até
+        `limite_divergencias` vendas divergentes como exemplo.
+        """
+        if dias_por_lote <= 0:
+            raise Exception("Dias por lote deve ser maior que zero")
+        if limite_divergencias < 0:
+            raise Exception("Limite de divergências não pode ser negativo")
+
+        inicio = time.perf_counter()
+        relatorio = {
+            "vendas_verificadas": 0,
+            "vendas_divergentes": 0,
+            "vendas_corrigidas": 0,
+            "diferenca_valor": Decimal("0.00"),
+            "diferenca_desconto": Decimal("0.00"),
+            "divergencias": [],
+            "segundos": 0.0
+        }
+
+        if data_inicio is None or data_fim is None:
+            primeira, ultima = self.venda_repo.obter_intervalo_datas()
+            if primeira is None:
+                relatorio["segundos"] = time.perf_counter() - inicio
+                return relatorio
+            data_inicio = data_inicio or primeira.date()
+            data_fim = data_fim or ultima.date()
+        if data_inicio > data_fim:
+            raise Exception("Data de início deve ser anterior à data de fim")
+
+        divergencias: List[dict] = relatorio["divergencias"]
+        dia = data_inicio
+        while dia <= data_fim:
+            proximo = min(dia + timedelta(days=dias_por_lote), data_fim + timedelta(days=1))
+            quantidade, divergentes = self.venda_repo.verificar_totais(
+                datetime.combine(dia, datetime.min.time()),
+                datetime.combine(proximo, datetime.min.time())
+            )
+
+            correcoes = []
+            for linha in divergentes:
+                valor, desconto = _decimal(linha.valor_itens), _decimal(linha.desconto_itens)
+                relatorio["diferenca_valor"] += _decimal(linha.valor_total) - valor
+                relatorio["diferenca_desconto"] += _decimal(linha.desconto_total) - desconto
+                correcoes.append({
+                    "id_venda": linha.id_venda,
+                    "data_venda": linha.data_venda,
+                    "valor_total": valor,
+                    "desconto_total": desconto
+                })
+                if len(divergencias) < limite_divergencias:
+                    divergencias.append({
+                        "id_venda": linha.id_venda,
+                        "data_venda": linha.data_venda,
+                        "valor_total": _decimal(linha.valor_total),
+                        "desconto_total": _decimal(linha.desconto_total),
+                        "valor_total_itens": valor,
+                        "desconto_total_itens": desconto
+                    })
+
+            relatorio["vendas_verificadas"] += quantidade
+            relatorio["vendas_divergentes"] += len(divergentes)
+            if corrigir:
+                relatorio["vendas_corrigidas"] += self.venda_repo.atualizar_totais_em_lote(correcoes)
+            else:
+                # Encerra a leitura da janela para não segurar a transação aberta
+                self.session.rollback()
+            dia = proximo
+
+        relatorio["segundos"] = time.perf_counter() - inicio
+        return relatorio
@@ -1,4 +1,6 @@
 from typing import List, Optional
+from sqlalchemy.orm import Session
+from src.configs.config_bd import Session as SessionLocal
 from src.servicos.servico_produto import ProdutoServico
 from src.repositorios.repositorio_itens_venda import ItensVendaRepositorio
 from src.modelos.tabelas_bd import ItensVenda
@@ -15,15 +17,19 @@ a lógica de negócio e o acesso aos dados da aplicação.
 class ItensVendaServico:
     """Serviço para regras de negócio da entidade ItensVenda."""
 
-    def __init__(self):
-        self.itens_venda_repo = ItensVendaRepositorio()
-        self.produto_servico = ProdutoServico()
+    def __init__(self, session: Session | None = None):
+        # Uma única sessão compartilhada pelos repositórios do serviço
+        self.session = session or SessionLocal()
+        self.itens_venda_repo = ItensVendaRepositorio(self.session)
+        self.produto_servico = ProdutoServico(self.session)
 
     def criar_item_venda(self, id_venda: int, id_produto: int, quantidade: int,
                          desconto_aplicado: float = 0.0) -> ItensVenda:
 
-        preco_unitario = self.produto_servico.buscar_produto_por_id(
-            id_produto).preco
+        produto = self.produto_servico.buscar_produto_catalogo(id_produto)
+        if not produto:
+            raise Exception(f"Produto com ID {id_produto} não encontrado")
+        preco_unitario = produto.preco
 
         # Validações
         if quantidade <= 0:
@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from sqlalchemy.orm import Session
+from src.repositorios.cache_catalogo import ProdutoCatalogo
 from src.repositorios.repositorio_produto import ProdutoRepositorio
+from src.repositorios.repositorio_relatorio import RelatorioRepositorio
 from src.modelos.tabelas_bd import Produto
 
 """
@@ -14,13 +17,14 @@ abstração entre a lógica de negócio e o acesso aos dados da aplicação.
 class ProdutoServico:
     """Serviço para regras de negócio da entidade Produto."""
 
-    def __init__(self):
-        self.produto_repo = ProdutoRepositorio()
+    def __init__(self, session: Session | None = None):
+        self.produto_repo = ProdutoRepositorio(session)
 
-    def criar_produto(self, nome: str, descricao: str, quantidade_estoque: int, preco: float) -> Produto:
+    def criar_produto(self, nome: str, descricao: str, quantidade_estoque: int, preco: float,
+                      preco_custo: Optional[float] = None) -> Produto:
         """
         Cria um novo produto no sistema.
-        Validações: nome não pode ser vazio, quantidade >= 0, preço > 0
+        Validações: nome não pode ser vazio, quantidade >= 0, preço > 0, custo >= 0
         """
         # Validação de dados (RN04)
         if not nome or nome.strip() == "":
@@ -33,9 +37,11 @@ class ProdutoServico:
         if preco <= 0:
             raise Exception("Preço deve ser maior que zero")
 
-        # Verifica se já existe produto com mesmo nome
-        produtos_existentes = self.produto_repo.buscar_por_nome(nome.strip())
-        if produtos_existentes:
+        if preco_custo is not None and preco_custo < 0:
+            raise Exception("Preço de custo não pode ser negativo")
+
+        # Verifica se já existe produto com mesmo nome (consulta indexada)
+        if self.produto_repo.verificar_nome_existe(nome.strip()):
             raise Exception(
                 f"Já existe um produto com o nome '{nome}'")
 
@@ -44,7 +50,8 @@ class ProdutoServico:
             nome=nome.strip(),
             descricao=descricao.strip() if descricao else "",
             quantidade_estoque=quantidade_estoque,
-            preco=preco
+            preco=preco,
+            preco_custo=preco_custo
         )
 
         return self.produto_repo.salvar(produto)
@@ -57,19 +64,47 @@ class ProdutoServico:
 
         return self.produto_repo.buscar_por_id(id_produto)
 
+    def buscar_produto_catalogo(self, id_produto: int) -> Optional[ProdutoCatalogo]:
+        """
+        Busca os dados de um produto pelo cache do catálogo, sem ir ao banco
+        quando já conhecido. Indicado para exibição e preços em caminhos quentes.
+        """
+        if id_produto <= 0:
+            raise Exception(
+                "ID do produto deve ser maior que zero")
+
+        return self.produto_repo.buscar_catalogo_por_id(id_produto)
+
+    def obter_estatisticas_cache_catalogo(self) -> dict:
+        """Retorna acertos, falhas e ocupação do cache do catálogo."""
+        return self.produto_repo.obter_estatisticas_cache()
+
     def buscar_todos_produtos(self) -> List[Produto]:
         """Retorna todos os produtos cadastrados."""
         return self.produto_repo.buscar_todos()
 
-    def buscar_produtos_por_nome(self, nome: str) -> List[Produto]:
-        """Busca produtos por nome (RF08 - Busca de Produtos)."""
+    def buscar_produtos_paginado(self, apos: Optional[Any] = None, limite: int = 100,
+                                 ordenar_por: Optional[str] = None, decrescente: bool = False,
+                                 filtros: Optional[dict] = None) -> List[Produto]:
+        """
+        Retorna uma página de produtos (paginação por chave), ordenada por ID ou
+        por `ordenar_por` e restrita pelos `filtros` (ver interpretar_filtros).
+        """
+        if limite <= 0:
+            raise Exception("Limite da página deve ser maior que zero")
+
+        return self.produto_repo.buscar_pagina(apos, limite, ordenar_por, decrescente, filtros)
+
+    def buscar_produtos_por_nome(self, nome: str, limite: Optional[int] = None) -> List[Produto]:
+        """Busca produtos por nome, ordenados por relevância (RF08 - Busca de Produtos)."""
         if not nome or nome.strip() == "":
             return []
 
-        return self.produto_repo.buscar_por_nome(nome.strip())
+        return self.produto_repo.buscar_por_nome(nome.strip(), limite)
 
     def atualizar_produto(self, id_produto: int, nome: str = None, descricao: str = None,
-                          quantidade_estoque: int = None, preco: float = None) -> Produto:
+                          quantidade_estoque: int = None, preco: float = None,
+                          preco_custo: float = None) -> Produto:
         """
         Atualiza informações de um produto existente.
         Apenas gerentes podem editar produtos (RN01).
@@ -87,9 +122,7 @@ class ProdutoServico:
                     "Nome do produto não pode ser vazio")
 
             # Verifica se já existe outro produto com mesmo nome
-            produtos_existentes = self.produto_repo.buscar_por_nome(
-                nome.strip())
-            if produtos_existentes and produtos_existentes[0].id_produto != id_produto:
+            if self.produto_repo.verificar_nome_existe(nome.strip(), id_produto):
                 raise Exception(
                     f"Já existe outro produto com o nome '{nome}'")
 
@@ -109,6 +142,11 @@ class ProdutoServico:
                 raise Exception("Preço deve ser maior que zero")
             produto.preco = preco
 
+        if preco_custo is not None:
+            if preco_custo < 0:
+                raise Exception("Preço de custo não pode ser negativo")
+            produto.preco_custo = preco_custo
+
         produto.data_atualizacao = datetime.now()
         return self.produto_repo.atualizar(produto)
 
@@ -168,24 +206,36 @@ class ProdutoServico:
             raise Exception(
                 "Quantidade a reduzir deve ser maior que zero")
 
+        # Verificação e baixa em um único UPDATE condicional (RN03)
+        if self.produto_repo.reduzir_estoque(id_produto, quantidade):
+            return True
+
+        # Falhou: consulta apenas para explicar o motivo
         produto = self.produto_repo.buscar_por_id(id_produto)
         if not produto:
             raise Exception(
                 f"Produto com ID {id_produto} não encontrado")
 
-        # Verifica se há estoque suficiente (RN03)
-        if produto.quantidade_estoque < quantidade:
-            raise Exception(
-                f"Estoque insuficiente. Disponível: {produto.quantidade_estoque}, "
-                f"Solicitado: {quantidade}"
-            )
+        raise Exception(
+            f"Estoque insuficiente. Disponível: {produto.quantidade_estoque}, "
+            f"Solicitado: {quantidade}"
+        )
 
-        # Reduz o estoque
-        produto.quantidade_estoque -= quantidade
-        produto.data_atualizacao = datetime.now()
+    def reduzir_estoque_em_lote(self, quantidades: Dict[int, int]) -> bool:
+        """
+        Reduz o estoque de todos os produtos de um carrinho ({id_produto: quantidade})
+        em uma única transação: ou todas as baixas são aplicadas, ou nenhuma (RN03).
+        """
+        for id_produto, quantidade in quantidades.items():
+            if quantidade <= 0:
+                raise Exception(
+                    f"Quantidade a reduzir do produto {id_produto} deve ser maior que zero")
 
-        produto_atualizado = self.produto_repo.atualizar(produto)
-        return produto_atualizado is not None
+        if not self.produto_repo.reduzir_estoque_em_lote(quantidades):
+            raise Exception(
+                "Estoque insuficiente para um ou mais produtos do carrinho")
+
+        return True
 
     def adicionar_estoque(self, id_produto: int, quantidade: int) -> bool:
         """
@@ -196,40 +246,42 @@ class ProdutoServico:
             raise Exception(
                 "Quantidade a adicionar deve ser maior que zero")
 
-        produto = self.produto_repo.buscar_por_id(id_produto)
-        if not produto:
+        # Soma feita pelo banco em um único UPDATE: reposições simultâneas não se perdem
+        if not self.produto_repo.aumentar_estoque(id_produto, quantidade):
             raise Exception(
                 f"Produto com ID {id_produto} não encontrado")
 
-        produto.quantidade_estoque += quantidade
-        produto.data_atualizacao = datetime.now()
-
-        produto_atualizado = self.produto_repo.atualizar(produto)
-        return produto_atualizado is not None
+        return True
 
-    def buscar_produtos_em_falta(self, limite_minimo: int = 5) -> List[Produto]:
+    def buscar_produtos_em_falta(self, limite_minimo: int = 5,
+                                 limites_por_classe: Optional[Dict[str, int]] = None,
+                                 usar_ponto_reposicao: bool = True) -> List[Produto]:
         """
-        Retorna produtos com estoque baixo para relatórios (RF04).
+        Retorna produtos com estoque baixo para relatórios (RF04): estoque no
+        ponto de reposição calculado ou abaixo dele (AnaliseEstoqueServico).
+        Produtos ainda sem ponto calculado usam o mínimo da sua classe ABC, se
+        limites_por_classe for informado (ex.: {'A': 20, 'B': 10}), ou limite_minimo.
         """
-        todos_produtos = self.produto_repo.buscar_todos()
-        return [p for p in todos_produtos if p.quantidade_estoque <= limite_minimo]
+        if limites_por_classe:
+            invalidas = set(limites_por_classe) - {"A", "B", "C"}
+            if invalidas:
+                raise Exception(f"Classes ABC inválidas: {', '.join(sorted(invalidas))}")
+            if any(minimo < 0 for minimo in limites_por_classe.values()):
+                raise Exception("Limite mínimo de estoque não pode ser negativo")
+
+        return self.produto_repo.buscar_com_estoque_baixo(limite_minimo, limites_por_classe, usar_ponto_reposicao)
 
     def gerar_relatorio_estoque(self) -> dict:
         """
-        Gera relatório básico de estoque (RF04).
+        Gera relatório básico de estoque (RF04), com uma única consulta agregada.
         """
-        produtos = self.produto_repo.buscar_todos()
-
-        total_produtos = len(produtos)
-        total_itens_estoque = sum(p.quantidade_estoque for p in produtos)
-        valor_total_estoque = sum(
-            p.quantidade_estoque * p.preco for p in produtos)
-        produtos_em_falta = len(self.buscar_produtos_em_falta())
+        estoque = RelatorioRepositorio(self.produto_repo.session).valorizacao_estoque()
 
         return {
-            "total_produtos_cadastrados": total_produtos,
-            "total_itens_em_estoque": total_itens_estoque,
-            "valor_total_estoque": valor_total_estoque,
-            "produtos_com_estoque_baixo": produtos_em_falta,
+            "total_produtos_cadastrados": estoque["total_produtos"],
+            "total_itens_em_estoque": estoque["total_itens"],
+            "valor_total_estoque": estoque["valor_venda"],
+            "valor_custo_estoque": estoque["valor_custo"],
+            "produtos_com_estoque_baixo": estoque["produtos_estoque_baixo"],
             "data_relatorio": datetime.now().isoformat()
         }
@@ -1,8 +1,84 @@
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from src.repositorios.repositorio_relatorio import RelatorioRepositorio
+from src.repositorios.sql_portavel import GRANULARIDADES
+
 """
 Este arquivo implementa os serviços de relatórios para o sistema de loja de hardware,
 fornecendo funcionalidades de consulta e análise de dados. Centraliza a geração
 de relatórios de vendas, estoque, clientes e performance, aplicando filtros
-e cálculos específicos para apoiar a tomada de decisões gerenciais.
+e cálculos específicos para apoiar a tomada de decisões gerenciais. Todas as
+agregações são feitas no banco pelo RelatorioRepositorio.
 """
 
-# TODO: Implementar os serviços de relatórios com as consultas e análises necessárias
+
+class RelatorioServico:
+    """Serviço para relatórios gerenciais (RF04)."""
+
+    def __init__(self, session: Session | None = None):
+        self.relatorio_repo = RelatorioRepositorio(session)
+
+    def vendas_por_periodo(self, data_inicio: date, data_fim: date, granularidade: str = "dia",
+                           id_funcionario: Optional[int] = None) -> List[dict]:
+        """Vendas agrupadas por dia, semana ou mês."""
+        data_inicio, data_fim = self._validar_periodo(data_inicio, data_fim)
+        if granularidade not in GRANULARIDADES:
+            raise Exception(f"Agrupamento deve ser um de: {', '.join(GRANULARIDADES)}")
+
+        return self.relatorio_repo.vendas_por_periodo(data_inicio, data_fim, granularidade, id_funcionario)
+
+    def vendas_por_funcionario(self, data_inicio: date, data_fim: date) -> List[dict]:
+        """Ranking de vendas por funcionário no período."""
+        data_inicio, data_fim = self._validar_periodo(data_inicio, data_fim)
+        return self.relatorio_repo.vendas_por_funcionario(data_inicio, data_fim)
+
+    def vendas_por_cliente(self, data_inicio: date, data_fim: date, limite: Optional[int] = None) -> List[dict]:
+        """Ranking de compras por cliente cadastrado no período."""
+        data_inicio, data_fim = self._validar_periodo(data_inicio, data_fim)
+        self._validar_limite(limite)
+        return self.relatorio_repo.vendas_por_cliente(data_inicio, data_fim, limite)
+
+    def vendas_por_produto(self, data_inicio: date, data_fim: date, limite: Optional[int] = None) -> List[dict]:
+        """Quantidade, receita e margem por produto no período."""
+        data_inicio, data_fim = self._validar_periodo(data_inicio, data_fim)
+        self._validar_limite(limite)
+        return self.relatorio_repo.vendas_por_produto(data_inicio, data_fim, limite)
+
+    def margem_periodo(self, data_inicio: date, data_fim: date) -> dict:
+        """Receita, custo e margem totais do período."""
+        data_inicio, data_fim = self._validar_periodo(data_inicio, data_fim)
+        return self.relatorio_repo.margem_periodo(data_inicio, data_fim)
+
+    def valorizacao_estoque(self, limite_minimo: int = 5) -> dict:
+        """
+        Valor do estoque a preço de venda e de custo. `limite_minimo` é o limite
+        de estoque baixo dos produtos sem ponto de reposição calculado.
+        """
+        if limite_minimo < 0:
+            raise Exception("Limite mínimo de estoque não pode ser negativo")
+
+        relatorio = self.relatorio_repo.valorizacao_estoque(limite_minimo)
+        relatorio["data_relatorio"] = datetime.now().isoformat()
+        return relatorio
+
+    def obter_estatisticas_cache(self) -> dict:
+        """Acertos, falhas, expirações e invalidações do cache de relatórios."""
+        return self.relatorio_repo.obter_estatisticas_cache()
+
+    @staticmethod
+    def _validar_periodo(data_inicio: date, data_fim: date):
+        # Aceita datetime, mas os relatórios trabalham com dias inteiros
+        if isinstance(data_inicio, datetime):
+            data_inicio = data_inicio.date()
+        if isinstance(data_fim, datetime):
+            data_fim = data_fim.date()
+
+        if data_inicio > data_fim:
+            raise Exception("Data de início deve ser anterior à data de fim")
+        return data_inicio, data_fim
+
+    @staticmethod
+    def _validar_limite(limite: Optional[int]):
+        if limite is not None and limite <= 0:
+            raise Exception("Limite deve ser maior que zero")
@@ -1,10 +1,15 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.configs.config_bd import Session as SessionLocal
 from src.modelos.tabelas_bd import Venda, ItensVenda
 from src.servicos.servico_produto import ProdutoServico
+from src.repositorios.repositorio_contador_produto import ContadorProdutoRepositorio
 from src.repositorios.repositorio_itens_venda import ItensVendaRepositorio
+from src.repositorios.repositorio_resumo_venda import ResumoVendaRepositorio
 from src.repositorios.repositorio_venda import VendaRepositorio
+from src.repositorios.unidade_de_trabalho import UnidadeDeTrabalho
 
 """
 Este arquivo implementa o serviço para operações de negócio da entidade Venda,
@@ -18,10 +23,15 @@ de negócio e o acesso aos dados da aplicação.
 class VendaServico:
     """Serviço para regras de negócio da entidade Venda."""
 
-    def __init__(self):
-        self.venda_repo = VendaRepositorio()
-        self.itens_venda_repo = ItensVendaRepositorio()
-        self.produto_servico = ProdutoServico()
+    def __init__(self, session: Session | None = None):
+        # Uma única sessão compartilhada pelos repositórios do serviço; as
+        # operações de escrita rodam em uma UnidadeDeTrabalho sobre ela.
+        self.session = session or SessionLocal()
+        self.venda_repo = VendaRepositorio(self.session)
+        self.itens_venda_repo = ItensVendaRepositorio(self.session)
+        self.resumo_repo = ResumoVendaRepositorio(self.session)
+        self.contador_repo = ContadorProdutoRepositorio(self.session)
+        self.produto_servico = ProdutoServico(self.session)
 
     def criar_venda(self, id_funcionario: int, id_cliente: int = None, persistir: bool = True) -> Venda:
         if id_funcionario <= 0:
@@ -33,7 +43,90 @@ class VendaServico:
             data_venda=datetime.now()
         )
 
-        return self.venda_repo.salvar(venda) if persistir else venda
+        if not persistir:
+            return venda
+
+        with UnidadeDeTrabalho(self.session):
+            venda = self.venda_repo.salvar(venda)
+            self._registrar_no_resumo(venda, quantidade_vendas=1)
+
+        return venda
+
+    def concluir_compra(self, id_funcionario: int, carrinho: Dict[int, int],
+                        id_cliente: Optional[int] = None) -> Venda:
+        """
+        RF13 - Conclui a compra de um carrinho inteiro ({id_produto: quantidade})
+        em uma única transação: grava a venda, insere todos os itens em lote,
+        baixa o estoque de todas as linhas e registra os totais calculados em memória.
+        """
+        if id_funcionario <= 0:
+            raise Exception("ID do funcionário deve ser maior que zero")
+
+        if not carrinho:
+            raise Exception("Carrinho vazio")
+
+        for id_produto, quantidade in carrinho.items():
+            if quantidade <= 0:
+                raise Exception(
+                    f"Quantidade do produto {id_produto} deve ser maior que zero")
+
+        # Desconto automático para clientes cadastrados (RN02)
+        percentual_desconto = Decimal("5") if id_cliente else Decimal("0")
+
+        with UnidadeDeTrabalho(self.session):
+            produtos = {
+                p.id_produto: p
+                for p in self.produto_servico.produto_repo.buscar_por_ids(carrinho.keys())
+            }
+            faltantes = [i for i in carrinho if i not in produtos]
+            if faltantes:
+                raise Exception(f"Produto(s) não encontrado(s): {faltantes}")
+
+            linhas = []
+            valor_total = Decimal("0.00")
+            desconto_total = Decimal("0.00")
+            for id_produto, quantidade in carrinho.items():
+                preco_unitario = Decimal(produtos[id_produto].preco)
+                valor_item = preco_unitario * quantidade
+                desconto = (valor_item * percentual_desconto / 100).quantize(Decimal("0.01"))
+
+                valor_total += valor_item - desconto
+                desconto_total += desconto
+                linhas.append({
+                    "id_produto": id_produto,
+                    "quantidade": quantidade,
+                    "preco_unitario": preco_unitario,
+                    "desconto_aplicado": desconto
+                })
+
+            venda = self.venda_repo.salvar(Venda(
+                id_funcionario=id_funcionario,
+                id_cliente=id_cliente,
+                data_venda=datetime.now(),
+                valor_total=valor_total,
+                desconto_total=desconto_total
+            ))
+
+            for linha in linhas:
+                linha["id_venda"] = venda.id_venda
+            self.itens_venda_repo.inserir_em_lote(linhas)
+
+            # Baixa de estoque de todas as linhas; aborta tudo se faltar saldo (RN03)
+            self.produto_servico.reduzir_estoque_em_lote(carrinho)
+
+            self._registrar_no_resumo(
+                venda,
+                quantidade_vendas=1,
+                valor_bruto=valor_total + desconto_total,
+                desconto_total=desconto_total,
+                quantidade_itens=sum(carrinho.values())
+            )
+            self._registrar_nos_contadores(venda, (
+                (l["id_produto"], l["quantidade"], l["preco_unitario"] * l["quantidade"] - l["desconto_aplicado"])
+                for l in linhas
+            ))
+
+        return venda
 
     def buscar_venda_por_id(self, id_venda: int) -> Optional[Venda]:
         if id_venda <= 0:
@@ -85,16 +178,28 @@ class VendaServico:
             raise Exception(
                 f"Venda com ID {id_venda} não encontrada")
 
-        # Retorna produtos ao estoque
-        itens = self.itens_venda_repo.buscar_por_venda(id_venda)
-        for item in itens:
-            produto = self.produto_servico.buscar_produto_por_id(
-                item.id_produto)
-            if produto:
-                produto.quantidade_estoque += item.quantidade
-                self.produto_servico.produto_repo.atualizar(produto)
-
-        return self.venda_repo.deletar(id_venda)
+        with UnidadeDeTrabalho(self.session):
+            # Retorna produtos ao estoque
+            itens = self.itens_venda_repo.buscar_por_venda(id_venda)
+            for item in itens:
+                self.produto_servico.produto_repo.aumentar_estoque(
+                    item.id_produto, item.quantidade)
+
+            # Estorna a venda e seus itens do resumo diário
+            self._registrar_no_resumo(
+                venda,
+                quantidade_vendas=-1,
+                valor_bruto=-sum(Decimal(str(i.preco_unitario)) * i.quantidade for i in itens),
+                desconto_total=-sum(Decimal(str(i.desconto_aplicado or 0)) for i in itens),
+                quantidade_itens=-sum(i.quantidade for i in itens)
+            )
+            self._registrar_nos_contadores(venda, (
+                (i.id_produto, i.quantidade,
+                 Decimal(str(i.preco_unitario)) * i.quantidade - Decimal(str(i.desconto_aplicado or 0)))
+                for i in itens
+            ), sinal=-1)
+
+            return self.venda_repo.deletar(id_venda)
 
     def calcular_valor_total_venda(self, id_venda: int) -> float:
         """Calcula o valor total da venda baseado nos itens"""
@@ -105,17 +210,16 @@ class VendaServico:
                              percentual_desconto: float = 0.0) -> ItensVenda:
         """RF09 - Adicionar Itens ao Carrinho"""
 
+        if quantidade <= 0:
+            raise Exception("Quantidade solicitada deve ser maior que zero")
+
         # Verifica se a venda existe
         venda = self.venda_repo.buscar_por_id(id_venda)
         if not venda:
             raise Exception(f"Venda com ID {id_venda} não encontrada")
 
-        # Verifica estoque disponível (RN03)
-        if not self.produto_servico.verificar_estoque_disponivel(id_produto, quantidade):
-            raise Exception(
-                "Estoque insuficiente para a quantidade solicitada")
-
-        produto = self.produto_servico.buscar_produto_por_id(id_produto)
+        # Preço vem do cache do catálogo; o estoque é verificado pela baixa atômica (RN03)
+        produto = self.produto_servico.buscar_produto_catalogo(id_produto)
         if not produto:
             raise Exception(f"Produto com ID {id_produto} não encontrado")
 
@@ -127,26 +231,35 @@ class VendaServico:
         if percentual_desconto < 0 or percentual_desconto > 10:
             raise Exception("Percentual de desconto deve estar entre 0% e 10%")
 
-        # Calcula o valor do desconto
-        valor_item = float(produto.preco) * quantidade
-        desconto_aplicado = valor_item * (percentual_desconto / 100)
+        # Calcula o valor do desconto (em centavos, como será gravado)
+        valor_item = produto.preco * quantidade
+        desconto_aplicado = (valor_item * Decimal(str(percentual_desconto)) / 100).quantize(Decimal("0.01"))
 
         item_venda = ItensVenda(
             id_venda=id_venda,
             id_produto=id_produto,
             quantidade=quantidade,
-            preco_unitario=float(produto.preco),
+            preco_unitario=produto.preco,
             desconto_aplicado=desconto_aplicado
         )
 
-        # Salva o item
-        item_salvo = self.itens_venda_repo.salvar(item_venda)
+        # Item, totais e estoque são confirmados juntos, em uma só transação
+        with UnidadeDeTrabalho(self.session):
+            item_salvo = self.itens_venda_repo.salvar(item_venda)
+
+            # Soma a linha aos totais da venda, sem recarregar os demais itens
+            self.venda_repo.somar_aos_totais(id_venda, valor_item - desconto_aplicado, desconto_aplicado)
 
-        # Atualiza os totais da venda
-        self._sincronizar_totais_venda(id_venda)
+            # Reduz o estoque do produto
+            self.produto_servico.reduzir_estoque(id_produto, quantidade)
 
-        # Reduz o estoque do produto
-        self.produto_servico.reduzir_estoque(id_produto, quantidade)
+            self._registrar_no_resumo(
+                venda,
+                valor_bruto=valor_item,
+                desconto_total=desconto_aplicado,
+                quantidade_itens=quantidade
+            )
+            self._registrar_nos_contadores(venda, [(id_produto, quantidade, valor_item - desconto_aplicado)])
 
         return item_salvo
 
@@ -158,34 +271,88 @@ class VendaServico:
                 f"Item de venda com ID {id_item_venda} não encontrado")
 
         id_venda = item.id_venda
-
-        # Remove o item
-        sucesso = self.itens_venda_repo.deletar(id_item_venda)
-
-        if sucesso:
-            self.produto_servico.produto_repo.aumentar_estoque(
-                item.id_produto, item.quantidade)
-
-            self._sincronizar_totais_venda(id_venda)
+        id_produto = item.id_produto
+        quantidade = item.quantidade
+        valor_item = Decimal(str(item.preco_unitario)) * quantidade
+        desconto_item = Decimal(str(item.desconto_aplicado or 0))
+
+        with UnidadeDeTrabalho(self.session):
+            # Remove o item
+            sucesso = self.itens_venda_repo.deletar(id_item_venda)
+
+            if sucesso:
+                self.produto_servico.produto_repo.aumentar_estoque(
+                    id_produto, quantidade)
+
+                self.venda_repo.somar_aos_totais(id_venda, desconto_item - valor_item, -desconto_item)
+
+                venda = self.venda_repo.buscar_por_id(id_venda)
+                self._registrar_no_resumo(
+                    venda,
+                    valor_bruto=-valor_item,
+                    desconto_total=-desconto_item,
+                    quantidade_itens=-quantidade
+                )
+                self._registrar_nos_contadores(
+                    venda, [(id_produto, quantidade, valor_item - desconto_item)], sinal=-1)
 
         return sucesso
 
-    def _sincronizar_totais_venda(self, id_venda: int):
-        """Recalcula e atualiza os totais da venda no banco."""
-        itens = self.itens_venda_repo.buscar_por_venda(id_venda)
+    def _registrar_no_resumo(self, venda: Venda, quantidade_vendas: int = 0,
+                             valor_bruto: Decimal = Decimal("0"), desconto_total: Decimal = Decimal("0"),
+                             quantidade_itens: int = 0):
+        """Aplica ao resumo diário (dia e funcionário da venda) os deltas da operação."""
+        self.resumo_repo.registrar(
+            venda.data_venda.date(),
+            venda.id_funcionario,
+            quantidade_vendas=quantidade_vendas,
+            valor_bruto=valor_bruto,
+            desconto_total=desconto_total,
+            quantidade_itens=quantidade_itens
+        )
 
-        valor_total = 0.0
-        desconto_total = 0.0
+    def _registrar_nos_contadores(self, venda: Venda, itens: Iterable[Tuple[int, int, Decimal]], sinal: int = 1):
+        """
+        Aplica aos contadores por produto (geral e do dia da venda) as linhas
+        (id_produto, quantidade, valor líquido); sinal=-1 para estornos.
+        """
+        self.contador_repo.registrar(venda.data_venda.date(), [
+            {
+                "id_produto": id_produto,
+                "quantidade": sinal * quantidade,
+                "receita": sinal * receita,
+                "numero_vendas": sinal
+            }
+            for id_produto, quantidade, receita in itens
+        ])
+
+    def verificar_totais_venda(self, id_venda: int, corrigir: bool = False) -> dict:
+        """
+        Confere os totais gravados na venda (mantidos por deltas a cada item
+        adicionado ou removido) com a soma dos itens. Com corrigir=True, grava
+        os totais recalculados quando houver divergência.
+        """
+        venda = self.venda_repo.buscar_por_id(id_venda)
+        if not venda:
+            raise Exception(f"Venda com ID {id_venda} não encontrada")
 
-        for item in itens:
-            valor_bruto = float(item.quantidade * item.preco_unitario)
-            desconto_item = float(item.desconto_aplicado or 0.0)
+        valor_itens, desconto_itens = self.itens_venda_repo.calcular_totais_venda(id_venda)
+        valor_gravado = Decimal(str(venda.valor_total or 0))
+        desconto_gravado = Decimal(str(venda.desconto_total or 0))
+        consistente = valor_gravado == valor_itens and desconto_gravado == desconto_itens
 
-            valor_total += (valor_bruto - desconto_item)
-            desconto_total += desconto_item
+        if corrigir and not consistente:
+            self.venda_repo.atualizar_totais_venda(id_venda, valor_itens, desconto_itens)
 
-        self.venda_repo.atualizar_totais_venda(
-            id_venda, valor_total, desconto_total)
+        return {
+            "id_venda": id_venda,
+            "valor_total": valor_gravado,
+            "desconto_total": desconto_gravado,
+            "valor_total_itens": valor_itens,
+            "desconto_total_itens": desconto_itens,
+            "consistente": consistente,
+            "corrigido": corrigir and not consistente
+        }
 
     def calcular_valor_total_venda(self, id_venda: int) -> float:
         """Calcula o valor total da venda, incluindo descontos aplicados."""
@@ -198,6 +365,5 @@ class VendaServico:
         if not venda:
             raise Exception(f"Venda com ID {id_venda} não encontrada")
 
-        self._sincronizar_totais_venda(id_venda)
-
-        return self.venda_repo.buscar_por_id(id_venda)
+        # Os totais já estão em dia; use verificar_totais_venda para conferi-los
+        return venda